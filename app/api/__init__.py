@@ -0,0 +1 @@
+from .client import ApiClient, RemoteController, controller_for  # noqa: F401
@@ -0,0 +1,237 @@
+"""
+Thin-client side of the API: controller stand-ins that call the server over HTTP.
+
+RemoteController("admin") has the same methods as AdminController. Arguments are bound
+against the real signature first (so mistakes fail locally, as they would in-process),
+local photo files passed as image_path or photo_path are uploaded, and the result comes back with
+records as dicts. Photos named in results are mirrored into the local images folder,
+revalidated with If-None-Match/If-Modified-Since at most once per PHOTO_MAX_AGE, so
+the UI keeps loading them from disk as before.
+
+Signing in through auth.login stores the session the server hands back (X-Session);
+later calls send it, and logout() ends it.
+
+controller_for(kind) is what the UI uses: the local controller, or a RemoteController
+when APP_MODE is "remote".
+"""
+
+import http.client
+import inspect
+import os
+import threading
+import time
+from email.utils import formatdate
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from app.api import protocol
+from app.config import API_TOKEN, API_URL, APP_MODE, IMAGES_DIR, PHOTO_MAX_AGE
+
+# Result keys whose value is a resolved path on the server rather than a stored file name
+_RESOLVED_KEYS = frozenset(("image", "pet_image", "pet_image_resolved"))
+
+
+class ApiClient:
+    """
+    Keep-alive HTTP connection per thread to one server, plus the local photo mirror.
+    """
+
+    def __init__(self, base_url=API_URL, token=API_TOKEN, timeout=30, photo_dir=None):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.token = token
+        self.session = None
+        self.timeout = timeout
+        self.photo_dir = Path(photo_dir or IMAGES_DIR)
+        self._local = threading.local()
+        self._photo_lock = threading.Lock()
+        # photo name -> (etag, time.monotonic() it was last confirmed fresh)
+        self._photos = {}
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def request(self, method, path, body=None, headers=None):
+        """
+        (status, headers, body). A kept-alive connection the server has since dropped is
+        reopened once; the request is only retried if nothing was received for it.
+        """
+        headers = dict(headers or {})
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        if self.session:
+            headers["X-Session"] = self.session
+        for attempt in (1, 2):
+            conn = self._connection()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                return response.status, {k.lower(): v for k, v in response.getheaders()}, response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                self.close()
+                if attempt == 2:
+                    raise
+
+    # --------------- Calls ---------------
+    def call(self, kind, name, args=(), kwargs=None):
+        body = protocol.dumps({"args": list(args), "kwargs": kwargs or {}})
+        status, headers, data = self.request("POST", f"/api/{kind}/{name}", body, {"Content-Type": "application/json"})
+        if "x-session" in headers:
+            self.session = headers["x-session"]
+        payload = protocol.loads(data)
+        if "error" in payload:
+            raise protocol.error_from(payload["error"])
+        if status != 200:
+            raise protocol.RemoteError("HTTPError", f"HTTP {status} from {kind}.{name}")
+        return self._localize(payload.get("result"))
+
+    def logout(self):
+        """
+        End the server session started by auth.login.
+        """
+        if self.session:
+            try:
+                self.request("POST", "/logout", b"")
+            finally:
+                self.session = None
+
+    def health(self):
+        status, _, data = self.request("GET", "/health")
+        return protocol.loads(data).get("result") if status == 200 else None
+
+    # --------------- Photos ---------------
+    def upload(self, path):
+        """
+        Send a local file to the server's images folder; returns the (unique) name it was stored as.
+        """
+        path = Path(path)
+        status, _, data = self.request("POST", "/photos", path.read_bytes(), {"X-Filename": quote(path.name)})
+        payload = protocol.loads(data)
+        if status != 200:
+            raise protocol.error_from(payload.get("error", {}))
+        return payload["result"]
+
+    def photo(self, name):
+        """
+        Local path of photo `name`, fetched or revalidated from the server when stale.
+        None if the server does not have it.
+        """
+        name = os.path.basename(name or "")
+        if not name:
+            return None
+        local = self.photo_dir / name
+        now = time.monotonic()
+        with self._photo_lock:
+            etag, checked = self._photos.get(name, (None, None))
+        if checked is not None and now - checked < PHOTO_MAX_AGE and local.exists():
+            return local
+        headers = {}
+        if local.exists():
+            if etag:
+                headers["If-None-Match"] = etag
+            else:
+                headers["If-Modified-Since"] = formatdate(local.stat().st_mtime, usegmt=True)
+        status, response_headers, data = self.request("GET", f"/photos/{quote(name)}", headers=headers)
+        if status == 200:
+            self.photo_dir.mkdir(parents=True, exist_ok=True)
+            tmp = local.with_name(f".{name}.download")
+            tmp.write_bytes(data)
+            os.replace(tmp, local)
+        elif status != 304:
+            return local if local.exists() else None
+        with self._photo_lock:
+            self._photos[name] = (response_headers.get("etag", etag), now)
+        return local
+
+    def _localize(self, value):
+        """
+        Mirror the photos a result names; resolved server paths become local paths.
+        """
+        if isinstance(value, list):
+            return [self._localize(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        result = {}
+        for key, item in value.items():
+            if key in protocol.PHOTO_KEYS and isinstance(item, str) and item:
+                local = self.photo(item)
+                if key in _RESOLVED_KEYS or os.path.isabs(item):
+                    item = str(local) if local else None
+            else:
+                item = self._localize(item)
+            result[key] = item
+        return result
+
+    def _uploads(self, value, key=None):
+        """
+        Replace local photo files in call arguments with their names on the server.
+        """
+        if isinstance(value, dict):
+            return {k: self._uploads(v, k) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._uploads(item) for item in value]
+        if key in protocol.PHOTO_KEYS and isinstance(value, str) and os.path.isfile(value):
+            path = Path(value).resolve()
+            # Files already in the mirrored images folder are on the server by name
+            if path.parent == self.photo_dir.resolve():
+                return path.name
+            return self.upload(path)
+        return value
+
+
+class RemoteController:
+    """
+    Same method names as protocol.CONTROLLERS[kind]; each call is one request to the server.
+    """
+
+    def __init__(self, kind, client=None):
+        self._kind = kind
+        self._cls = protocol.CONTROLLERS[kind]
+        self._client = client or default_client()
+
+    def __getattr__(self, name):
+        attr = getattr(self._cls, name) if not name.startswith("_") else None
+        if not callable(attr):
+            raise AttributeError(f"{self._cls.__name__} has no remote method {name!r}")
+        signature = inspect.signature(attr)
+        client, kind = self._client, self._kind
+
+        def call(*args, **kwargs):
+            bound = signature.bind(None, *args, **kwargs)
+            arguments = dict(bound.arguments)
+            arguments.pop(next(iter(signature.parameters)))
+            return client.call(kind, name, kwargs=client._uploads(arguments))
+
+        call.__name__ = name
+        return call
+
+
+_DEFAULT_CLIENT = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_client():
+    global _DEFAULT_CLIENT
+    with _DEFAULT_LOCK:
+        if _DEFAULT_CLIENT is None:
+            _DEFAULT_CLIENT = ApiClient()
+        return _DEFAULT_CLIENT
+
+
+def controller_for(kind):
+    """
+    The controller the UI should use for kind "admin", "adopter" or "auth".
+    """
+    if APP_MODE == "remote":
+        return RemoteController(kind)
+    return protocol.CONTROLLERS[kind]()
@@ -0,0 +1,81 @@
+"""
+Wire format shared by the API server and client.
+
+A call is POST /api/<kind>/<method> with {"args": [...], "kwargs": {...}}; the reply is
+{"result": ...} or {"error": {"type": ..., "message": ...}}. Records become plain dicts
+(they already read like dicts in the UI) and tuples become lists. Dicts with non-string
+keys, such as rating counts keyed by star, are sent as {"__items__": [[key, value], ...]}
+so the keys come back with their original type.
+"""
+
+import json
+
+from app.controllers import AdminController, AdopterController, AuthController
+
+CONTROLLERS = {"admin": AdminController, "adopter": AdopterController, "auth": AuthController}
+
+# Keys holding a photo file name or path, in results and in call arguments
+PHOTO_KEYS = frozenset((
+    "image", "image_path", "photo_path", "current_photo",
+    "pet_photo", "adopter_photo", "pet_image", "pet_image_resolved",
+))
+
+# Errors the controllers raise for bad input; the server answers these with 400
+CLIENT_ERRORS = (ValueError, LookupError, PermissionError, TypeError)
+
+_ERROR_TYPES = {cls.__name__: cls for cls in (ValueError, KeyError, LookupError, PermissionError, TypeError, RuntimeError)}
+
+
+class RemoteError(RuntimeError):
+    """
+    An exception raised on the server whose type has no local equivalent here.
+    """
+
+    def __init__(self, type_name, message):
+        super().__init__(message)
+        self.type_name = type_name
+
+
+def to_json(value):
+    if hasattr(value, "to_dict"):
+        value = value.to_dict()
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value):
+            return {key: to_json(item) for key, item in value.items()}
+        return {"__items__": [[to_json(key), to_json(item)] for key, item in value.items()]}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_json(item) for item in value]
+    return value
+
+
+def _object_hook(obj):
+    if len(obj) == 1 and "__items__" in obj:
+        return {_hashable(key): item for key, item in obj["__items__"]}
+    return obj
+
+
+def _hashable(key):
+    return tuple(_hashable(part) for part in key) if isinstance(key, list) else key
+
+
+def dumps(value):
+    return json.dumps(to_json(value), separators=(",", ":")).encode("utf-8")
+
+
+def loads(data):
+    return json.loads(data or b"{}", object_hook=_object_hook)
+
+
+def error_body(exc):
+    return dumps({"error": {"type": type(exc).__name__, "message": str(exc)}})
+
+
+def error_from(payload):
+    """
+    Local exception for an {"error": ...} payload: the same builtin type where there is one.
+    """
+    cls = _ERROR_TYPES.get(payload.get("type"))
+    message = payload.get("message", "")
+    if cls is None:
+        return RemoteError(payload.get("type", "Error"), message)
+    return cls(message)
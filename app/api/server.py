@@ -0,0 +1,453 @@
+"""
+HTTP/JSON API over the controllers, so the Tk app can run as a thin client.
+
+One server process owns the database: its connection pools, the single writer thread
+and background maintenance. Workstations run the app with FUREVER_MODE=remote and call
+the server instead of opening fureverhome.db themselves (often over a network share,
+where SQLite locking is slow and unreliable).
+
+    POST /api/<admin|adopter|auth>/<method>   {"args": [...], "kwargs": {...}} -> {"result": ...}
+    GET  /photos/<name>                       a file from IMAGES_DIR, with ETag/Last-Modified caching
+    POST /photos                              upload (file name in X-Filename) -> {"result": stored name}
+    POST /logout                              end the caller's session
+    GET  /health                              {"result": {"requests": ..., "database": ...}}
+
+Every request carries the API_TOKEN (required unless the server only listens on loopback).
+auth/login answers with an X-Session header; admin/* and adopter/* calls need that session
+with the matching role. Arguments naming an account (admin_id, adopter_id, ...) are set
+from the session, so request and notification calls only reach the caller's own rows.
+Photo arguments must name files inside the images folder.
+
+The event loop only parses HTTP; controller calls, JSON encoding and file reads run on
+a worker pool (API_WORKERS threads, each with its own pooled connection).
+
+Run: python -m app.api.server [--host HOST] [--port PORT] [--db PATH]
+"""
+
+import argparse
+import asyncio
+import functools
+import http
+import inspect
+import ipaddress
+import mimetypes
+import os
+import re
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+# Allow running directly for debugging; inject repo root into sys.path
+if __name__ == "__main__":
+    ROOT = Path(__file__).resolve().parents[2]
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+
+from app.api import protocol
+from app.config import (
+    API_HOST,
+    API_MAX_BODY,
+    API_PORT,
+    API_TOKEN,
+    API_SESSION_TTL,
+    API_WORKERS,
+    IMAGES_DIR,
+    PHOTO_MAX_AGE,
+    WRITE_QUEUE_ENABLED,
+)
+from app.models import database, maintenance
+from app.services import file_service
+
+JSON = "application/json"
+
+# Session role each controller kind requires; auth/* is open (it is how sessions start)
+KIND_ROLES = {"admin": "admin", "adopter": "adopter"}
+# Arguments naming the caller's own account. The server always fills them in from the
+# session, so methods that take one (even optionally) only ever see the caller's own rows
+OWNER_ARGS = {"admin": ("admin_id",), "adopter": ("adopter_id", "user_id", "users_id")}
+# Results that are never sent back: the reset code is emailed, not shown
+REDACTED = {("auth", "request_otp")}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message, error_type=None):
+        super().__init__(message)
+        self.status = status
+        self.error_type = error_type
+
+    def body(self):
+        return protocol.error_body(self.error_type(str(self)) if self.error_type else self)
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class ApiServer:
+    def __init__(self, host=API_HOST, port=API_PORT, token=API_TOKEN, workers=API_WORKERS, images_dir=None):
+        if not token and not is_loopback(host):
+            raise ValueError(f"Refusing to serve on {host} without an API token; set FUREVER_API_TOKEN")
+        self.host = host
+        self.port = port
+        self.token = token
+        self.images_dir = Path(images_dir or IMAGES_DIR).resolve()
+        self.images_dir.mkdir(parents=True, exist_ok=True)
+        # One instance per kind for every client; AuthController keeps pending OTPs
+        self.controllers = {kind: cls() for kind, cls in protocol.CONTROLLERS.items()}
+        for controller in self.controllers.values():
+            if hasattr(controller, "images_dir"):
+                controller.images_dir = self.images_dir
+        # session id -> {"role", "user_id", "expires"}; only touched on the event loop
+        self.sessions = {}
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-worker")
+        self.requests = 0
+        self.errors = 0
+        self.started_at = time.time()
+        self._server = None
+        self._loop = None
+        self._thread = None
+
+    # --------------- Lifecycle ---------------
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self):
+        """
+        Run the event loop on a daemon thread (tests, load generator); returns once listening.
+        """
+        ready = threading.Event()
+
+        def run():
+            async def main():
+                await self.start()
+                ready.set()
+                try:
+                    await self._server.serve_forever()
+                except asyncio.CancelledError:
+                    pass
+
+            asyncio.run(main())
+
+        self._thread = threading.Thread(target=run, name="api-server", daemon=True)
+        self._thread.start()
+        ready.wait(10)
+        return self
+
+    def stop(self, timeout=5):
+        """
+        Stop a server started with start_in_thread(); open connections are dropped.
+        """
+        if self._server is not None and self._loop is not None and self._loop.is_running():
+            # Closing ends serve_forever(); asyncio.run() then cancels the connection handlers
+            self._loop.call_soon_threadsafe(self._server.close)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.executor.shutdown(wait=True)
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "database": database.stats(),
+        }
+
+    # --------------- HTTP ---------------
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HttpError as e:
+                    writer.write(self._response(e.status, {}, e.body(), keep_alive=False))
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self.requests += 1
+                try:
+                    status, extra, payload = await self._dispatch(method, path, headers, body)
+                except HttpError as e:
+                    status, extra, payload = e.status, {}, e.body()
+                except Exception as e:
+                    status, extra, payload = 500, {}, protocol.error_body(e)
+                if status >= 400:
+                    self.errors += 1
+                writer.write(self._response(status, extra, payload, keep_alive, head=method == "HEAD"))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _version = line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(400, "Malformed request line") from None
+        headers = {}
+        while True:
+            header = await reader.readline()
+            if header in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = header.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HttpError(400, "Content-Length is not a number") from None
+        if length < 0:
+            raise HttpError(400, "Content-Length is negative")
+        if length > API_MAX_BODY:
+            raise HttpError(413, f"Request body over {API_MAX_BODY} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), unquote(urlsplit(target).path), headers, body
+
+    @staticmethod
+    def _response(status, headers, body, keep_alive, head=False):
+        lines = [f"HTTP/1.1 {status} {http.HTTPStatus(status).phrase}"]
+        headers = {"Content-Type": JSON, **headers} if body else dict(headers)
+        headers["Content-Length"] = str(len(body))
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        head_bytes = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        return head_bytes if head or status == 304 else head_bytes + body
+
+    async def _dispatch(self, method, path, headers, body):
+        if self.token and headers.get("authorization") != f"Bearer {self.token}":
+            raise HttpError(401, "Missing or wrong API token")
+        if path.startswith("/api/") and method == "POST":
+            return await self._call(path, headers, body)
+        if path == "/logout" and method == "POST":
+            self.sessions.pop(headers.get("x-session"), None)
+            return 200, {}, protocol.dumps({"result": True})
+        if path.startswith("/photos/") and method in ("GET", "HEAD"):
+            return await self._photo(path[len("/photos/"):], headers)
+        if path == "/photos" and method == "POST":
+            return await self._upload(headers, body)
+        if path == "/health" and method == "GET":
+            return 200, {}, await self._run(lambda: protocol.dumps({"result": self.stats()}))
+        raise HttpError(404, f"No route for {method} {path}")
+
+    def _run(self, fn, *args, **kwargs):
+        return self._loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    # --------------- Sessions ---------------
+    def _session(self, headers):
+        session = self.sessions.get(headers.get("x-session"))
+        if session is None or session["expires"] < time.monotonic():
+            return None
+        session["expires"] = time.monotonic() + API_SESSION_TTL
+        return session
+
+    def _open_session(self, role_key, user):
+        role = "admin" if (role_key or "").lower() == "admin" else "adopter"
+        user_id = user.get("id") if role == "admin" else user.get("users_id")
+        now = time.monotonic()
+        # Drop expired sessions whenever a new one starts, so the table stays small
+        for sid in [sid for sid, s in self.sessions.items() if s["expires"] < now]:
+            del self.sessions[sid]
+        sid = secrets.token_urlsafe(32)
+        self.sessions[sid] = {"role": role, "user_id": user_id, "expires": now + API_SESSION_TTL}
+        return sid
+
+    def _authorize(self, kind, headers, bound):
+        role = KIND_ROLES.get(kind)
+        if role is None:
+            return
+        session = self._session(headers)
+        if session is None:
+            raise HttpError(401, "Sign in first", PermissionError)
+        if session["role"] != role:
+            raise HttpError(403, f"{kind} calls need an {role} session", PermissionError)
+        for name in OWNER_ARGS.get(kind, ()):
+            if name not in bound.signature.parameters:
+                continue
+            value = bound.arguments.get(name)
+            if value is not None and str(value) != str(session["user_id"]):
+                raise HttpError(403, f"{name} is not the signed-in account", PermissionError)
+            bound.arguments[name] = session["user_id"]
+
+    # --------------- Controller calls ---------------
+    async def _call(self, path, headers, body):
+        _, _, kind, name = (path.split("/", 3) + ["", ""])[:4]
+        controller = self.controllers.get(kind)
+        method = getattr(controller, name, None) if controller is not None and not name.startswith("_") else None
+        if not callable(method):
+            raise HttpError(404, f"No such method: {kind}.{name}")
+        try:
+            request = protocol.loads(body)
+        except ValueError:
+            raise HttpError(400, "Request body is not valid JSON") from None
+        try:
+            bound = inspect.signature(method).bind(*request.get("args", []), **request.get("kwargs", {}))
+        except TypeError as e:
+            raise HttpError(400, str(e), TypeError) from None
+        self._authorize(kind, headers, bound)
+        for key, value in bound.arguments.items():
+            bound.arguments[key] = self._photo_args(value, key)
+
+        def call():
+            try:
+                result = method(*bound.args, **bound.kwargs)
+            except protocol.CLIENT_ERRORS as e:
+                return 400, protocol.error_body(e), None
+            if (kind, name) in REDACTED:
+                return 200, protocol.dumps({"result": None}), None
+            return 200, protocol.dumps({"result": result}), result
+
+        status, payload, result = await self._run(call)
+        extra = {}
+        if (kind, name) == ("auth", "login") and status == 200:
+            extra["X-Session"] = self._open_session(bound.arguments.get("role_key"), result)
+        return status, extra, payload
+
+    def _photo_args(self, value, key=None):
+        """
+        Photo arguments as names inside the images folder. Anything that resolves elsewhere
+        (an absolute path, "../x") is refused, so calls cannot copy in or delete other files.
+        """
+        if isinstance(value, dict):
+            return {k: self._photo_args(v, k) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._photo_args(item) for item in value]
+        if key in protocol.PHOTO_KEYS and isinstance(value, str) and value:
+            path = file_service.resolve_in_images(value, self.images_dir)
+            if path is None:
+                raise HttpError(400, f"{key} must name a file in the images folder", ValueError)
+            return path.relative_to(self.images_dir).as_posix()
+        return value
+
+    # --------------- Photos ---------------
+    def _photo_path(self, name):
+        path = (self.images_dir / name).resolve()
+        if self.images_dir not in path.parents or not path.is_file():
+            raise HttpError(404, f"No such photo: {name}")
+        return path
+
+    async def _photo(self, name, headers):
+        path = self._photo_path(name)
+        stat = path.stat()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        cache = {
+            "ETag": etag,
+            "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+            "Cache-Control": f"public, max-age={PHOTO_MAX_AGE}",
+        }
+        if _not_modified(headers, etag, stat.st_mtime):
+            return 304, cache, b""
+        data = await self._run(path.read_bytes)
+        cache["Content-Type"] = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        return 200, cache, data
+
+    async def _upload(self, headers, body):
+        """
+        Store an upload under a new unique name (never an existing photo) and return that name.
+        """
+        name = os.path.basename(unquote(headers.get("x-filename", "")))
+        if not name or name.startswith("."):
+            raise HttpError(400, "X-Filename header is required")
+        stem = re.sub(r"[^A-Za-z0-9_-]+", "-", Path(name).stem).strip("-")[:40] or "photo"
+        suffix = Path(name).suffix.lower()
+        if not re.fullmatch(r"\.[a-z0-9]{1,5}", suffix):
+            suffix = ""
+
+        def save():
+            fd, tmp = tempfile.mkstemp(dir=self.images_dir, prefix=".upload-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(body)
+                while True:
+                    dest = self.images_dir / f"{stem}-{secrets.token_hex(4)}{suffix}"
+                    if not dest.exists():
+                        break
+                os.replace(tmp, dest)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+            return dest.name
+
+        stored = await self._run(save)
+        return 200, {}, protocol.dumps({"result": stored})
+
+
+def _not_modified(headers, etag, mtime):
+    match = headers.get("if-none-match")
+    if match:
+        return match.strip() == "*" or etag in (tag.strip() for tag in match.split(","))
+    since = headers.get("if-modified-since")
+    if since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.api.server", description="FurEver Home API server")
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--db", help="database file (default: the app database)")
+    parser.add_argument("--workers", type=int, default=API_WORKERS)
+    parser.add_argument("--images", help="photo directory (default: the app images folder)")
+    parser.add_argument("--no-maintenance", action="store_true", help="do not run background maintenance")
+    args = parser.parse_args(argv)
+
+    try:
+        server = ApiServer(args.host, args.port, workers=args.workers, images_dir=args.images)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.db:
+        database.DB_PATH = args.db
+    database.migrate()
+    if WRITE_QUEUE_ENABLED:
+        database.start_writer()
+    if not args.no_maintenance:
+        maintenance.start()
+
+    async def run():
+        await server.start()
+        print(f"FurEver Home API listening on http://{server.host}:{server.port}", flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.executor.shutdown(wait=True)
+        database.stop_writer()
+        maintenance.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 # Project root (folder that contains assets, images, db, main.py)
@@ -7,6 +8,65 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 ASSETS_DIR = BASE_DIR / "assets"
 IMAGES_DIR = BASE_DIR / "images"
 DB_PATH = BASE_DIR / "fureverhome.db"
+# Storage backend for DB_PATH (app.models.storage): "file", "memory" (an in-memory
+# copy, for benchmarks) or "ramdisk" (a throwaway copy on /dev/shm)
+DB_BACKEND = os.environ.get("FUREVER_DB_BACKEND", "file")
+
+# Notification retention, enforced by app.models.maintenance
+NOTIFICATION_MAX_AGE_DAYS = 90
+NOTIFICATION_MAX_PER_USER = 200
+MAINTENANCE_INTERVAL_SECONDS = 6 * 60 * 60
+
+# Idle-time maintenance (app.models.maintenance): seconds between runs of each step.
+# Steps only run once the UI has seen no input for MAINTENANCE_IDLE_SECONDS.
+MAINTENANCE_TICK_SECONDS = 60
+MAINTENANCE_IDLE_SECONDS = 120
+MAINTENANCE_SCHEDULE = {
+    "retention": MAINTENANCE_INTERVAL_SECONDS,
+    "checkpoint": 5 * 60,
+    "optimize": 60 * 60,
+    "integrity": 24 * 60 * 60,
+    "backup": 24 * 60 * 60,
+    # One-off conversion to auto_vacuum=INCREMENTAL (a full VACUUM); a cheap check once done
+    "vacuum": 24 * 60 * 60,
+}
+
+# Online backups: throttled to BACKUP_PAGES_PER_STEP pages with a sleep between steps
+BACKUP_DIR = BASE_DIR / "backups"
+BACKUP_KEEP = 7
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP = 0.005
+
+# Group commit for the single writer thread (database.start_writer); off unless
+# FUREVER_WRITE_QUEUE=1, in which case the app and the API server start it.
+# With a 0 ms window a batch is whatever queued up while the previous commit ran.
+WRITE_QUEUE_ENABLED = os.environ.get("FUREVER_WRITE_QUEUE") == "1"
+WRITE_BATCH_MAX = 64
+WRITE_BATCH_WINDOW_MS = 0
+
+# Read-only connections for reports and dashboards (database.read_connection)
+READ_POOL_SIZE = 4
+READ_POOL_TIMEOUT = 10
+
+# Per-statement profiling (database.enable_profiling); off unless FUREVER_PROFILE_QUERIES=1
+QUERY_PROFILING = os.environ.get("FUREVER_PROFILE_QUERIES") == "1"
+SLOW_QUERY_MS = 50
+SLOW_QUERY_LOG_SIZE = 100
+
+# API server (python -m app.api.server) and remote mode. With FUREVER_MODE=remote the
+# app calls the server at API_URL instead of opening the database itself.
+APP_MODE = os.environ.get("FUREVER_MODE", "local")
+API_HOST = os.environ.get("FUREVER_API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("FUREVER_API_PORT", "8765"))
+API_URL = os.environ.get("FUREVER_API_URL", f"http://{API_HOST}:{API_PORT}")
+# Shared secret clients send as "Authorization: Bearer <token>". Empty disables the check,
+# which the server only allows when it listens on a loopback address.
+API_TOKEN = os.environ.get("FUREVER_API_TOKEN", "")
+# Idle seconds before a signed-in API session expires
+API_SESSION_TTL = 12 * 60 * 60
+API_WORKERS = 8
+API_MAX_BODY = 16 * 1024 * 1024
+PHOTO_MAX_AGE = 24 * 60 * 60
 
 # UI defaults
 APP_TITLE = "FurEver Home"
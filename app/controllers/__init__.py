@@ -1,6 +1,7 @@
 from .auth_controller import AuthController  # noqa: F401
 from .admin_controller import AdminController  # noqa: F401
 from .adopter_controller import AdopterController  # noqa: F401
+from .async_controller import AsyncController  # noqa: F401
 
 # Allow direct execution for quick sanity checks:
 # python app/controllers/__init__.py  -> prints available controllers
@@ -13,5 +14,5 @@ if __name__ == "__main__":
         sys.path.insert(0, str(ROOT))
 
     print("Controllers loaded:")
-    for name in ("AuthController", "AdminController", "AdopterController"):
+    for name in ("AuthController", "AdminController", "AdopterController", "AsyncController"):
         print(f" - {name}")
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import calendar
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # Allow running this file directly for quick debugging (inject repo root into sys.path)
 if __name__ == "__main__":
@@ -29,35 +30,25 @@ class AdminController:
     # --------------- Dashboard ---------------
     def dashboard_snapshot(self) -> Dict[str, object]:
         """
-        Return ready-to-display data for the admin dashboard.
-        Includes raw lists plus lightweight aggregates for counts.
+        Return ready-to-display counts for the admin dashboard.
+        Everything comes from trigger-maintained counter and rollup tables,
+        so the cost does not grow with the number of pets, requests or adoptions.
         """
-        pets = database.get_available_pets()
-        requests = database.get_all_requests()
-        history = database.get_adoption_history()
-
-        status_counts: Dict[str, int] = {}
-        for req in requests:
-            status = str(req.get("status") or "pending").strip().lower()
-            if status == "declined":
-                status = "rejected"
-            status_counts[status] = status_counts.get(status, 0) + 1
-
-        availability: Dict[str, int] = {}
-        for pet in pets:
-            cat = (pet.get("category") or "Other").title()
-            availability[cat] = availability.get(cat, 0) + 1
+        counts = database.get_dashboard_counts()
+        status_counts = dict(counts["requests"])
+        total_requests = status_counts.pop("all", 0)
+        availability = {cat.title(): count for cat, count in counts["available_pets"].items() if cat != "all"}
 
         return {
-            "pets": pets,
-            "requests": requests,
-            "adoption_history": history,
             "stats": {
-                "available_pets": len(pets),
-                "requests": len(requests),
-                "adoptions": len(history),
+                "available_pets": counts["available_pets"]["all"],
+                "requests": total_requests,
+                "adoptions": counts["adoptions"],
                 "requests_by_status": status_counts,
                 "availability": availability,
+                "top_breeds": [(breed.title(), count) for breed, count in database.get_most_adopted_breeds()],
+                "top_months": [(calendar.month_name[month], count) for month, count in database.get_top_adoption_months()],
+                "ratings": database.get_rating_summary(),
             },
         }
 
@@ -67,17 +58,22 @@ class AdminController:
         Fetch adoption requests, optionally filtered by status.
         Status accepts Pending/Approved/Rejected/Declined/All (case-insensitive).
         """
-        requests = database.get_all_requests()
-        status_key = (status or "all").strip().lower()
-        if status_key and status_key != "all":
-            normalized = "rejected" if status_key in ("declined", "rejected") else status_key
+        return database.get_requests(status)
 
-            def _normalize_status(value: str) -> str:
-                val = (value or "pending").strip().lower()
-                return "rejected" if val == "declined" else val
+    def request_counts(self) -> Dict[str, int]:
+        """
+        Request totals per status (pending/approved/rejected/...) plus 'all'.
+        """
+        return database.get_request_counts()
 
-            requests = [req for req in requests if _normalize_status(req.get("status")) == normalized]
-        return requests
+    def list_requests_page(
+        self, status: Optional[str] = None, limit: int = database.PAGE_SIZE, after: Optional[int] = None
+    ) -> Tuple[List[Dict], Optional[int]]:
+        """
+        One newest-first page of requests. Pass the returned cursor as `after` to get the next page;
+        the cursor is None once the last page has been returned.
+        """
+        return database.get_requests_page(limit=limit, after=after, status=status)
 
     def get_request(self, request_id: int) -> Dict:
         if not request_id:
@@ -126,6 +122,49 @@ class AdminController:
                 except Exception:
                     pass
 
+    def approve_requests(self, request_ids: List[int], notify: bool = True) -> List[Dict]:
+        """
+        Approve several requests at once. Status changes and adopter notifications
+        share one transaction, so the whole batch costs a single commit. It takes the
+        write lock before reading, so concurrent writers cannot make it fail halfway.
+        """
+        ids = [rid for rid in request_ids if rid]
+        if not ids:
+            return []
+        with database.connection(immediate=True):
+            approved = database.approve_requests(ids)
+            if notify:
+                database.create_notifications(
+                    (
+                        row["adopter_id"],
+                        f"Your adoption request for {row.get('pet_name') or 'the pet'} was approved. "
+                        "You can download the adoption form from My Requests and follow the next steps provided.",
+                        "adopter",
+                    )
+                    for row in approved
+                    if row.get("adopter_id")
+                )
+        return approved
+
+    def decline_requests(self, request_ids: List[int], reason: str = "", notify: bool = True) -> List[Dict]:
+        ids = [rid for rid in request_ids if rid]
+        if not ids:
+            return []
+        msg_reason = f" {reason}".rstrip() if reason else ""
+        with database.connection(immediate=True):
+            declined = database.decline_requests(ids, reason or "")
+            if notify:
+                database.create_notifications(
+                    (
+                        row["adopter_id"],
+                        f"Your adoption request for {row.get('pet_name') or 'the pet'} was declined.{msg_reason}",
+                        "adopter",
+                    )
+                    for row in declined
+                    if row.get("adopter_id")
+                )
+        return declined
+
     def delete_request(self, request_id: int, allow_approved: bool = False) -> bool:
         """
         Delete a request. Approved requests are preserved unless allow_approved=True.
@@ -144,20 +183,33 @@ class AdminController:
             raise ValueError("admin_id is required.")
         return database.get_notifications_for_user(admin_id, role="admin")
 
-    def mark_notification_read(self, notification_id: int) -> None:
+    def count_unread(self, admin_id: int) -> int:
+        if not admin_id:
+            return 0
+        return database.count_unread(admin_id, role="admin")
+
+    def get_notifications_since(self, admin_id: int, last_id: int = 0) -> List[Dict]:
+        """
+        Notifications newer than `last_id`, oldest first, so an open view can append only new rows.
+        """
+        if not admin_id:
+            raise ValueError("admin_id is required.")
+        return database.get_notifications_since(admin_id, role="admin", last_id=last_id)
+
+    def mark_notification_read(self, notification_id: int, admin_id: Optional[int] = None) -> None:
         if not notification_id:
             raise ValueError("notification_id is required.")
-        database.mark_notification_read(notification_id)
+        database.mark_notification_read(notification_id, user_id=admin_id, role="admin")
 
     def clear_notifications(self, admin_id: int) -> None:
         if not admin_id:
             raise ValueError("admin_id is required.")
         database.clear_notifications_for_user(admin_id, role="admin")
 
-    def delete_notification(self, notification_id: int) -> None:
+    def delete_notification(self, notification_id: int, admin_id: Optional[int] = None) -> None:
         if not notification_id:
             raise ValueError("notification_id is required.")
-        database.delete_notification(notification_id)
+        database.delete_notification(notification_id, user_id=admin_id, role="admin")
 
     # --------------- Pending admins ---------------
     def list_pending_admins(self) -> List[Dict]:
@@ -185,6 +237,14 @@ class AdminController:
             return database.get_pets_by_category(cat)
         return database.get_available_pets()
 
+    def search_pets(self, query: str, category: Optional[str] = None) -> List[Dict]:
+        """
+        Ranked full-text search over available pets; a blank query lists pets as usual.
+        """
+        if not (query or "").strip():
+            return self.list_pets(category)
+        return database.search_pets(query, category)
+
     def _save_photo(self, photo_path: str) -> str:
         """
         Copy a photo into the shared images dir and return the stored filename/path.
@@ -192,25 +252,22 @@ class AdminController:
         """
         if not photo_path:
             return ""
+        # A bare name already refers to the images folder (e.g. a photo uploaded to the API server)
+        if not os.path.isabs(photo_path):
+            return photo_path
         try:
             return file_service.copy_photo_to_images(str(photo_path))
         except Exception:
             return photo_path
 
     def _remove_photo(self, photo_path: str) -> None:
-        if not photo_path:
-            return
-        candidates = []
-        if os.path.isabs(photo_path):
-            candidates.append(photo_path)
-        candidates.append(str(self.images_dir / photo_path))
-        for path in candidates:
-            try:
-                if os.path.exists(path) and os.path.isfile(path):
-                    os.remove(path)
-                    break
-            except Exception:
-                continue
+        # Only ever delete files inside the images folder, whatever path was stored or passed in
+        path = file_service.resolve_in_images(photo_path, self.images_dir)
+        try:
+            if path is not None and path.is_file():
+                path.unlink()
+        except OSError:
+            pass
 
     def add_pet(
         self,
@@ -223,6 +280,54 @@ class AdminController:
         image_path: str = "",
         status: str = "available",
         vaccinated: Optional[int] = None,
+    ) -> Dict[str, object]:
+        pet = self._new_pet_values(name, category, breed, age, sex, description, image_path, status, vaccinated)
+        database.add_pet(
+            name=name,
+            category=category.lower(),
+            breed=breed,
+            age=pet["age"],
+            sex=sex,
+            vaccinated=pet["vaccinated"],
+            status=pet["status"],
+            image=pet["photo_path"],
+            description=description or "",
+            photo_path=pet["photo_path"],
+        )
+        return pet
+
+    def add_pets(self, pets: List[Dict]) -> int:
+        """
+        Validate and insert several pets in one transaction.
+        Each dict uses add_pet's argument names. Returns the number inserted.
+        """
+        rows = []
+        for pet in pets:
+            values = self._new_pet_values(
+                pet.get("name"),
+                pet.get("category"),
+                pet.get("breed"),
+                pet.get("age"),
+                pet.get("sex"),
+                pet.get("description", ""),
+                pet.get("image_path", ""),
+                pet.get("status", "available"),
+                pet.get("vaccinated"),
+            )
+            rows.append({**values, "category": values["category"].lower(), "description": values["description"] or ""})
+        return database.add_pets(rows)
+
+    def _new_pet_values(
+        self,
+        name: str,
+        category: str,
+        breed: str,
+        age: int,
+        sex: str,
+        description: str,
+        image_path: str,
+        status: str,
+        vaccinated: Optional[int],
     ) -> Dict[str, object]:
         if not all([name, category, breed, age, sex]):
             raise ValueError("Name, category, breed, age, and sex are required.")
@@ -232,18 +337,6 @@ class AdminController:
             raise ValueError("Age must be a number.")
         saved_image = self._save_photo(image_path)
         vaccinated_val = "yes" if vaccinated in (True, 1, "1", "true", "yes", "Yes") else "no"
-        database.add_pet(
-            name=name,
-            category=category.lower(),
-            breed=breed,
-            age=age_val,
-            sex=sex,
-            vaccinated=vaccinated_val,
-            status=status or "available",
-            image=saved_image,
-            description=description or "",
-            photo_path=saved_image,
-        )
         return {
             "name": name,
             "category": category,
@@ -303,13 +396,26 @@ class AdminController:
         if remove_photo and photo_path:
             self._remove_photo(photo_path)
 
+    def delete_pets(self, pet_ids: List[int], remove_photos: bool = True) -> None:
+        ids = [pid for pid in pet_ids if pid]
+        if not ids:
+            return
+        photos = database.delete_pets(ids)
+        if remove_photos:
+            for photo_path in photos:
+                self._remove_photo(photo_path)
+
     # --------------- History ---------------
     def adoption_history(self, category: Optional[str] = None) -> List[Dict]:
-        history = database.get_adoption_history()
-        cat = (category or "all").strip().lower()
-        if cat == "all":
-            return history
-        return [row for row in history if str(row.get("category") or "").lower() == cat]
+        return database.get_adoption_history(category)
+
+    def history_counts(self) -> Dict[str, int]:
+        return database.get_adoption_history_counts()
+
+    def adoption_history_page(
+        self, category: Optional[str] = None, limit: int = database.PAGE_SIZE, after: Optional[Tuple] = None
+    ) -> Tuple[List[Dict], Optional[Tuple]]:
+        return database.get_adoption_history_page(limit=limit, after=after, category=category)
 
     # --------------- Profile ---------------
     def update_admin_profile(
@@ -370,17 +476,7 @@ class AdminController:
             raise ValueError("admin_id is required.")
         database.delete_admin(admin_id)
         if remove_photo and photo_path:
-            candidates = []
-            if os.path.isabs(photo_path):
-                candidates.append(photo_path)
-            candidates.append(str(self.images_dir / photo_path))
-            for path in candidates:
-                try:
-                    if os.path.exists(path) and os.path.isfile(path):
-                        os.remove(path)
-                        break
-                except Exception:
-                    continue
+            self._remove_photo(photo_path)
 
     # --------------- About ---------------
     def admin_profiles(self) -> List[Dict]:
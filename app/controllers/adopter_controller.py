@@ -3,7 +3,7 @@ from __future__ import annotations
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # Allow running this file directly for quick debugging (inject repo root into sys.path)
 if __name__ == "__main__":
@@ -42,6 +42,17 @@ class AdopterController:
             except Exception:
                 return []
 
+    def search_pets(self, query: str, category: Optional[str] = None) -> List[Dict]:
+        """
+        Ranked full-text search over available pets; a blank query lists pets as usual.
+        """
+        if not (query or "").strip():
+            return self.list_pets(category)
+        try:
+            return database.search_pets(query, category)
+        except Exception:
+            return []
+
     # --------------- Requests ---------------
     def has_pending_request(self, adopter_id: int, pet_id: int) -> bool:
         if not adopter_id or not pet_id:
@@ -67,25 +78,50 @@ class AdopterController:
         if not adopter_id:
             return []
         try:
-            requests = database.get_adopter_requests(adopter_id)
+            return database.get_adopter_requests(adopter_id, status)
         except Exception:
             return []
-        status_key = (status or "all").strip().lower()
-        if status_key and status_key != "all":
-            requests = [r for r in requests if str(r.get("status", "")).strip().lower() == status_key]
-        return requests
 
-    def get_request(self, request_id: int) -> Dict:
+    def request_counts(self, adopter_id: int) -> Dict[str, int]:
+        if not adopter_id:
+            return {"all": 0}
+        try:
+            return database.get_request_counts(adopter_id)
+        except Exception:
+            return {"all": 0}
+
+    def list_requests_page(
+        self,
+        adopter_id: int,
+        status: Optional[str] = None,
+        limit: int = database.PAGE_SIZE,
+        after: Optional[int] = None,
+    ) -> Tuple[List[Dict], Optional[int]]:
+        """
+        One newest-first page of this adopter's requests plus the cursor for the next page.
+        """
+        if not adopter_id:
+            return [], None
+        try:
+            return database.get_adopter_requests_page(adopter_id, limit=limit, after=after, status=status)
+        except Exception:
+            return [], None
+
+    def get_request(self, request_id: int, adopter_id: Optional[int] = None) -> Optional[Dict]:
+        """Request details; with adopter_id, None unless that adopter made the request."""
         if not request_id:
             raise ValueError("request_id is required.")
-        return database.get_request_details(request_id)
+        details = database.get_request_details(request_id)
+        if details and adopter_id is not None and str(details.get("adopter_id")) != str(adopter_id):
+            return None
+        return details
 
     def delete_request(self, request_id: int, adopter_id: Optional[int] = None, allow_approved: bool = False) -> bool:
         if not request_id:
             raise ValueError("request_id is required.")
         if not allow_approved:
             try:
-                details = database.get_request_details(request_id)
+                details = self.get_request(request_id, adopter_id)
                 if details and str(details.get("status") or "").lower() == "approved":
                     raise ValueError("Approved requests are kept for history.")
             except ValueError:
@@ -108,57 +144,94 @@ class AdopterController:
         except Exception:
             return []
 
-    def mark_notification_read(self, notification_id: int) -> None:
+    def count_unread(self, user_id: int) -> int:
+        if not user_id:
+            return 0
+        try:
+            return database.count_unread(user_id, role="adopter")
+        except Exception:
+            return 0
+
+    def get_notifications_since(self, user_id: int, last_id: int = 0) -> List[Dict]:
+        """
+        Notifications newer than `last_id`, oldest first, so an open view can append only new rows.
+        """
+        if not user_id:
+            return []
+        try:
+            return database.get_notifications_since(user_id, role="adopter", last_id=last_id)
+        except Exception:
+            return []
+
+    def mark_notification_read(self, notification_id: int, user_id: Optional[int] = None) -> None:
         if not notification_id:
             raise ValueError("notification_id is required.")
-        database.mark_notification_read(notification_id)
+        database.mark_notification_read(notification_id, user_id=user_id, role="adopter")
 
     def clear_notifications(self, user_id: int) -> None:
         if not user_id:
             raise ValueError("user_id is required.")
         database.clear_notifications_for_user(user_id, role="adopter")
 
-    def delete_notification(self, notification_id: int) -> None:
+    def delete_notification(self, notification_id: int, user_id: Optional[int] = None) -> None:
         if not notification_id:
             raise ValueError("notification_id is required.")
-        database.delete_notification(notification_id)
+        database.delete_notification(notification_id, user_id=user_id, role="adopter")
 
     # --------------- History ---------------
     def adoption_history(self, adopter_id: int, category: Optional[str] = None) -> List[Dict]:
         if not adopter_id:
             return []
         try:
-            hist = database.get_adoption_history_for_adopter(adopter_id)
+            return database.get_adoption_history_for_adopter(adopter_id, category)
         except Exception:
             return []
-        cat = (category or "all").strip().lower()
-        if cat == "all":
-            return hist
-        return [row for row in hist if str(row.get("category") or "").lower() == cat]
+
+    def adoption_history_page(
+        self,
+        adopter_id: int,
+        category: Optional[str] = None,
+        limit: int = database.PAGE_SIZE,
+        after: Optional[Tuple] = None,
+    ) -> Tuple[List[Dict], Optional[Tuple]]:
+        """
+        One newest-first page of this adopter's history plus the cursor for the next page.
+        """
+        if not adopter_id:
+            return [], None
+        try:
+            return database.get_adoption_history_for_adopter_page(adopter_id, limit=limit, after=after, category=category)
+        except Exception:
+            return [], None
+
+    def history_counts(self, adopter_id: int) -> Dict[str, int]:
+        if not adopter_id:
+            return {"all": 0}
+        try:
+            return database.get_adoption_history_counts(adopter_id)
+        except Exception:
+            return {"all": 0}
 
     # --------------- Profile ---------------
     def _save_photo(self, photo_path: str) -> str:
         if not photo_path:
             return ""
+        # A bare name already refers to the images folder (e.g. a photo uploaded to the API server)
+        if not os.path.isabs(photo_path):
+            return photo_path
         try:
             return file_service.copy_photo_to_images(str(photo_path))
         except Exception:
             return photo_path
 
     def _remove_photo(self, photo_path: str) -> None:
-        if not photo_path:
-            return
-        candidates = []
-        if os.path.isabs(photo_path):
-            candidates.append(photo_path)
-        candidates.append(str(self.images_dir / photo_path))
-        for path in candidates:
-            try:
-                if os.path.exists(path) and os.path.isfile(path):
-                    os.remove(path)
-                    break
-            except Exception:
-                continue
+        # Only ever delete files inside the images folder, whatever path was stored or passed in
+        path = file_service.resolve_in_images(photo_path, self.images_dir)
+        try:
+            if path is not None and path.is_file():
+                path.unlink()
+        except OSError:
+            pass
 
     def update_profile(
         self,
@@ -218,8 +291,11 @@ class AdopterController:
         except Exception:
             return []
 
-    def notify_admins_rating(self, stars: int) -> None:
-        try:
-            database.notify_all_admins(f"New adopter rating: {stars} star(s).")
-        except Exception:
-            pass
+    def submit_rating(self, adopter_id: Optional[int], stars: int) -> None:
+        """
+        Store a 1-5 star rating. Admins see it through the dashboard's rating summary,
+        so no per-admin notification is sent.
+        """
+        if not 1 <= int(stars) <= 5:
+            raise ValueError("Rating must be between 1 and 5 stars.")
+        database.add_rating(adopter_id, stars)
@@ -0,0 +1,57 @@
+"""
+Thread-pool facade over the controllers so UI code never waits on SQLite or disk I/O.
+
+AsyncController(controller).some_method(...) runs controller.some_method(...) on a
+shared worker pool and returns a concurrent.futures.Future. Worker threads get
+their own pooled connections from app.models.database.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+MAX_WORKERS = 4
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def executor():
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="db-worker")
+        return _EXECUTOR
+
+
+def shutdown(wait=True):
+    """
+    Stop the worker pool; the next call starts a fresh one.
+    """
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        pool, _EXECUTOR = _EXECUTOR, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+class AsyncController:
+    """
+    Same method names as the wrapped controller, but every call returns a Future.
+    """
+
+    def __init__(self, controller):
+        self._controller = controller
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        return executor().submit(fn, *args, **kwargs)
+
+    def __getattr__(self, name):
+        method = getattr(self._controller, name)
+        if not callable(method):
+            return method
+
+        def call(*args, **kwargs):
+            return self.submit(method, *args, **kwargs)
+
+        call.__name__ = name
+        return call
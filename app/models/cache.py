@@ -0,0 +1,77 @@
+"""
+Bounded in-process LRU cache for entity lookups (pet, user, request, admin list).
+
+database.py reads through it and invalidates entries on every write it performs.
+Writes from other processes are caught separately via PRAGMA data_version.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class EntityCache:
+    """
+    Thread-safe LRU keyed on (namespace, key). Cached values must be immutable
+    (records or tuples) because the same object is handed to every caller.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, namespace, key, loader):
+        """
+        Return the cached value or call loader() and cache a non-None result.
+        """
+        entry_key = (namespace, key)
+        with self._lock:
+            if entry_key in self._entries:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                return self._entries[entry_key]
+            self.misses += 1
+
+        value = loader()
+        if value is not None:
+            with self._lock:
+                self._entries[entry_key] = value
+                self._entries.move_to_end(entry_key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, namespace, key=None):
+        """
+        Drop one entry, or the whole namespace when key is None.
+        """
+        with self._lock:
+            if key is not None:
+                self._entries.pop((namespace, key), None)
+                return
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[entry_key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
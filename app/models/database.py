@@ -1,7 +1,12 @@
+import functools
 import sqlite3
-from datetime import datetime
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 import os
+import re
 import sys
+import time
 from pathlib import Path
 
 # Allow running directly for debugging; inject repo root into sys.path
@@ -10,177 +15,464 @@ if __name__ == "__main__":
     if str(ROOT) not in sys.path:
         sys.path.insert(0, str(ROOT))
 
-from app.config import DB_PATH as CONFIG_DB_PATH, BASE_DIR, IMAGES_DIR
+from app.config import (
+    DB_BACKEND,
+    DB_PATH as CONFIG_DB_PATH,
+    BACKUP_PAGES_PER_STEP,
+    BACKUP_STEP_SLEEP,
+    BASE_DIR,
+    IMAGES_DIR,
+    QUERY_PROFILING,
+    READ_POOL_SIZE,
+    READ_POOL_TIMEOUT,
+    SLOW_QUERY_LOG_SIZE,
+    SLOW_QUERY_MS,
+    WRITE_BATCH_MAX,
+    WRITE_BATCH_WINDOW_MS,
+)
+from app.models import migrations, queries, storage
+from app.models.cache import EntityCache
+from app.models.profiler import ProfilingConnection, QueryProfiler, format_stats as _format_stats
+from app.models.read_pool import ReadPool
+from app.models.write_queue import WriteQueue, completed
+from app.models.records import (
+    AdminProfileRecord,
+    AdopterHistoryRecord,
+    AdopterRequestRecord,
+    HistoryRecord,
+    NotificationRecord,
+    PetRecord,
+    RequestRecord,
+    UserRecord,
+)
+
+# Where connections point (see app.models.storage). DB_PATH is the backend's key;
+# assigning a file path to it directly still works and selects that file.
+_BACKEND = storage.open_backend(DB_BACKEND, str(CONFIG_DB_PATH))
+DB_PATH = _BACKEND.key
+
+# Applied once when a connection is opened (not per query).
+# Negative cache_size is in KiB; mmap_size is in bytes.
+# auto_vacuum only takes effect on a new file if set before journal_mode=WAL writes the header;
+# existing files are converted by enable_incremental_vacuum() (the maintenance "vacuum" step).
+PRAGMA_PROFILE = (
+    ("auto_vacuum", "INCREMENTAL"),
+    ("busy_timeout", 5000),
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", -16000),
+    ("mmap_size", 268435456),
+    ("temp_store", "MEMORY"),
+)
+
+_LOCAL = threading.local()
+_POOL_LOCK = threading.Lock()
+_POOL = []
+_POOL_GENERATION = 0
+_MIGRATED_PATHS = set()
+
+# Default number of rows per page for the *_page helpers.
+PAGE_SIZE = 50
+
+# Read-through cache for get_pet_by_id/get_user_by_id/get_request_details/get_admin_profiles.
+_CACHE = EntityCache(maxsize=1024)
+
+# Read-only connections for reports and dashboards; see read_connection().
+_READ_POOL = None
+
+# Optional single writer thread; see start_writer().
+_WRITER = None
+
+# Per-statement timing, off by default; see enable_profiling().
+_PROFILER = QueryProfiler(__file__, slow_ms=SLOW_QUERY_MS, slow_log_size=SLOW_QUERY_LOG_SIZE)
+_PROFILER.enabled = QUERY_PROFILING
 
-DB_PATH = str(CONFIG_DB_PATH)
 
-_SOCIAL_COLUMNS_ENSURED = False
-_ADOPTION_INFO_COLUMN = None
-_ADOPTION_HISTORY_ENSURED = False
+# --------------------------------------------------
+# CONNECT
+# --------------------------------------------------
+def _apply_pragmas(conn):
+    for name, value in PRAGMA_PROFILE:
+        try:
+            conn.execute(f"PRAGMA {name}={value}")
+        except Exception:
+            pass
 
 
-def _ensure_admin_social_columns():
+def connect(readonly=False):
     """
-    Add facebook/instagram URL columns to admin + admin_pending if they don't exist.
+    Open a new connection owned by the caller (who must close it).
+    Helpers in this module use connection() or read_connection() instead.
+    readonly=True opens the file with mode=ro and sets query_only.
     """
-    global _SOCIAL_COLUMNS_ENSURED
-    if _SOCIAL_COLUMNS_ENSURED:
-        return
+    factory = ProfilingConnection if _PROFILER.enabled else sqlite3.Connection
+    target, uri = _backend().target(readonly)
+    conn = sqlite3.connect(
+        target,
+        timeout=10,
+        check_same_thread=False,
+        cached_statements=queries.STATEMENT_CACHE_SIZE,
+        factory=factory,
+        uri=uri,
+    )
+    if factory is ProfilingConnection:
+        conn.profiler = _PROFILER
+    _apply_pragmas(conn)
+    if readonly:
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
 
+def _backend():
+    global _BACKEND
+    if _BACKEND.key != DB_PATH:
+        _BACKEND = storage.FileBackend(DB_PATH)
+    return _BACKEND
+
+
+def use_backend(backend):
+    """
+    Point every helper at `backend` (a storage.FileBackend, MemoryBackend or RamDiskBackend).
+    Pooled connections are reopened on next use. Returns the previous backend; closing it
+    is up to the caller.
+    """
+    global _BACKEND, DB_PATH
+    close_connections()
+    previous = _BACKEND
+    _MIGRATED_PATHS.discard(previous.key)
+    _BACKEND, DB_PATH = backend, backend.key
+    return previous
+
+
+def _pooled_connection():
+    """
+    Return this thread's reusable connection, reopening it if DB_PATH changed
+    or close_connections() was called since it was opened. A connection that is
+    mid-transaction is kept until its outermost connection() block ends.
+    """
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is not None and (
+        _LOCAL.depth or (_LOCAL.path == DB_PATH and _LOCAL.generation == _POOL_GENERATION)
+    ):
+        return conn
+    if conn is not None:
+        _discard_connection(conn)
     conn = connect()
-    cur = conn.cursor()
-    tables_ok = True
+    _migrate_once(conn)
+    _LOCAL.conn = conn
+    _LOCAL.path = DB_PATH
+    _LOCAL.generation = _POOL_GENERATION
+    _LOCAL.depth = 0
+    _LOCAL.data_version = None
+    _LOCAL.pending_invalidations = []
+    with _POOL_LOCK:
+        _POOL.append(conn)
+    return conn
 
-    for table in ("admin", "admin_pending"):
-        try:
-            cur.execute(f"PRAGMA table_info({table})")
-            cols = {row[1] for row in cur.fetchall()}
-            # If the table doesn't exist yet, skip and try again next time.
-            if not cols:
-                tables_ok = False
-                continue
-            if "facebook_url" not in cols:
-                cur.execute(f"ALTER TABLE {table} ADD COLUMN facebook_url TEXT")
-            if "instagram_url" not in cols:
-                cur.execute(f"ALTER TABLE {table} ADD COLUMN instagram_url TEXT")
-        except Exception:
-            tables_ok = False
 
+def _discard_connection(conn):
+    with _POOL_LOCK:
+        if conn in _POOL:
+            _POOL.remove(conn)
     try:
-        conn.commit()
-    finally:
         conn.close()
+    except Exception:
+        pass
+    _LOCAL.conn = None
 
-    if tables_ok:
-        _SOCIAL_COLUMNS_ENSURED = True
 
-# --------------------------------------------------
-# CONNECT
-# --------------------------------------------------
-def connect():
-    conn = sqlite3.connect(DB_PATH, timeout=10, check_same_thread=False)
+def _migrate_once(conn):
+    if DB_PATH in _MIGRATED_PATHS:
+        return
+    with _POOL_LOCK:
+        if DB_PATH in _MIGRATED_PATHS:
+            return
+        migrations.migrate(conn)
+        _MIGRATED_PATHS.add(DB_PATH)
+
+
+def migrate():
+    """
+    Bring the configured database to the current schema version.
+    Safe to call repeatedly; the app calls it once at startup.
+    """
+    with connection() as conn:
+        return migrations.schema_version(conn)
+
+
+@contextmanager
+def connection(immediate=False):
+    """
+    Yield the pooled connection for the current thread.
+    The outermost block commits on success and rolls back on error, so helpers
+    called inside another helper's block share its transaction.
+    immediate=True starts the outermost block with BEGIN IMMEDIATE, taking the write lock
+    up front: a read-then-write batch then waits (busy_timeout) for other writers before
+    its first read, instead of failing with SQLITE_BUSY when it upgrades halfway through.
+    """
+    conn = _pooled_connection()
+    if immediate and not _LOCAL.depth and not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    _LOCAL.depth += 1
     try:
-        conn.execute("PRAGMA busy_timeout=5000")
-        conn.execute("PRAGMA journal_mode=WAL")
-    except Exception:
-        pass
-    return conn
+        yield conn
+    except BaseException:
+        _LOCAL.depth -= 1
+        if _LOCAL.depth == 0:
+            if conn.in_transaction:
+                conn.rollback()
+            _flush_invalidations()
+        raise
+    _LOCAL.depth -= 1
+    if _LOCAL.depth == 0:
+        if conn.in_transaction:
+            conn.commit()
+        _flush_invalidations()
+
+
+def close_thread_connection():
+    """
+    Close the calling thread's pooled connection, e.g. when a worker thread exits.
+    """
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is not None:
+        _discard_connection(conn)
 
 
-def _get_adoption_info_column(cursor):
+def close_connections():
     """
-    Ensure we reference the adoption request note column even if renamed.
-    Prefers 'information'; falls back to 'reason' for older DBs.
-    Attempts a rename from reason->information when possible.
+    Retire every pooled connection (all threads). The calling thread's is closed now;
+    other threads may be mid-query, so theirs are only marked stale and each thread
+    closes and reopens its own on next use.
     """
-    global _ADOPTION_INFO_COLUMN
-    if _ADOPTION_INFO_COLUMN:
-        return _ADOPTION_INFO_COLUMN
+    global _POOL_GENERATION
+    with _POOL_LOCK:
+        _POOL_GENERATION += 1
+    if not getattr(_LOCAL, "depth", 0):
+        close_thread_connection()
+    _READ_POOL.close()
+    _CACHE.clear()
 
-    cursor.execute("PRAGMA table_info(adoption_requests)")
-    cols = [row[1] for row in cursor.fetchall()]
-    if "information" in cols:
-        _ADOPTION_INFO_COLUMN = "information"
-        return _ADOPTION_INFO_COLUMN
 
-    if "reason" in cols:
-        try:
-            cursor.execute("ALTER TABLE adoption_requests RENAME COLUMN reason TO information")
-            cursor.connection.commit()
-            _ADOPTION_INFO_COLUMN = "information"
-            return _ADOPTION_INFO_COLUMN
-        except Exception:
-            _ADOPTION_INFO_COLUMN = "reason"
-            return _ADOPTION_INFO_COLUMN
+# --------------------------------------------------
+# READ POOL
+# --------------------------------------------------
+def _open_reader():
+    if DB_PATH not in _MIGRATED_PATHS:
+        migrate()
+    return connect(readonly=True)
 
-    # default fallback if neither exists (should not happen)
-    _ADOPTION_INFO_COLUMN = "information"
-    return _ADOPTION_INFO_COLUMN
 
+_READ_POOL = ReadPool(_open_reader, size=READ_POOL_SIZE, timeout=READ_POOL_TIMEOUT)
 
-def _ensure_adoption_history_table():
+
+@contextmanager
+def read_connection():
     """
-    Ensure adoption_history table exists for history snapshots.
+    Yield a read-only connection from the read pool, inside one read transaction:
+    every statement in the block sees the same WAL snapshot, and neither waits for
+    nor blocks writers. Inside a connection() block the thread's own connection is
+    used instead, so a transaction still reads its own uncommitted writes.
     """
-    global _ADOPTION_HISTORY_ENSURED
-    if _ADOPTION_HISTORY_ENSURED:
+    if getattr(_LOCAL, "depth", 0) or not _backend().separate_readers:
+        with connection() as conn:
+            yield conn
         return
-    conn = connect()
-    cur = conn.cursor()
+    conn = getattr(_LOCAL, "read_conn", None)
+    if conn is not None:
+        yield conn
+        return
+    conn = _READ_POOL.acquire(DB_PATH)
+    _LOCAL.read_conn = conn
     try:
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS adoption_history (
-                id INTEGER PRIMARY KEY,
-                adopter_id INTEGER,
-                pet_id INTEGER,
-                pet_name TEXT,
-                category TEXT,
-                breed TEXT,
-                sex TEXT,
-                adopted_at TEXT,
-                adopter_name TEXT
-            )
-            """
-        )
-        conn.commit()
-        _ADOPTION_HISTORY_ENSURED = True
+        conn.execute("BEGIN")
+        yield conn
     finally:
-        conn.close()
+        _LOCAL.read_conn = None
+        try:
+            # Nothing to undo; this just ends the read transaction
+            conn.rollback()
+        except Exception:
+            _READ_POOL.discard(conn)
+        else:
+            _READ_POOL.release(conn)
 
 
-def _backfill_adoption_history(cur, adopter_id=None):
+def read_pool_stats():
     """
-    If history is empty for an adopter (or globally), seed it from approved adoption_requests.
+    Size, checkout and wait counters of the read-only pool.
     """
-    query = "SELECT COUNT(*) FROM adoption_history"
-    params = ()
-    if adopter_id is not None:
-        query += " WHERE adopter_id=?"
-        params = (adopter_id,)
-    cur.execute(query, params)
-    if cur.fetchone()[0]:
-        return
-    cur.execute(
-        """
-        INSERT OR IGNORE INTO adoption_history (
-            adopter_id, pet_id, pet_name, category, breed, sex, adopted_at, adopter_name
-        )
-        SELECT ar.adopter_id,
-               ar.pet_id,
-               COALESCE(p.name, '(Removed Pet)'),
-               p.category,
-               p.breed,
-               p.sex,
-               ar.created_at,
-               u.name
-        FROM adoption_requests ar
-        LEFT JOIN pets p ON ar.pet_id = p.pet_id
-        LEFT JOIN users u ON ar.adopter_id = u.users_id
-        WHERE LOWER(TRIM(ar.status))='approved'
-        """
-        + (" AND ar.adopter_id=?" if adopter_id is not None else ""),
-        params,
-    )
+    return _READ_POOL.stats()
+
 
 # --------------------------------------------------
-# LOGIN (Admin + Adopter)
+# ENTITY CACHE
 # --------------------------------------------------
-def login_user(email, password, role):
-    _ensure_admin_social_columns()
+def _cached(namespace, key, loader):
+    """
+    Read-through lookup. PRAGMA data_version changes when any other connection
+    (another thread or another process) commits, so a change drops the whole cache.
+    """
+    with connection() as conn:
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != _LOCAL.data_version:
+            _CACHE.clear()
+            _LOCAL.data_version = version
+        return _CACHE.get(namespace, key, lambda: loader(conn))
 
-    conn = connect()
-    cur = conn.cursor()
 
+def _invalidate(namespace, key=None):
+    """
+    Drop cached entries touched by a write. The drop is repeated when the
+    outermost transaction ends, so a concurrent reader cannot re-cache the
+    pre-commit row and a rollback cannot leave uncommitted data behind.
+    """
+    _CACHE.invalidate(namespace, key)
+    if getattr(_LOCAL, "depth", 0):
+        _LOCAL.pending_invalidations.append((namespace, key))
+
+
+def _flush_invalidations():
+    pending = _LOCAL.pending_invalidations
+    if pending:
+        _LOCAL.pending_invalidations = []
+        for namespace, key in pending:
+            _CACHE.invalidate(namespace, key)
+
+
+def cache_stats():
+    """
+    Hit/miss/eviction counters and current size of the entity cache.
+    """
+    return _CACHE.stats()
+
+
+def clear_cache():
+    _CACHE.clear()
+
+
+# --------------------------------------------------
+# QUERY PROFILING
+# --------------------------------------------------
+def enable_profiling(slow_ms=None):
+    """
+    Time every statement from now on. Pooled connections are reopened so they pick up
+    the profiling connection class; with profiling off they are plain sqlite3 connections.
+    """
+    if slow_ms is not None:
+        _PROFILER.slow_ms = slow_ms
+    if not _PROFILER.enabled:
+        _PROFILER.enabled = True
+        close_connections()
+
+
+def disable_profiling():
+    if _PROFILER.enabled:
+        _PROFILER.enabled = False
+        close_connections()
+
+
+def profiling_enabled():
+    return _PROFILER.enabled
+
+
+def reset_stats():
+    _PROFILER.reset()
+
+
+def stats():
+    """
+    Snapshot for the admin UI or a CLI dump: per-helper statement timings and the
+    slow-query log (with query plans), plus entity cache, writer and read pool counters.
+    """
+    snapshot = _PROFILER.snapshot()
+    snapshot["cache"] = cache_stats()
+    snapshot["writer"] = writer_stats()
+    snapshot["read_pool"] = read_pool_stats()
+    return snapshot
+
+
+def format_stats(snapshot=None, limit=20):
+    return _format_stats(snapshot or stats(), limit)
+
+
+# --------------------------------------------------
+# WRITE QUEUE
+# --------------------------------------------------
+@contextmanager
+def _write_transaction():
+    with connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        yield conn
+
+
+def start_writer(max_batch=WRITE_BATCH_MAX, window_ms=WRITE_BATCH_WINDOW_MS):
+    """
+    Route write helpers through one writer thread that group-commits them.
+    Callers still block for their own result; submit_write() returns the Future instead.
+    """
+    global _WRITER
+    if _WRITER is None:
+        _WRITER = WriteQueue(
+            _write_transaction,
+            teardown=close_thread_connection,
+            max_batch=max_batch,
+            window_ms=window_ms,
+        ).start()
+    return _WRITER
+
+
+def stop_writer(timeout=5):
+    """
+    Apply any queued writes and go back to writing on the calling thread.
+    """
+    global _WRITER
+    writer, _WRITER = _WRITER, None
+    if writer is not None:
+        writer.stop(timeout)
+
+
+def writer_stats():
+    return _WRITER.stats() if _WRITER is not None else None
+
+
+def submit_write(fn, *args, **kwargs):
+    """
+    Queue a write helper and return a Future of its result. Without a running writer,
+    or inside an open transaction, it runs immediately on the calling thread.
+    """
+    writer = _WRITER
+    if writer is None or getattr(_LOCAL, "depth", 0) or writer.is_writer_thread():
+        return completed(fn, *args, **kwargs)
+    return writer.submit(fn, *args, **kwargs)
+
+
+def _queued_write(fn):
+    """
+    Send calls through the writer thread when one is running. Calls made inside an
+    open transaction run directly so they stay part of it (and cannot deadlock on it).
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return submit_write(fn, *args, **kwargs).result()
+
+    return wrapper
+
+
+# --------------------------------------------------
+# LOGIN (Admin + Adopter)
+# --------------------------------------------------
+def login_user(email, password, role):
     # ADMIN LOGIN
     if role == "admin":
-        cur.execute("""
-            SELECT admin_id, name, age, birthdate, phone_number, email, password, photo_path, facebook_url, instagram_url
-            FROM admin
-            WHERE email=? AND password=?
-        """, (email, password))
-        row = cur.fetchone()
-        conn.close()
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT admin_id, name, age, birthdate, phone_number, email, password, photo_path, facebook_url, instagram_url
+                FROM admin
+                WHERE email=? AND password=?
+            """, (email, password))
+            row = cur.fetchone()
 
         if row:
             return {
@@ -200,13 +492,14 @@ def login_user(email, password, role):
 
     # ADOPTER LOGIN (unchanged)
     else:
-        cur.execute("""
-            SELECT users_id, name, email, password, age, birthdate, phone_number, photo_path
-            FROM users
-            WHERE email=? AND password=?
-        """, (email, password))
-        row = cur.fetchone()
-        conn.close()
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT users_id, name, email, password, age, birthdate, phone_number, photo_path
+                FROM users
+                WHERE email=? AND password=?
+            """, (email, password))
+            row = cur.fetchone()
 
         if row:
             return {
@@ -223,208 +516,391 @@ def login_user(email, password, role):
         return None
 
 # NEW: Update admin profile (optional, for better organization)
+@_queued_write
 def update_admin(admin_id, name, age, email, phone_number, birthdate, photo_path, facebook_url=None, instagram_url=None):
-    _ensure_admin_social_columns()
-    conn = connect()
-    cur = conn.cursor()
     try:
-        cur.execute("""
-            UPDATE admin
-            SET name=?, age=?, email=?, phone_number=?, birthdate=?, photo_path=?, facebook_url=?, instagram_url=?
-            WHERE admin_id=?
-        """, (name, age, email, phone_number, birthdate, photo_path, facebook_url, instagram_url, admin_id))
-        conn.commit()
+        with connection() as conn:
+            conn.execute("""
+                UPDATE admin
+                SET name=?, age=?, email=?, phone_number=?, birthdate=?, photo_path=?, facebook_url=?, instagram_url=?
+                WHERE admin_id=?
+            """, (name, age, email, phone_number, birthdate, photo_path, facebook_url, instagram_url, admin_id))
+            _invalidate("admins")
         return True
     except Exception as e:
         print(f"Error updating admin: {e}")
         return False
-    finally:
-        conn.close()
 
 # --------------------------------------------------
 # SUMMARY STATS
 # --------------------------------------------------
-def get_summary_stats():
-    conn = connect()
-    cur = conn.cursor()
+def _stats_counters():
+    """
+    Trigger-maintained counters as {key: value}; see migrations._v5_stats_counters.
+    """
+    with read_connection() as conn:
+        return dict(conn.execute("SELECT key, value FROM stats_counters WHERE value != 0").fetchall())
 
-    # Total available pets
-    cur.execute("SELECT COUNT(*) FROM pets WHERE status='available'")
-    total_pets = cur.fetchone()[0]
 
-    # Total adoption requests
-    cur.execute("SELECT COUNT(*) FROM adoption_requests")
-    total_requests = cur.fetchone()[0]
+def get_dashboard_counts():
+    """
+    Dashboard totals from stats_counters: available pets (overall and per category),
+    requests (overall and per status) and adoption history rows.
+    """
+    pets, requests, adoptions = [], [], 0
+    for key, value in _stats_counters().items():
+        kind, _, rest = key.partition(":")
+        if kind == "pets":
+            status, _, category = rest.partition(":")
+            if status == "available":
+                pets.append((category, value))
+        elif kind == "requests":
+            requests.append((rest, value))
+        elif kind == "adoptions":
+            adoptions = value
+    return {
+        "available_pets": _category_counts(pets),
+        "requests": _status_counts(requests),
+        "adoptions": adoptions,
+    }
 
-    # Total adoptions (assuming there's a status or table for completed adoptions)
-    # If adoptions are marked in adoption_requests with status='approved', count those
-    cur.execute("SELECT COUNT(*) FROM adoption_requests WHERE LOWER(TRIM(status))='approved'")
-    total_adoptions = cur.fetchone()[0]
 
-    conn.close()
+def get_summary_stats():
+    counts = get_dashboard_counts()
     return {
-        "total_pets": total_pets,
-        "total_requests": total_requests,
-        "total_adoptions": total_adoptions
+        "total_pets": counts["available_pets"]["all"],
+        "total_requests": counts["requests"]["all"],
+        "total_adoptions": counts["requests"].get("approved", 0),
     }
 
-def _resolve_pet_image(image_value, pet_name, photo_path=None):
+# --------------------------------------------------
+# PAGINATION
+# --------------------------------------------------
+def _status_values(status):
+    """
+    Map a UI status filter to stored values ('rejected' also covers legacy 'declined').
+    Returns None for 'all'.
+    """
+    key = (status or "all").strip().lower()
+    if key == "all":
+        return None
+    if key in ("declined", "rejected"):
+        return ("declined", "rejected")
+    return (key,)
+
+
+@functools.lru_cache(maxsize=256)
+def _status_filter(column, status):
     """
-    Returns an absolute path to a pet image.
-    - If the DB value (image/photo_path) points to a real file, use it.
-    - Otherwise try to find an image in the images/ folder that matches the pet name.
-    - Fall back to a placeholder (handled later by the UI loader).
+    SQL predicate for a status filter on `column`, or (None, ()) for 'all'.
+    A missing status counts as pending, matching the column default.
+    Memoized so each variant reuses one clause string (see queries.compose).
     """
-    # Use project-root aware paths so lookups work regardless of the current module location.
-    base_dir = str(BASE_DIR)
-    images_dir = str(IMAGES_DIR)
+    statuses = _status_values(status)
+    if not statuses:
+        return None, ()
+    clause = f"{column} IN ({', '.join('?' * len(statuses))})"
+    if "pending" in statuses:
+        clause = f"({clause} OR {column} IS NULL)"
+    return clause, tuple(statuses)
 
-    def check_candidate(path_value):
-        if not path_value:
-            return None
-        if os.path.isabs(path_value):
-            candidate = path_value
-        else:
-            # First try relative to repo root, then fall back to images/
-            candidate = os.path.join(base_dir, path_value)
-            if not os.path.exists(candidate):
-                candidate = os.path.join(images_dir, path_value)
-        if os.path.exists(candidate) and os.path.isfile(candidate):
-            return candidate
-        return None
 
-    # 1) Use photo_path if present
-    resolved = check_candidate(photo_path)
-    if resolved:
-        return resolved
-
-    # 2) Use the legacy image field if passed
-    resolved = check_candidate(image_value)
-    if resolved:
-        return resolved
-
-    # 2) Try to match a filename based on the pet name
-    if pet_name:
-        safe_name = "".join(ch.lower() for ch in pet_name if ch.isalnum())
-        for ext in (".jpg", ".jpeg", ".png", ".gif"):
-            candidate = os.path.join(images_dir, f"{safe_name}{ext}")
-            if os.path.exists(candidate) and os.path.isfile(candidate):
-                return candidate
-
-    # 3) Let the UI show its own placeholder
-    return None
+@functools.lru_cache(maxsize=256)
+def _category_filter(column, category):
+    """
+    SQL predicate for a category filter on `column`, or (None, ()) for 'all'.
+    Categories are stored lowercase. Memoized like _status_filter.
+    """
+    key = (category or "all").strip().lower()
+    if key == "all":
+        return None, ()
+    return f"{column} = ?", (key,)
+
+
+def _category_counts(rows):
+    """
+    Fold (category, count) rows into {category: count} with an 'all' total.
+    """
+    counts = {"all": 0}
+    for category, count in rows:
+        key = (category or "other").strip().lower()
+        counts[key] = counts.get(key, 0) + count
+        counts["all"] += count
+    return counts
+
+
+def _status_counts(rows):
+    """
+    Fold (status, count) rows into {status: count} with an 'all' total.
+    """
+    counts = {"all": 0}
+    for status, count in rows:
+        key = (status or "pending").strip().lower()
+        if key == "declined":
+            key = "rejected"
+        counts[key] = counts.get(key, 0) + count
+        counts["all"] += count
+    return counts
+
+
+def _page(rows, limit, cursor_of):
+    """
+    Trim a LIMIT n+1 result to n rows and derive the cursor for the next page.
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, cursor_of(rows[-1])
+    return rows, None
+
+
+def _newest_first(conn, record, select, where, params, column, id_column, limit, after):
+    """
+    Up to limit + 1 rows of `select` ordered by (column DESC, id_column DESC), after the
+    (value, id) cursor `after`. The raw columns are compared so an index ending in `column`
+    serves both the filter and the order. NULL values sort last: once the dated rows run
+    out they are read by a second query, and a cursor in them is (None, id).
+    """
+    def run(extra, extra_params, n):
+        clauses = [*where, *extra]
+        parts = [select]
+        if clauses:
+            parts += [" AND " if " WHERE " in select else " WHERE ", " AND ".join(clauses)]
+        parts.append(f" ORDER BY {column} DESC, {id_column} DESC LIMIT ?")
+        return _fetch(conn, record, queries.compose(*parts), [*params, *extra_params, n])
+
+    if after is None:
+        return run((), (), limit + 1)
+    value, last_id = after
+    if value is None:
+        return run((f"{column} IS NULL", f"{id_column} < ?"), (last_id,), limit + 1)
+    rows = run((f"({column}, {id_column}) < (?, ?)",), (value, last_id), limit + 1)
+    if len(rows) <= limit:
+        rows += run((f"{column} IS NULL",), (), limit + 1 - len(rows))
+    return rows
+
+
+def _fetch(conn, record, sql, params=()):
+    """
+    Run a query whose rows are built directly as `record` instances by the cursor.
+    """
+    cur = conn.cursor()
+    cur.row_factory = record.row_factory
+    return cur.execute(sql, params).fetchall()
+
+
+def _fetch_one(conn, record, sql, params=()):
+    cur = conn.cursor()
+    cur.row_factory = record.row_factory
+    return cur.execute(sql, params).fetchone()
+
+
+def _chunks(values, size=500):
+    """
+    Split ids into chunks that stay under SQLite's bound-parameter limit.
+    """
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
 
 # --------------------------------------------------
 # PETS
 # --------------------------------------------------
+def _canonical(value):
+    """
+    Lowercase/trim status and category values on write so indexed lookups can
+    compare the raw column instead of wrapping it in LOWER(TRIM(...)).
+    """
+    return value.strip().lower() if isinstance(value, str) else value
+
+
 def get_available_pets():
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT pet_id, name, category, breed, age, sex, vaccinated, status, description, photo_path
-        FROM pets
-        WHERE status='available'
-    """)
-    rows = cur.fetchall()
-    conn.close()
+    with connection() as conn:
+        return _fetch(conn, PetRecord, queries.AVAILABLE_PETS)
 
-    return [
-        {
-            "id": r[0],
-            "name": r[1],
-            "category": r[2],
-            "breed": r[3],
-            "age": r[4],
-            "sex": r[5],
-            "vaccinated": r[6],
-            "status": r[7],
-            "description": r[8],
-            "photo_path": r[9],
-            "image": _resolve_pet_image(None, r[1], r[9]),
-        } for r in rows
-    ]
+def get_available_pets_page(limit=PAGE_SIZE, after=None, category=None):
+    """
+    Page of available pets ordered by pet_id. Returns (rows, next_cursor).
+    """
+    clause, params = _category_filter("category", category)
+    parts = [queries.AVAILABLE_PETS]
+    params = list(params)
+    if clause:
+        parts += [" AND ", clause]
+    if after is not None:
+        parts.append(" AND pet_id > ?")
+        params.append(after)
+    parts.append(" ORDER BY pet_id LIMIT ?")
+    params.append(limit + 1)
+    with connection() as conn:
+        rows = _fetch(conn, PetRecord, queries.compose(*parts), params)
+    return _page(rows, limit, lambda r: r[0])
+
+def get_available_pet_counts():
+    """
+    Available pets per category, plus 'all'.
+    """
+    return get_dashboard_counts()["available_pets"]
 
 def get_pets_by_category(category):
-    conn = connect()
-    cur = conn.cursor()
-    # Ensure case-insensitive category filtering
-    cur.execute("""
-        SELECT pet_id, name, category, breed, age, sex, vaccinated, status, description, photo_path
-        FROM pets
-        WHERE LOWER(category)=? AND status='available'
-    """, (category.lower(),))
-    rows = cur.fetchall()
-    conn.close()
+    with connection() as conn:
+        # Categories are stored lowercase, so compare the raw column to use idx_pets_status_category
+        return _fetch(conn, PetRecord, queries.AVAILABLE_PETS_BY_CATEGORY, (category.strip().lower(),))
 
-    return [
-        {
-            "id": r[0],
-            "name": r[1],
-            "category": r[2],
-            "breed": r[3],
-            "age": r[4],
-            "sex": r[5],
-            "vaccinated": r[6],
-            "status": r[7],
-            "description": r[8],
-            "photo_path": r[9],
-            "image": _resolve_pet_image(None, r[1], r[9]),
-        } for r in rows
-    ]
+def _fts_query(text):
+    """
+    Turn free text into an FTS5 query: every word must match, as a prefix.
+    Words are quoted so FTS5 operators in user input are taken literally.
+    """
+    terms = re.findall(r"\w+", text or "")
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+# bm25 scores every match, so broader queries skip ranking and list name/breed hits first.
+SEARCH_RANK_LIMIT = 1000
+
+_SEARCH_SELECT = """
+        SELECT p.pet_id, p.name, p.category, p.breed, p.age, p.sex, p.vaccinated, p.status, p.description, p.photo_path
+        FROM pets_fts
+        CROSS JOIN pets p ON p.pet_id = pets_fts.rowid
+        WHERE pets_fts MATCH ? AND p.status='available'"""
+_SEARCH_RANKED = " ORDER BY bm25(pets_fts, 10.0, 5.0, 1.0) LIMIT ?"
+
+
+def search_pets(query, category=None, limit=PAGE_SIZE):
+    """
+    Ranked full-text search over available pets' name, breed and description.
+    Name matches rank above breed matches, which rank above description matches.
+    CROSS JOIN keeps the FTS index as the outer loop; otherwise the planner may walk
+    idx_pets_status_category and probe the FTS table once per pet.
+    """
+    match = _fts_query(query)
+    if not match:
+        return []
+    clause, values = _category_filter("p.category", category)
+    select = queries.compose(_SEARCH_SELECT, f" AND {clause}" if clause else "")
+    with connection() as conn:
+        try:
+            matches = conn.execute(
+                "SELECT COUNT(*) FROM (SELECT 1 FROM pets_fts WHERE pets_fts MATCH ? LIMIT ?)",
+                (match, SEARCH_RANK_LIMIT + 1),
+            ).fetchone()[0]
+        except sqlite3.OperationalError:
+            # No pets_fts table: this SQLite build lacks FTS5
+            return _search_pets_like(conn, query, clause, values, limit)
+        if matches <= SEARCH_RANK_LIMIT:
+            rows = _fetch(conn, PetRecord, queries.compose(select, _SEARCH_RANKED), [match, *values, limit])
+        else:
+            rows = _fetch(conn, PetRecord, queries.compose(select, " LIMIT ?"), [f"{{name breed}} : ({match})", *values, limit])
+            if len(rows) < limit:
+                seen = {r[0] for r in rows}
+                more = _fetch(conn, PetRecord, queries.compose(select, " LIMIT ?"), [match, *values, limit + len(rows)])
+                rows += [r for r in more if r[0] not in seen][: limit - len(rows)]
+    return rows
+
+
+def _search_pets_like(conn, query, clause, values, limit):
+    """
+    Fallback for SQLite builds without FTS5: every word must appear somewhere.
+    """
+    where = ["p.status='available'"]
+    params = []
+    for term in re.findall(r"\w+", query):
+        where.append("(p.name LIKE ? OR p.breed LIKE ? OR p.description LIKE ?)")
+        params.extend([f"%{term}%"] * 3)
+    if clause:
+        where.append(clause)
+        params.extend(values)
+    sql = queries.compose(queries.PET_SELECT_ALIASED, " WHERE ", " AND ".join(where), " ORDER BY p.pet_id LIMIT ?")
+    return _fetch(conn, PetRecord, sql, [*params, limit])
 
 def get_pet_by_id(pet_id):
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT pet_id, name, category, breed, age, sex, vaccinated, status, description, photo_path
-        FROM pets
-        WHERE pet_id=?
-    """, (pet_id,))
-    row = cur.fetchone()
-    conn.close()
-    if row:
-        return {
-            "id": row[0],
-            "name": row[1],
-            "category": row[2],
-            "breed": row[3],
-            "age": row[4],
-            "sex": row[5],
-            "vaccinated": row[6],
-            "status": row[7],
-            "description": row[8],
-            "photo_path": row[9],
-            "image": _resolve_pet_image(None, row[1], row[9]),
-        }
-    return None
+    return _cached("pet", pet_id, lambda conn: _fetch_one(conn, PetRecord, queries.PET_BY_ID, (pet_id,)))
+
+
+def _invalidate_pets(pet_ids=None):
+    """
+    Drop cached pets (all when pet_ids is None) and the request details that embed them.
+    """
+    if pet_ids is None:
+        _invalidate("pet")
+    else:
+        for pet_id in pet_ids:
+            _invalidate("pet", pet_id)
+    _invalidate("request")
 
+@_queued_write
 def delete_pet(pet_id):
-    conn = connect()
-    cur = conn.cursor()
-    try:
+    with connection() as conn:
+        cur = conn.cursor()
         # Remove only non-approved requests; keep approved rows for history
         cur.execute("DELETE FROM adoption_requests WHERE pet_id=? AND status!='approved'", (pet_id,))
         cur.execute("DELETE FROM pets WHERE pet_id=?", (pet_id,))
-        conn.commit()
-    finally:
-        conn.close()
+        _invalidate_pets([pet_id])
 
+@_queued_write
 def add_pet(name, category, breed, age, sex, image=None, description=None, photo_path=None, status="available", vaccinated=None):
     """
     Insert a new pet. Keeps photo_path in sync (image kept for legacy callers).
     """
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO pets (name, category, breed, age, sex, vaccinated, status, description, photo_path)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (name, category, breed, age, sex, vaccinated, status, description, photo_path or image),
-    )
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO pets (name, category, breed, age, sex, vaccinated, status, description, photo_path)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (name, _canonical(category), breed, age, sex, vaccinated, _canonical(status), description, photo_path or image),
+        )
+
 
+@_queued_write
+def add_pets(rows):
+    """
+    Insert many pets in one transaction. Each row is a dict with add_pet's keyword names.
+    Returns the number of pets inserted.
+    """
+    values = [
+        (
+            row["name"],
+            _canonical(row["category"]),
+            row.get("breed"),
+            row.get("age"),
+            row.get("sex"),
+            row.get("vaccinated"),
+            _canonical(row.get("status") or "available"),
+            row.get("description"),
+            row.get("photo_path") or row.get("image"),
+        )
+        for row in rows
+    ]
+    with connection() as conn:
+        conn.executemany(
+            """
+            INSERT INTO pets (name, category, breed, age, sex, vaccinated, status, description, photo_path)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            values,
+        )
+    return len(values)
+
+@_queued_write
+def delete_pets(pet_ids):
+    """
+    Delete many pets (and their non-approved requests) in one transaction.
+    Returns the photo paths of the deleted pets so callers can clean up files.
+    """
+    ids = [(pet_id,) for pet_id in pet_ids if pet_id]
+    with connection() as conn:
+        photos = []
+        for chunk in _chunks(pet_id for (pet_id,) in ids):
+            photos += conn.execute(
+                f"SELECT photo_path FROM pets WHERE pet_id IN ({', '.join('?' * len(chunk))})", chunk
+            ).fetchall()
+        conn.executemany("DELETE FROM adoption_requests WHERE pet_id=? AND status!='approved'", ids)
+        conn.executemany("DELETE FROM pets WHERE pet_id=?", ids)
+        _invalidate_pets(pet_id for (pet_id,) in ids)
+    return [photo for (photo,) in photos if photo]
 
 def get_all_pets():
     """
@@ -435,206 +911,184 @@ def get_all_pets():
     except Exception:
         return []
 
+@_queued_write
 def update_pet(pet_id, name, breed, age, sex, image=None, description=None, photo_path=None, category=None, vaccinated=None, status=None):
     """
     Update a pet record with the fields we edit from the UI.
     Keeps photo_path in sync for legacy callers.
     """
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE pets
-        SET name=?, breed=?, age=?, sex=?, description=?, photo_path=?, category=COALESCE(?, category), vaccinated=COALESCE(?, vaccinated), status=COALESCE(?, status)
-        WHERE pet_id=?
-        """,
-        (name, breed, age, sex, description, photo_path or image, category, vaccinated, status, pet_id),
-    )
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            UPDATE pets
+            SET name=?, breed=?, age=?, sex=?, description=?, photo_path=?, category=COALESCE(?, category), vaccinated=COALESCE(?, vaccinated), status=COALESCE(?, status)
+            WHERE pet_id=?
+            """,
+            (name, breed, age, sex, description, photo_path or image, _canonical(category), vaccinated, _canonical(status), pet_id),
+        )
+        _invalidate_pets([pet_id])
 
 # --------------------------------------------------
 # USERS
 # --------------------------------------------------
 def get_user_by_id(user_id):
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute("SELECT users_id, name, email, password, role, age, birthdate, phone_number, photo_path, image FROM users WHERE users_id=?", (user_id,))
-    row = cur.fetchone()
-    conn.close()
-    if row:
-        return {
-            "users_id": row[0],
-            "name": row[1],
-            "email": row[2],
-            "password": row[3],
-            "role": row[4],
-            "age": row[5],
-            "birthdate": row[6],
-            "phone": row[7],
-            "photo_path": row[8],
-            "image": row[9],
-        }
-    return None
+    return _cached(
+        "user",
+        user_id,
+        lambda conn: _fetch_one(
+            conn,
+            UserRecord,
+            queries.USER_BY_ID,
+            (user_id,),
+        ),
+    )
+
+
+def _invalidate_user(user_id=None):
+    """
+    Drop a cached user (all when user_id is None) and the request details that embed users.
+    """
+    _invalidate("user", user_id)
+    _invalidate("request")
 
 # --------------------------------------------------
 # ADOPTION REQUESTS
 # --------------------------------------------------
 def get_all_requests():
-    conn = connect()
-    cur = conn.cursor()
-    info_col = _get_adoption_info_column(cur)
-    cur.execute(f"""
-        SELECT ar.id, ar.adopter_id, ar.pet_id, ar.status, ar.created_at, ar.{info_col} as reason,
-               u.name as adopter_name, u.photo_path as adopter_photo, u.email as adopter_email, u.phone_number,
-               p.name as pet_name, p.photo_path, p.vaccinated, p.status,
-               p.category, p.breed, p.age, p.sex
-        FROM adoption_requests ar
-        JOIN users u ON ar.adopter_id = u.users_id
-        JOIN pets p ON ar.pet_id = p.pet_id
-    """)
-    rows = cur.fetchall()
-    conn.close()
-    result = []
-    for r in rows:
-        pet_photo = r[10]
-        pet_image = None  # legacy DBs may not have an image column
-        resolved = _resolve_pet_image(pet_image, r[9], pet_photo)
-        vaccinated = r[11]
-        pet_status = r[12]
-        pet_category = r[13]
-        pet_breed = r[14]
-        pet_age = r[15]
-        pet_sex = r[16]
-        result.append({
-            "id": r[0],
-            "adopter_id": r[1],
-            "pet_id": r[2],
-            "status": r[3],
-            "created_at": r[4],
-            "reason": r[5],
-            "adopter_name": r[6],
-            "adopter_photo": r[7],
-            "adopter_email": r[8],
-            "adopter_phone": r[9],
-            "pet_name": r[10],
-            "pet_photo": pet_photo,
-            "pet_image": pet_image,
-            "pet_image_resolved": resolved,
-            "vaccinated": vaccinated,
-            "pet_status": pet_status,
-            "category": pet_category,
-            "breed": pet_breed,
-            "age": pet_age,
-            "sex": pet_sex,
-        })
-    return result
+    return get_requests()
+
+
+def get_requests(status=None):
+    """
+    Requests matching a status filter (Pending/Approved/Rejected/All).
+    """
+    clause, params = _status_filter("ar.status", status)
+    sql = queries.compose(queries.REQUEST_SELECT, " WHERE ", clause) if clause else queries.REQUEST_SELECT
+    with read_connection() as conn:
+        return _fetch(conn, RequestRecord, sql, params)
+
+
+def get_request_counts(adopter_id=None):
+    """
+    Request counts per normalized status, plus 'all'. Scoped to one adopter when given.
+    """
+    if adopter_id is None:
+        return get_dashboard_counts()["requests"]
+    with read_connection() as conn:
+        rows = conn.execute(queries.ADOPTER_REQUEST_COUNTS, (adopter_id,)).fetchall()
+    return _status_counts(rows)
 
+
+def get_requests_page(limit=PAGE_SIZE, after=None, status=None):
+    """
+    Newest-first page of requests. `after` is the cursor returned by the previous page.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    where, params = [], []
+    if after is not None:
+        where.append("ar.id < ?")
+        params.append(after)
+    clause, values = _status_filter("ar.status", status)
+    if clause:
+        where.append(clause)
+        params.extend(values)
+    parts = [queries.REQUEST_SELECT]
+    if where:
+        parts += [" WHERE ", " AND ".join(where)]
+    parts.append(" ORDER BY ar.id DESC LIMIT ?")
+    params.append(limit + 1)
+    with read_connection() as conn:
+        rows = _fetch(conn, RequestRecord, queries.compose(*parts), params)
+    return _page(rows, limit, lambda r: r[0])
+
+@_queued_write
 def approve_request(req_id):
-    _ensure_adoption_history_table()
-    conn = connect()
-    cur = conn.cursor()
-    # Fetch request details first
-    cur.execute("SELECT adopter_id, pet_id FROM adoption_requests WHERE id=?", (req_id,))
-    row = cur.fetchone()
-    if not row:
-        conn.close()
-        return None
+    with connection() as conn:
+        cur = conn.cursor()
+        # Fetch request details first
+        cur.execute("SELECT adopter_id, pet_id FROM adoption_requests WHERE id=?", (req_id,))
+        row = cur.fetchone()
+        if not row:
+            return None
 
-    adopter_id, pet_id = row
-    cur.execute("UPDATE adoption_requests SET status='approved' WHERE id=?", (req_id,))
-    # Mark pet as adopted/unavailable
-    try:
-        cur.execute("UPDATE pets SET status='adopted' WHERE pet_id=?", (pet_id,))
-    except Exception:
-        pass
-    # Snapshot into adoption_history for reporting/UI
-    try:
-        cur.execute(
-            """
-        INSERT OR IGNORE INTO adoption_history (
-            adopter_id, pet_id, pet_name, category, breed, sex, adopted_at, adopter_name
-        )
-        SELECT u.users_id, p.pet_id, p.name, p.category, p.breed, p.sex, datetime('now','localtime'), u.name
-        FROM users u, pets p
-        WHERE u.users_id=? AND p.pet_id=?
-        """,
-        (adopter_id, pet_id),
-    )
-    except Exception:
-        pass
-    conn.commit()
-    conn.close()
+        adopter_id, pet_id = row
+        # The adoption_history_on_approve trigger snapshots the adoption
+        cur.execute("UPDATE adoption_requests SET status='approved' WHERE id=?", (req_id,))
+        _invalidate_pets([pet_id])
+        # Mark pet as adopted/unavailable
+        try:
+            cur.execute("UPDATE pets SET status='adopted' WHERE pet_id=?", (pet_id,))
+        except Exception:
+            pass
     return {"adopter_id": adopter_id, "pet_id": pet_id}
 
+@_queued_write
 def decline_request(req_id, reason):
-    conn = connect()
-    cur = conn.cursor()
-    info_col = _get_adoption_info_column(cur)
-    cur.execute(f"UPDATE adoption_requests SET status='declined', {info_col}=? WHERE id=?", (reason, req_id))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("UPDATE adoption_requests SET status='declined', information=? WHERE id=?", (reason, req_id))
+        _invalidate("request", req_id)
+
+def _request_targets(conn, req_ids):
+    """
+    (id, adopter_id, pet_id, pet_name) for each existing request in req_ids.
+    """
+    rows = []
+    for chunk in _chunks(req_ids):
+        rows += conn.execute(
+            f"""
+            SELECT ar.id, ar.adopter_id, ar.pet_id, p.name
+            FROM adoption_requests ar
+            LEFT JOIN pets p ON ar.pet_id = p.pet_id
+            WHERE ar.id IN ({', '.join('?' * len(chunk))})
+            """,
+            chunk,
+        ).fetchall()
+    return rows
+
+
+@_queued_write
+def approve_requests(req_ids):
+    """
+    Approve many requests in one transaction: request status and pet status are each
+    written with a single executemany; the adoption_history_on_approve trigger adds the snapshots.
+    Returns one {"id", "adopter_id", "pet_id", "pet_name"} dict per approved request.
+    """
+    ids = [req_id for req_id in req_ids if req_id]
+    with connection() as conn:
+        targets = _request_targets(conn, ids)
+        conn.executemany("UPDATE adoption_requests SET status='approved' WHERE id=?", [(r[0],) for r in targets])
+        conn.executemany("UPDATE pets SET status='adopted' WHERE pet_id=?", [(r[2],) for r in targets])
+        _invalidate_pets(r[2] for r in targets)
+    return [{"id": r[0], "adopter_id": r[1], "pet_id": r[2], "pet_name": r[3]} for r in targets]
+
+@_queued_write
+def decline_requests(req_ids, reason):
+    """
+    Decline many requests in one transaction. Returns the same dicts as approve_requests.
+    """
+    ids = [req_id for req_id in req_ids if req_id]
+    with connection() as conn:
+        targets = _request_targets(conn, ids)
+        conn.executemany(
+            "UPDATE adoption_requests SET status='declined', information=? WHERE id=?",
+            [(reason, r[0]) for r in targets],
+        )
+        for r in targets:
+            _invalidate("request", r[0])
+    return [{"id": r[0], "adopter_id": r[1], "pet_id": r[2], "pet_name": r[3]} for r in targets]
 
 def get_request_details(req_id):
-    conn = connect()
-    cur = conn.cursor()
-    info_col = _get_adoption_info_column(cur)
-    cur.execute(
-        f"""
-        SELECT ar.id, ar.adopter_id, ar.pet_id, ar.status, ar.created_at, ar.{info_col} as reason,
-               u.name as adopter_name, u.photo_path as adopter_photo, u.email as adopter_email, u.phone_number,
-               p.name as pet_name, p.photo_path as pet_photo, p.vaccinated, p.status,
-               p.category, p.breed, p.age, p.sex
-        FROM adoption_requests ar
-        JOIN users u ON ar.adopter_id = u.users_id
-        JOIN pets p ON ar.pet_id = p.pet_id
-        WHERE ar.id=?
-        """,
-        (req_id,),
-    )
-    row = cur.fetchone()
-    conn.close()
-    if not row:
-        return None
-    pet_photo = row[11]
-    pet_image = None
-    resolved = _resolve_pet_image(pet_image, row[10], pet_photo)
-    vaccinated = row[12]
-    pet_status = row[13]
-    pet_category = row[14]
-    pet_breed = row[15]
-    pet_age = row[16]
-    pet_sex = row[17]
-    return {
-        "id": row[0],
-        "adopter_id": row[1],
-        "pet_id": row[2],
-        "status": row[3],
-        "created_at": row[4],
-        "reason": row[5],
-        "adopter_name": row[6],
-        "adopter_photo": row[7],
-        "adopter_email": row[8],
-        "adopter_phone": row[9],
-        "pet_name": row[10],
-        "pet_photo": row[11],
-        "pet_image": pet_image,
-        "pet_image_resolved": resolved,
-        "vaccinated": vaccinated,
-        "pet_status": pet_status,
-        "category": pet_category,
-        "breed": pet_breed,
-        "age": pet_age,
-        "sex": pet_sex,
-    }
+    return _cached("request", req_id, lambda conn: _fetch_one(conn, RequestRecord, queries.REQUEST_BY_ID, (req_id,)))
 
+@_queued_write
 def cancel_request(req_id, adopter_id=None):
     """
     Cancel a pending request. If adopter_id is provided, enforce ownership.
     """
-    conn = connect()
-    cur = conn.cursor()
-    try:
+    with connection() as conn:
+        cur = conn.cursor()
         if adopter_id is not None:
             cur.execute(
                 "UPDATE adoption_requests SET status='cancelled' WHERE id=? AND adopter_id=? AND status='pending'",
@@ -645,42 +1099,36 @@ def cancel_request(req_id, adopter_id=None):
                 "UPDATE adoption_requests SET status='cancelled' WHERE id=? AND status='pending'",
                 (req_id,),
             )
-        conn.commit()
+        _invalidate("request", req_id)
         return cur.rowcount > 0
-    finally:
-        conn.close()
 
+@_queued_write
 def delete_request(req_id, adopter_id=None):
     """
     Hard-delete a request (adopter-owned or any if adopter_id not provided).
     Approved requests are preserved for history.
     """
-    conn = connect()
-    cur = conn.cursor()
-    try:
+    with connection() as conn:
+        cur = conn.cursor()
         # Do not delete approved requests to preserve adoption history
         if adopter_id is not None:
             cur.execute("DELETE FROM adoption_requests WHERE id=? AND adopter_id=? AND status!='approved'", (req_id, adopter_id))
         else:
             cur.execute("DELETE FROM adoption_requests WHERE id=? AND status!='approved'", (req_id,))
-        conn.commit()
+        _invalidate("request", req_id)
         return cur.rowcount > 0
-    finally:
-        conn.close()
 # Submit a new adoption request (used by adopter flow)
+@_queued_write
 def submit_adoption_request(adopter_id, pet_id, note):
-    conn = connect()
-    cur = conn.cursor()
-    info_col = _get_adoption_info_column(cur)
-    cur.execute(
-        f"""
-        INSERT INTO adoption_requests (adopter_id, pet_id, {info_col}, status, created_at)
-        VALUES (?, ?, ?, 'pending', datetime('now','localtime'))
-        """,
-        (adopter_id, pet_id, note),
-    )
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO adoption_requests (adopter_id, pet_id, information, status, created_at)
+            VALUES (?, ?, ?, 'pending', datetime('now','localtime'))
+            """,
+            (adopter_id, pet_id, note),
+        )
     return True
 
 
@@ -688,104 +1136,63 @@ def has_pending_request(adopter_id, pet_id):
     """
     Check if the adopter already has a pending request for the given pet.
     """
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT 1 FROM adoption_requests WHERE adopter_id=? AND pet_id=? AND status='pending' LIMIT 1",
-        (adopter_id, pet_id),
-    )
-    row = cur.fetchone()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(queries.HAS_PENDING_REQUEST, (adopter_id, pet_id))
+        row = cur.fetchone()
     return bool(row)
 
-def get_adoption_history_for_adopter(adopter_id):
-    _ensure_adoption_history_table()
-    conn = connect()
-    cur = conn.cursor()
-    info_col = _get_adoption_info_column(cur)
-    _backfill_adoption_history(cur, adopter_id=adopter_id)
-    cur.execute(
-        f"""
-        SELECT
-            COALESCE(ah.pet_name, p.name, '(Removed Pet)') as pet_name,
-            COALESCE(ah.category, p.category) as category,
-            COALESCE(ah.breed, p.breed) as breed,
-            p.age,
-            COALESCE(ah.sex, p.sex) as sex,
-            p.vaccinated,
-            p.status,
-            p.description,
-            p.photo_path,
-            ah.adopted_at,
-            ar.{info_col} as reason
-        FROM adoption_history ah
-        LEFT JOIN pets p ON ah.pet_id = p.pet_id
-        LEFT JOIN adoption_requests ar
-            ON ar.pet_id = ah.pet_id
-            AND ar.adopter_id = ah.adopter_id
-            AND LOWER(TRIM(ar.status))='approved'
-        WHERE ah.adopter_id=?
-        ORDER BY ah.adopted_at DESC
-    """,
-        (adopter_id,),
-    )
-    rows = cur.fetchall()
-    conn.close()
-    return [
-        {
-            "pet_name": r[0],
-            "category": r[1],
-            "breed": r[2],
-            "age": r[3],
-            "sex": r[4],
-            "vaccinated": r[5],
-            "status": r[6],
-            "description": r[7],
-            "photo_path": r[8],
-            "adopted_at": r[9],
-            "reason": r[10] if len(r) > 10 else None,
-        }
-        for r in rows
-    ]
-
-# Requests for a specific adopter
-def get_adopter_requests(adopter_id):
-    conn = connect()
-    cur = conn.cursor()
-    info_col = _get_adoption_info_column(cur)
-    cur.execute(
-        f"""
-        SELECT ar.id, ar.pet_id, ar.status, ar.created_at, ar.{info_col} as reason, p.name as pet_name, p.photo_path, p.vaccinated, p.status,
-               p.category, p.breed, p.age, p.sex
-        FROM adoption_requests ar
-        JOIN pets p ON ar.pet_id = p.pet_id
-        WHERE ar.adopter_id=?
-        ORDER BY ar.created_at DESC
-        """,
-        (adopter_id,),
-    )
-    rows = cur.fetchall()
-    conn.close()
-    return [
-        {
-            "id": r[0],
-            "pet_id": r[1],
-            "status": r[2],
-            "created_at": r[3],
-            "reason": r[4],
-            "pet_name": r[5],
-            "pet_photo": r[6],
-            "pet_image": None,
-            "pet_image_resolved": _resolve_pet_image(None, r[5], r[6]),
-            "vaccinated": r[7],
-            "pet_status": r[8],
-            "category": r[9],
-            "breed": r[10],
-            "age": r[11],
-            "sex": r[12],
-        }
-        for r in rows
-    ]
+def get_adoption_history_for_adopter(adopter_id, category=None):
+    parts = [queries.ADOPTER_HISTORY_SELECT]
+    params = [adopter_id]
+    clause, values = _category_filter(queries.HISTORY_CATEGORY, category)
+    if clause:
+        parts += [" AND ", clause]
+        params.extend(values)
+    parts.append(" ORDER BY ah.adopted_at DESC")
+    with connection() as conn:
+        return _fetch(conn, AdopterHistoryRecord, queries.compose(*parts), params)
+
+def get_adoption_history_for_adopter_page(adopter_id, limit=PAGE_SIZE, after=None, category=None):
+    """
+    Newest-first page of one adopter's history keyed on (adopted_at, id).
+    Returns (rows, next_cursor).
+    """
+    clause, values = _category_filter(queries.HISTORY_CATEGORY, category)
+    with connection() as conn:
+        rows = _newest_first(
+            conn, AdopterHistoryRecord, queries.ADOPTER_HISTORY_SELECT, [clause] if clause else [],
+            [adopter_id, *values], "ah.adopted_at", "ah.id", limit, after,
+        )
+    return _page(rows, limit, lambda r: (r[9], r[11]))
+
+def get_adopter_requests(adopter_id, status=None):
+    clause, values = _status_filter("ar.status", status)
+    parts = [queries.ADOPTER_REQUEST_SELECT]
+    if clause:
+        parts += [" AND ", clause]
+    parts.append(" ORDER BY ar.created_at DESC")
+    with connection() as conn:
+        return _fetch(conn, AdopterRequestRecord, queries.compose(*parts), [adopter_id, *values])
+
+def get_adopter_requests_page(adopter_id, limit=PAGE_SIZE, after=None, status=None):
+    """
+    Newest-first page of one adopter's requests. Returns (rows, next_cursor).
+    """
+    parts = [queries.ADOPTER_REQUEST_SELECT]
+    params = [adopter_id]
+    clause, values = _status_filter("ar.status", status)
+    if clause:
+        parts += [" AND ", clause]
+        params.extend(values)
+    if after is not None:
+        parts.append(" AND ar.id < ?")
+        params.append(after)
+    parts.append(" ORDER BY ar.id DESC LIMIT ?")
+    params.append(limit + 1)
+    with connection() as conn:
+        rows = _fetch(conn, AdopterRequestRecord, queries.compose(*parts), params)
+    return _page(rows, limit, lambda r: r[0])
 
 # --------------------------------------------------
 # PASSWORD RESET HELPERS
@@ -795,102 +1202,72 @@ def get_user_by_email(email, role):
     Fetch a user/admin by email for password reset checks.
     Returns a dict with id, name, email, role if found, else None.
     """
-    conn = connect()
-    cur = conn.cursor()
     role = (role or "").lower()
 
     if role == "admin":
-        cur.execute("""
-            SELECT admin_id, name, email
-            FROM admin
-            WHERE email=?
-        """, (email,))
-        row = cur.fetchone()
-        conn.close()
+        with connection() as conn:
+            row = conn.execute("""
+                SELECT admin_id, name, email
+                FROM admin
+                WHERE email=?
+            """, (email,)).fetchone()
         if row:
             return {"id": row[0], "name": row[1], "email": row[2], "role": "admin"}
         return None
 
     # default to adopter/users
-    cur.execute("""
-        SELECT users_id, name, email
-        FROM users
-        WHERE email=?
-    """, (email,))
-    row = cur.fetchone()
-    conn.close()
+    with connection() as conn:
+        row = conn.execute("""
+            SELECT users_id, name, email
+            FROM users
+            WHERE email=?
+        """, (email,)).fetchone()
     if row:
         return {"id": row[0], "name": row[1], "email": row[2], "role": "adopter"}
     return None
 
 
+@_queued_write
 def update_password_by_email(email, role, new_password):
     """
     Update password for either admin or adopter based on role + email.
     Returns True if a row was updated, False otherwise.
     """
-    conn = connect()
-    cur = conn.cursor()
     role = (role or "").lower()
+    with connection() as conn:
+        cur = conn.cursor()
+        if role == "admin":
+            cur.execute("UPDATE admin SET password=? WHERE email=?", (new_password, email))
+        else:
+            cur.execute("UPDATE users SET password=? WHERE email=?", (new_password, email))
+            # Keyed by email, so the affected users_id is not known here
+            _invalidate("user")
 
-    if role == "admin":
-        cur.execute("UPDATE admin SET password=? WHERE email=?", (new_password, email))
-    else:
-        cur.execute("UPDATE users SET password=? WHERE email=?", (new_password, email))
-
-    conn.commit()
-    updated = cur.rowcount > 0
-    conn.close()
+        updated = cur.rowcount > 0
     return updated
 
+@_queued_write
 def update_user_profile(users_id, name, email, phone_number, birthdate, photo_path, age=None):
-    conn = connect()
-    cur = conn.cursor()
     try:
-        cur.execute(
-            """
-            UPDATE users
-            SET name=?, email=?, phone_number=?, birthdate=?, photo_path=?, age=?
-            WHERE users_id=?
-            """,
-            (name, email, phone_number, birthdate, photo_path, age, users_id),
-        )
-        conn.commit()
+        with connection() as conn:
+            conn.execute(
+                """
+                UPDATE users
+                SET name=?, email=?, phone_number=?, birthdate=?, photo_path=?, age=?
+                WHERE users_id=?
+                """,
+                (name, email, phone_number, birthdate, photo_path, age, users_id),
+            )
+            _invalidate_user(users_id)
         return True
     except Exception as e:
         print(f"Error updating user: {e}")
         return False
-    finally:
-        conn.close()
 
 # --------------------------------------------------
 # SIGNUP / PENDING ADMINS
 # --------------------------------------------------
-def _ensure_admin_pending_table():
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS admin_pending (
-            pending_id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,
-            email TEXT NOT NULL,
-            password TEXT NOT NULL,
-            phone_number TEXT,
-            birthdate TEXT,
-            photo_path TEXT,
-            facebook_url TEXT,
-            instagram_url TEXT,
-            status TEXT DEFAULT 'pending',
-            created_at TEXT DEFAULT (datetime('now','localtime'))
-        )
-        """
-    )
-    conn.commit()
-    conn.close()
-    _ensure_admin_social_columns()
-
-
+@_queued_write
 def create_pending_admin(
     name,
     email,
@@ -901,37 +1278,30 @@ def create_pending_admin(
     facebook_url=None,
     instagram_url=None,
 ):
-    _ensure_admin_pending_table()
-    _ensure_admin_social_columns()
-    conn = connect()
-    cur = conn.cursor()
-    created_local = datetime.now().astimezone().strftime("%Y-%m-%d %H:%M:%S")
-    cur.execute(
-        """
-        INSERT INTO admin_pending (name, email, password, phone_number, birthdate, photo_path, facebook_url, instagram_url, status, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?)
-        """,
-        (name, email, password, phone_number, birthdate, photo_path, facebook_url, instagram_url, created_local),
-    )
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor()
+        created_local = datetime.now().astimezone().strftime("%Y-%m-%d %H:%M:%S")
+        cur.execute(
+            """
+            INSERT INTO admin_pending (name, email, password, phone_number, birthdate, photo_path, facebook_url, instagram_url, status, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?)
+            """,
+            (name, email, password, phone_number, birthdate, photo_path, facebook_url, instagram_url, created_local),
+        )
     return True
 
 
 def get_pending_admins():
-    _ensure_admin_pending_table()
-    _ensure_admin_social_columns()
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT pending_id, name, email, phone_number, birthdate, photo_path, facebook_url, instagram_url, status, created_at
-        FROM admin_pending
-        ORDER BY created_at DESC
-        """
-    )
-    rows = cur.fetchall()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT pending_id, name, email, phone_number, birthdate, photo_path, facebook_url, instagram_url, status, created_at
+            FROM admin_pending
+            ORDER BY created_at DESC
+            """
+        )
+        rows = cur.fetchall()
     return [
         {
             "pending_id": r[0],
@@ -949,82 +1319,73 @@ def get_pending_admins():
     ]
 
 
+@_queued_write
 def approve_pending_admin(pending_id):
-    _ensure_admin_pending_table()
-    _ensure_admin_social_columns()
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT name, email, password, phone_number, birthdate, photo_path, facebook_url, instagram_url FROM admin_pending WHERE pending_id=?",
-        (pending_id,),
-    )
-    row = cur.fetchone()
-    if not row:
-        conn.close()
-        return False
-    name, email, password, phone, birth, photo, fb_url, ig_url = row
-    cur.execute(
-        """
-        INSERT INTO admin (name, email, password, phone_number, birthdate, photo_path, facebook_url, instagram_url)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (name, email, password, phone, birth, photo, fb_url, ig_url),
-    )
-    cur.execute("DELETE FROM admin_pending WHERE pending_id=?", (pending_id,))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT name, email, password, phone_number, birthdate, photo_path, facebook_url, instagram_url FROM admin_pending WHERE pending_id=?",
+            (pending_id,),
+        )
+        row = cur.fetchone()
+        if not row:
+            return False
+        name, email, password, phone, birth, photo, fb_url, ig_url = row
+        cur.execute(
+            """
+            INSERT INTO admin (name, email, password, phone_number, birthdate, photo_path, facebook_url, instagram_url)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (name, email, password, phone, birth, photo, fb_url, ig_url),
+        )
+        cur.execute("DELETE FROM admin_pending WHERE pending_id=?", (pending_id,))
+        _invalidate("admins")
     return True
 
 
+@_queued_write
 def decline_pending_admin(pending_id):
-    _ensure_admin_pending_table()
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM admin_pending WHERE pending_id=?", (pending_id,))
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM admin_pending WHERE pending_id=?", (pending_id,))
     return True
 
 # --------------------------------------------------
 # DELETE ACCOUNTS
 # --------------------------------------------------
+@_queued_write
 def delete_admin(admin_id):
-    conn = connect()
-    cur = conn.cursor()
-    try:
+    with connection() as conn:
+        cur = conn.cursor()
         cur.execute("DELETE FROM admin WHERE admin_id=?", (admin_id,))
-        conn.commit()
+        _invalidate("admins")
         return True
-    finally:
-        conn.close()
 
+@_queued_write
 def delete_user(user_id):
-    conn = connect()
-    cur = conn.cursor()
-    try:
+    with connection() as conn:
+        cur = conn.cursor()
         cur.execute("DELETE FROM users WHERE users_id=?", (user_id,))
         cur.execute("DELETE FROM adoption_requests WHERE adopter_id=?", (user_id,))
-        conn.commit()
+        _invalidate_user(user_id)
         return True
-    finally:
-        conn.close()
 
 
+@_queued_write
 def create_adopter_user(name, email, password, phone_number=None, birthdate=None, photo_path=None):
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO users (name, email, password, role, age, birthdate, phone_number, photo_path)
-        VALUES (?, ?, ?, 'adopter', NULL, ?, ?, ?)
-        """,
-        (name, email, password, birthdate, phone_number, photo_path),
-    )
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO users (name, email, password, role, age, birthdate, phone_number, photo_path)
+            VALUES (?, ?, ?, 'adopter', NULL, ?, ?, ?)
+            """,
+            (name, email, password, birthdate, phone_number, photo_path),
+        )
     return True
 
 
+@_queued_write
 def create_admin_user(
     name,
     email,
@@ -1038,18 +1399,16 @@ def create_admin_user(
     """
     Create an admin directly (used for first/admin bootstrap when none exist).
     """
-    _ensure_admin_social_columns()
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO admin (name, email, password, phone_number, birthdate, photo_path, facebook_url, instagram_url)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (name, email, password, phone_number, birthdate, photo_path, facebook_url, instagram_url),
-    )
-    conn.commit()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            INSERT INTO admin (name, email, password, phone_number, birthdate, photo_path, facebook_url, instagram_url)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (name, email, password, phone_number, birthdate, photo_path, facebook_url, instagram_url),
+        )
+        _invalidate("admins")
     return True
 
 
@@ -1057,251 +1416,425 @@ def get_admin_profiles():
     """
     Return all admins with optional social links for About Us/profile displays.
     """
-    _ensure_admin_social_columns()
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT admin_id, name, email, phone_number, birthdate, photo_path, facebook_url, instagram_url
-        FROM admin
-        ORDER BY admin_id ASC
-        """
+    rows = _cached(
+        "admins",
+        None,
+        lambda conn: tuple(
+            _fetch(
+                conn,
+                AdminProfileRecord,
+                """
+                SELECT admin_id, name, email, phone_number, birthdate, photo_path, facebook_url, instagram_url
+                FROM admin
+                ORDER BY admin_id ASC
+                """,
+            )
+        ),
     )
-    rows = cur.fetchall()
-    conn.close()
-    return [
-        {
-            "admin_id": r[0],
-            "name": r[1],
-            "email": r[2],
-            "phone_number": r[3],
-            "birthdate": r[4],
-            "photo_path": r[5],
-            "facebook_url": r[6],
-            "instagram_url": r[7],
-        }
-        for r in rows
-    ]
+    # The cached tuple is shared; hand each caller its own list
+    return list(rows)
 # --------------------------------------------------
 # ADOPTION HISTORY
 # --------------------------------------------------
-def get_adoption_history():
-    _ensure_adoption_history_table()
-    conn = connect()
-    cur = conn.cursor()
-    _backfill_adoption_history(cur, adopter_id=None)
-    cur.execute("""
-        SELECT
-            COALESCE(ah.pet_name, p.name, '(Removed Pet)') as pet_name,
-            COALESCE(ah.category, p.category) as category,
-            COALESCE(ah.breed, p.breed) as breed,
-            p.age,
-            COALESCE(ah.sex, p.sex) as sex,
-            p.vaccinated,
-            p.status,
-            p.description,
-            p.photo_path,
-            ah.adopted_at as adopted_at,
-            COALESCE(ah.adopter_name, u.name) as adopter_name,
-            u.email as adopter_email
-        FROM adoption_history ah
-        LEFT JOIN pets p ON ah.pet_id = p.pet_id
-        LEFT JOIN users u ON ah.adopter_id = u.users_id
-        ORDER BY ah.adopted_at DESC
-    """)
-    rows = cur.fetchall()
-    conn.close()
-    return [
-        {
-            "pet_name": r[0],
-            "category": r[1],
-            "breed": r[2],
-            "age": r[3],
-            "sex": r[4],
-            "vaccinated": r[5],
-            "status": r[6],
-            "description": r[7],
-            "photo_path": r[8],
-            "adopted_at": r[9],
-            "adopter_name": r[10],
-            "adopter_email": r[11],
-        }
-        for r in rows
-    ]
+def get_adoption_history(category=None):
+    clause, params = _category_filter(queries.HISTORY_CATEGORY, category)
+    parts = [queries.HISTORY_SELECT]
+    if clause:
+        parts += [" WHERE ", clause]
+    parts.append(" ORDER BY ah.adopted_at DESC")
+    with read_connection() as conn:
+        return _fetch(conn, HistoryRecord, queries.compose(*parts), params)
+
+def get_adoption_history_counts(adopter_id=None):
+    """
+    Adoption counts per category, plus 'all'. Scoped to one adopter when given.
+    The overall counts are read from adoption_breed_rollup; one adopter's rows are
+    a range on idx_adoption_history_adopter_adopted.
+    """
+    with read_connection() as conn:
+        if adopter_id is None:
+            rows = conn.execute(queries.HISTORY_COUNTS).fetchall()
+        else:
+            rows = conn.execute(queries.ADOPTER_HISTORY_COUNTS, (adopter_id,)).fetchall()
+    return _category_counts(rows)
+
+def get_adoption_history_page(limit=PAGE_SIZE, after=None, category=None):
+    """
+    Newest-first page of adoption history keyed on (adopted_at, id).
+    `after` is the (adopted_at, id) cursor from the previous page. Returns (rows, next_cursor).
+    """
+    clause, values = _category_filter(queries.HISTORY_CATEGORY, category)
+    with read_connection() as conn:
+        rows = _newest_first(
+            conn, HistoryRecord, queries.HISTORY_SELECT, [clause] if clause else [],
+            values, "ah.adopted_at", "ah.id", limit, after,
+        )
+    return _page(rows, limit, lambda r: (r[9], r[12]))
 
 # --------------------------------------------------
 # MOST ADOPTED BREEDS
 # --------------------------------------------------
-def get_most_adopted_breeds():
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT p.breed, COUNT(*) as count
-        FROM adoption_requests ar
-        JOIN pets p ON ar.pet_id = p.pet_id
-        WHERE LOWER(TRIM(ar.status))='approved'
-        GROUP BY p.breed
-        ORDER BY count DESC
-        LIMIT 5
-    """)
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+# Both read the trigger-maintained rollups (migrations._v6_adoption_rollups), never adoption_history.
+def get_most_adopted_breeds(limit=5, category=None):
+    """
+    [(breed, adoptions)] for the most adopted breeds, optionally within one category.
+    """
+    clause, params = _category_filter("category", category)
+    parts = ["SELECT breed, SUM(adoptions) FROM adoption_breed_rollup WHERE adoptions > 0 AND breed != ''"]
+    if clause:
+        parts += [" AND ", clause]
+    parts.append(" GROUP BY breed ORDER BY 2 DESC, breed LIMIT ?")
+    sql = queries.compose(*parts)
+    with read_connection() as conn:
+        return conn.execute(sql, [*params, limit]).fetchall()
 
 # --------------------------------------------------
 # ADOPTION TREND
 # --------------------------------------------------
 def get_adoption_trend():
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT DATE(created_at), COUNT(*)
-        FROM adoption_requests
-        WHERE LOWER(TRIM(status))='approved'
-        GROUP BY DATE(created_at)
-        ORDER BY DATE(created_at)
-    """)
-    rows = cur.fetchall()
-    conn.close()
-    return rows
+    """
+    [(YYYY-MM, adoptions)] in month order.
+    """
+    with read_connection() as conn:
+        return conn.execute(
+            "SELECT month, adoptions FROM adoption_month_rollup WHERE adoptions > 0 AND month != '' ORDER BY month"
+        ).fetchall()
+
+
+def get_top_adoption_months(limit=5):
+    """
+    [(month_number, adoptions)] for the calendar months with the most adoptions across all years.
+    """
+    with read_connection() as conn:
+        return conn.execute(
+            """
+            SELECT CAST(substr(month, 6, 2) AS INTEGER), SUM(adoptions)
+            FROM adoption_month_rollup
+            WHERE adoptions > 0 AND month != ''
+            GROUP BY 1
+            ORDER BY 2 DESC, 1
+            LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
 
 # --------------------------------------------------
-# NOTIFICATIONS
+# RATINGS
 # --------------------------------------------------
-def _notification_schema(cursor):
+@_queued_write
+def add_rating(adopter_id, stars):
     """
-    Detect notification table columns so we can support older DBs.
-    Returns (date_col, has_read_flag, has_role_flag).
+    Record one 1-5 star rating; triggers fold it into rating_summary in the same transaction.
     """
-    cursor.execute("PRAGMA table_info(notifications)")
-    cols = [row[1] for row in cursor.fetchall()]
-    date_col = "created_at" if "created_at" in cols else "date"
-    has_is_read = "is_read" in cols
-    has_role = "role" in cols
-    return date_col, has_is_read, has_role
+    with connection() as conn:
+        conn.execute(
+            "INSERT INTO ratings (adopter_id, stars, created_at) VALUES (?, ?, ?)",
+            (adopter_id, int(stars), datetime.now().isoformat(sep=" ", timespec="seconds")),
+        )
 
 
-ADMIN_ID_OFFSET = 1_000_000
+def get_rating_summary():
+    """
+    Average, total and per-star counts read from the single rating_summary row.
+    """
+    with read_connection() as conn:
+        row = conn.execute(
+            "SELECT total, star_sum, stars_1, stars_2, stars_3, stars_4, stars_5 FROM rating_summary WHERE id=1"
+        ).fetchone()
+    total, star_sum, *counts = row or (0, 0, 0, 0, 0, 0, 0)
+    return {
+        "average": (star_sum / total) if total else 0.0,
+        "total": total,
+        "counts": dict(zip(range(1, 6), counts)),
+    }
 
-def _encode_user_id(user_id, role, has_role):
+# --------------------------------------------------
+# NOTIFICATIONS
+# --------------------------------------------------
+def _notification_role(role):
     """
-    For schemas without a role column, offset admin ids to avoid collisions with adopters.
+    Recipient role as stored in notifications.role; anything but 'admin' is an adopter.
     """
-    if has_role or role != "admin":
-        return user_id
-    try:
-        return int(user_id) + ADMIN_ID_OFFSET
-    except Exception:
-        return user_id
+    return "admin" if role == "admin" else "adopter"
 
 
+@_queued_write
 def create_notification(user_id, message, role=None):
-    conn = connect()
-    cur = conn.cursor()
-    date_col, has_is_read, has_role = _notification_schema(cur)
-    encoded_user_id = _encode_user_id(user_id, role, has_role)
-    columns = ["user_id", "message", date_col]
-    values = [encoded_user_id, message, datetime.now().isoformat(sep=" ", timespec="seconds")]
-
-    if has_is_read:
-        columns.append("is_read")
-        values.append(0)
-    if has_role:
-        columns.append("role")
-        values.append(role or "")
+    with connection() as conn:
+        conn.execute(
+            "INSERT INTO notifications (user_id, role, message, created_at, is_read) VALUES (?, ?, ?, ?, 0)",
+            (user_id, _notification_role(role), message, datetime.now().isoformat(sep=" ", timespec="seconds")),
+        )
 
-    placeholders = ", ".join(["?"] * len(columns))
-    cur.execute(f"INSERT INTO notifications ({', '.join(columns)}) VALUES ({placeholders})", values)
-    conn.commit()
-    conn.close()
 
+@_queued_write
+def create_notifications(rows):
+    """
+    Insert many (user_id, message, role) notifications with one executemany.
+    """
+    created_at = datetime.now().isoformat(sep=" ", timespec="seconds")
+    with connection() as conn:
+        conn.executemany(
+            "INSERT INTO notifications (user_id, role, message, created_at, is_read) VALUES (?, ?, ?, ?, 0)",
+            [(user_id, _notification_role(role), message, created_at) for user_id, message, role in rows],
+        )
 
 # Convenience aliases for notifier calls used elsewhere
 add_notification = create_notification
 
 
 def get_notifications(user_id=None, role=None):
-    conn = connect()
-    cur = conn.cursor()
-    date_col, has_is_read, has_role = _notification_schema(cur)
-    encoded_user_id = _encode_user_id(user_id, role, has_role) if user_id is not None else None
-    read_col = "is_read" if has_is_read else "0 as is_read"
-    role_col = "role" if has_role else "'' as role"
-    select_cols = f"id, user_id, message, {date_col} as created_at, {read_col}, {role_col}"
+    with connection() as conn:
+        if user_id is not None:
+            return _fetch(
+                conn,
+                NotificationRecord,
+                queries.NOTIFICATIONS_FOR_USER,
+                (_notification_role(role), user_id),
+            )
+        return _fetch(conn, NotificationRecord, queries.NOTIFICATIONS_ALL)
 
-    if user_id is not None and has_role and role is not None:
-        cur.execute(
-            f"SELECT {select_cols} FROM notifications WHERE user_id=? AND role=? ORDER BY {date_col} DESC",
-            (user_id, role),
+
+def get_notifications_for_user(user_id, role=None):
+    return get_notifications(user_id, role)
+
+
+def get_notifications_page(user_id, role=None, limit=PAGE_SIZE, after=None):
+    """
+    Newest-first page of one user's notifications keyed on (created_at, id).
+    Returns (rows, next_cursor).
+    """
+    with connection() as conn:
+        rows = _newest_first(
+            conn, NotificationRecord, queries.NOTIFICATION_SELECT, ["role=?", "user_id=?"],
+            [_notification_role(role), user_id], "created_at", "id", limit, after,
         )
-    elif user_id is not None:
-        cur.execute(f"SELECT {select_cols} FROM notifications WHERE user_id=? ORDER BY {date_col} DESC", (encoded_user_id,))
-    else:
-        cur.execute(f"SELECT {select_cols} FROM notifications ORDER BY {date_col} DESC")
+    return _page(rows, limit, lambda r: (r[3], r[0]))
+
+
+def count_unread(user_id, role=None):
+    """
+    Number of unread notifications for one user; a range scan on the role/user/is_read index.
+    """
+    with connection() as conn:
+        return conn.execute(queries.COUNT_UNREAD, (_notification_role(role), user_id)).fetchone()[0]
+
+
+def get_notifications_since(user_id, role=None, last_id=0):
+    """
+    One user's notifications with id > last_id, oldest first, for incremental polling.
+    """
+    with connection() as conn:
+        return _fetch(
+            conn,
+            NotificationRecord,
+            queries.NOTIFICATIONS_SINCE,
+            (_notification_role(role), user_id, last_id or 0),
+        )
+
+
+def _notification_owner(notification_id, user_id, role):
+    """WHERE clause for one notification, limited to its recipient when user_id is given."""
+    if user_id is None:
+        return "id=?", (notification_id,)
+    return "id=? AND role=? AND user_id=?", (notification_id, _notification_role(role), user_id)
+
+
+@_queued_write
+def mark_notification_read(notification_id, user_id=None, role=None):
+    """
+    Mark one notification read. If user_id is provided, only that recipient's row is touched.
+    """
+    where, params = _notification_owner(notification_id, user_id, role)
+    with connection() as conn:
+        return conn.execute(f"UPDATE notifications SET is_read=1 WHERE {where}", params).rowcount > 0
 
-    rows = cur.fetchall()
-    conn.close()
 
+@_queued_write
+def clear_notifications_for_user(user_id, role=None):
+    with connection() as conn:
+        conn.execute("DELETE FROM notifications WHERE role=? AND user_id=?", (_notification_role(role), user_id))
+
+
+@_queued_write
+def delete_notification(notification_id, user_id=None, role=None):
+    """
+    Delete one notification. If user_id is provided, only that recipient's row is removed.
+    """
+    where, params = _notification_owner(notification_id, user_id, role)
+    with connection() as conn:
+        return conn.execute(f"DELETE FROM notifications WHERE {where}", params).rowcount > 0
+
+
+# --------------------------------------------------
+# NOTIFICATION RETENTION
+# --------------------------------------------------
+def _expired_notification_ids(conn, cutoff, max_per_user):
+    """
+    Ids of notifications older than `cutoff` or beyond the newest `max_per_user` for their
+    recipient, in one pass over idx_notifications_role_user_created.
+    """
     return [
-        {"id": r[0], "user_id": r[1], "message": r[2], "created_at": r[3], "is_read": bool(r[4]), "role": r[5]}
-        for r in rows
+        row[0]
+        for row in conn.execute(
+            """
+            SELECT id FROM (
+                SELECT id, created_at,
+                       ROW_NUMBER() OVER (PARTITION BY role, user_id ORDER BY created_at DESC, id DESC) AS rank
+                FROM notifications
+            )
+            WHERE created_at < ? OR rank > ?
+            """,
+            (cutoff, max_per_user),
+        )
     ]
 
 
-def get_notifications_for_user(user_id, role=None):
-    return get_notifications(user_id, role)
+@_queued_write
+def _remove_notifications(ids, archive):
+    """
+    Archive (unless archive is False) and delete one batch of notifications. Returns the rows deleted.
+    """
+    marks = ", ".join("?" * len(ids))
+    with connection() as conn:
+        if archive:
+            conn.execute(
+                f"""
+                INSERT OR REPLACE INTO notifications_archive (id, role, user_id, message, created_at, archived_at)
+                SELECT id, role, user_id, message, created_at, ? FROM notifications WHERE id IN ({marks})
+                """,
+                [datetime.now().isoformat(sep=" ", timespec="seconds"), *ids],
+            )
+        return conn.execute(f"DELETE FROM notifications WHERE id IN ({marks})", ids).rowcount
 
 
-def mark_notification_read(notification_id):
-    conn = connect()
-    cur = conn.cursor()
-    date_col, has_is_read, _ = _notification_schema(cur)
-    try:
-        if has_is_read:
-            cur.execute("UPDATE notifications SET is_read=1 WHERE id=?", (notification_id,))
-        else:
-            # Older schema without is_read: remove the row instead.
-            cur.execute("DELETE FROM notifications WHERE id=?", (notification_id,))
-        conn.commit()
-    finally:
-        conn.close()
+def prune_notifications(max_age_days, max_per_user, archive=True, batch_size=500):
+    """
+    Move (or delete, when archive is False) notifications outside the retention policy.
+    The expired ids are found once per run; the deletes go through the write queue one
+    batch per transaction, so foreground writers are never blocked for long.
+    Returns the number of rows removed from notifications.
+    """
+    cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat(sep=" ", timespec="seconds")
+    with read_connection() as conn:
+        ids = _expired_notification_ids(conn, cutoff, max_per_user)
+    return sum(_remove_notifications(batch, archive) for batch in _chunks(ids, batch_size))
 
 
-def clear_notifications_for_user(user_id, role=None):
-    conn = connect()
-    cur = conn.cursor()
-    try:
-        date_col, has_is_read, has_role = _notification_schema(cur)
-        encoded = _encode_user_id(user_id, role, has_role)
-        cur.execute("DELETE FROM notifications WHERE user_id=?", (encoded,))
-        conn.commit()
-    finally:
-        conn.close()
+def _require_no_transaction(conn, name):
+    if _LOCAL.depth > 1 or conn.in_transaction:
+        raise RuntimeError(f"{name}() cannot run inside a transaction")
 
 
-def delete_notification(notification_id):
-    conn = connect()
-    cur = conn.cursor()
-    try:
-        cur.execute("DELETE FROM notifications WHERE id=?", (notification_id,))
-        conn.commit()
-    finally:
-        conn.close()
+def incremental_vacuum_enabled():
+    """True once the file uses auto_vacuum=INCREMENTAL, i.e. incremental_vacuum() can free pages."""
+    with connection() as conn:
+        return conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
 
 
-def notify_all_admins(message):
+def enable_incremental_vacuum():
     """
-    Add a notification for every admin user. Falls back to user_id=1 if no admins are found.
+    Switch an existing database to auto_vacuum=INCREMENTAL. This needs a full VACUUM once;
+    afterwards it is a no-op. Returns True if the file was converted.
     """
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute("SELECT admin_id FROM admin")
-    admin_ids = [row[0] for row in cur.fetchall()]
-    conn.close()
-    if not admin_ids:
-        return
-    for admin_id in admin_ids:
+    with connection() as conn:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        _require_no_transaction(conn, "enable_incremental_vacuum")
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+
+
+def incremental_vacuum(pages=None):
+    """
+    Return free pages to the OS (all of them, or at most `pages`). Returns the number of pages freed.
+    """
+    with connection() as conn:
+        _require_no_transaction(conn, "incremental_vacuum")
+        before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        # execute() steps this pragma once (one page); executescript() runs it to completion
+        count = "" if pages is None else f"({int(pages)})"
+        conn.executescript(f"PRAGMA incremental_vacuum{count};")
+        return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+
+def optimize(analyze=False):
+    """
+    Refresh planner statistics. PRAGMA optimize only re-analyzes tables whose stats look
+    stale; analyze=True runs a full ANALYZE first (e.g. after a bulk import).
+    """
+    with connection() as conn:
+        _require_no_transaction(conn, "optimize")
+        if analyze:
+            conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+
+
+WAL_CHECKPOINT_MODES = ("PASSIVE", "FULL", "RESTART", "TRUNCATE")
+
+
+def wal_checkpoint(mode="TRUNCATE"):
+    """
+    Copy the WAL back into the database file; TRUNCATE also resets the -wal file to zero bytes.
+    Returns {"busy", "log_frames", "checkpointed_frames"}; busy=1 means readers kept it from finishing.
+    """
+    mode = mode.upper()
+    if mode not in WAL_CHECKPOINT_MODES:
+        raise ValueError(f"Unknown checkpoint mode: {mode}")
+    with connection() as conn:
+        _require_no_transaction(conn, "wal_checkpoint")
+        busy, log_frames, checkpointed = conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        return {"busy": busy, "log_frames": log_frames, "checkpointed_frames": checkpointed}
+
+
+def integrity_check(quick=False, max_errors=100):
+    """
+    Run PRAGMA integrity_check (or the faster quick_check). Returns a list of problems; empty means ok.
+    """
+    pragma = "quick_check" if quick else "integrity_check"
+    with connection() as conn:
+        rows = conn.execute(f"PRAGMA {pragma}({int(max_errors)})").fetchall()
+    problems = [row[0] for row in rows]
+    return [] if problems == ["ok"] else problems
+
+
+def backup(dest_path, pages=BACKUP_PAGES_PER_STEP, sleep=BACKUP_STEP_SLEEP, progress=None):
+    """
+    Consistent online copy of the database to dest_path via the SQLite backup API.
+    Copies `pages` pages per step and sleeps `sleep` seconds between steps, so the
+    source is only briefly locked at a time and live users are not stalled. The copy
+    is written next to dest_path and renamed into place once complete.
+    Returns {"path", "pages", "seconds"}.
+    """
+    dest_path = Path(dest_path)
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest_path.with_name(dest_path.name + ".partial")
+    started = time.monotonic()
+    with connection() as conn:
+        _require_no_transaction(conn, "backup")
+        total = conn.execute("PRAGMA page_count").fetchone()[0]
+        dest = sqlite3.connect(tmp_path)
         try:
-            create_notification(admin_id, message, role="admin")
+            conn.backup(dest, pages=pages, progress=progress, sleep=sleep)
         except Exception:
-            continue
+            dest.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+        dest.close()
+    os.replace(tmp_path, dest_path)
+    return {"path": str(dest_path), "pages": total, "seconds": round(time.monotonic() - started, 3)}
+
+
+@_queued_write
+def notify_all_admins(message):
+    """
+    Add an admin-role notification for every row in the admin table. With no admins
+    nothing is written.
+    """
+    # One transaction for the whole fan-out instead of a commit per admin.
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT admin_id FROM admin")
+        admin_ids = [row[0] for row in cur.fetchall()]
+        create_notifications([(admin_id, message, "admin") for admin_id in admin_ids])
@@ -0,0 +1,255 @@
+"""
+Database maintenance: notification retention, incremental vacuum, planner statistics,
+WAL checkpoints, integrity checks and online backups.
+
+Each step is a plain function listed in STEPS, so it can be run from the CLI:
+
+    python -m app.models.maintenance checkpoint optimize backup
+
+start() runs the steps on a daemon thread, each at most once per MAINTENANCE_SCHEDULE
+interval and only while the UI is idle (the app calls note_activity() on user input).
+"vacuum" converts a file that predates auto_vacuum=INCREMENTAL (the shipped database
+does) on the first idle tick; until then the retention pass skips incremental vacuum.
+The thread uses its own pooled connection, so the UI thread never waits on it beyond
+short per-step locks; backups copy a few pages at a time for the same reason.
+"""
+
+import argparse
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Allow running directly for debugging; inject repo root into sys.path
+if __name__ == "__main__":
+    ROOT = Path(__file__).resolve().parents[2]
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+
+from app.config import (
+    BACKUP_DIR,
+    BACKUP_KEEP,
+    MAINTENANCE_IDLE_SECONDS,
+    MAINTENANCE_SCHEDULE,
+    MAINTENANCE_TICK_SECONDS,
+    NOTIFICATION_MAX_AGE_DAYS,
+    NOTIFICATION_MAX_PER_USER,
+)
+from app.models import database
+
+_LOCK = threading.Lock()
+_STOP = threading.Event()
+_THREAD = None
+
+# time.monotonic() of the last UI input (start() counts as input); 0 means none yet
+_LAST_ACTIVITY = 0.0
+# step name -> time.monotonic() of its last successful run
+_LAST_RUN = {}
+
+
+def run_maintenance(
+    max_age_days=NOTIFICATION_MAX_AGE_DAYS,
+    max_per_user=NOTIFICATION_MAX_PER_USER,
+    archive=True,
+):
+    """
+    Retention pass: prune old notifications and return the freed pages. Returns a summary dict.
+    Pages are only returned to the OS once the file uses incremental vacuum (see vacuum());
+    before that freed pages stay on the freelist and are reused by later writes.
+    """
+    pruned = database.prune_notifications(max_age_days, max_per_user, archive=archive)
+    freed = database.incremental_vacuum() if database.incremental_vacuum_enabled() else 0
+    return {"notifications_pruned": pruned, "pages_freed": freed}
+
+
+def vacuum():
+    """
+    One-off conversion of an existing file to incremental vacuum. This rewrites the whole
+    database with VACUUM, so it only runs while the UI is idle (or from the CLI); once the
+    file is converted it is just a PRAGMA check.
+    """
+    return {"converted_to_incremental": database.enable_incremental_vacuum()}
+
+
+def optimize(analyze=False):
+    database.optimize(analyze=analyze)
+    return {"analyzed": analyze}
+
+
+def checkpoint(mode="TRUNCATE"):
+    return database.wal_checkpoint(mode)
+
+
+def integrity_check(quick=False):
+    problems = database.integrity_check(quick=quick)
+    return {"ok": not problems, "problems": problems}
+
+
+def backup(dest=None, keep=BACKUP_KEEP, backup_dir=BACKUP_DIR):
+    """
+    Online backup to dest, or to a timestamped file in backup_dir keeping the newest `keep`.
+    """
+    backup_dir = Path(backup_dir)
+    if dest is None:
+        dest = backup_dir / f"fureverhome-{datetime.now():%Y%m%d-%H%M%S}.db"
+    summary = database.backup(dest)
+    if Path(dest).parent == backup_dir:
+        summary["removed"] = [str(path) for path in _prune_backups(backup_dir, keep)]
+    return summary
+
+
+def _backups(backup_dir):
+    return sorted(Path(backup_dir).glob("fureverhome-*.db"))
+
+
+def _prune_backups(backup_dir, keep):
+    stale = _backups(backup_dir)[:-keep] if keep > 0 else []
+    for path in stale:
+        path.unlink(missing_ok=True)
+    return stale
+
+
+STEPS = {
+    "retention": run_maintenance,
+    "checkpoint": checkpoint,
+    "optimize": optimize,
+    "analyze": lambda: optimize(analyze=True),
+    "integrity": integrity_check,
+    "backup": backup,
+    "vacuum": vacuum,
+}
+
+
+def run_steps(names, steps=STEPS):
+    """
+    Run the named steps in order. Returns {name: summary}; a failing step reports {"error": ...}
+    and the rest still run.
+    """
+    results = {}
+    for name in names:
+        try:
+            results[name] = steps[name]()
+        except Exception as e:
+            print(f"Database maintenance step '{name}' failed: {e}")
+            results[name] = {"error": str(e)}
+        else:
+            _LAST_RUN[name] = time.monotonic()
+    return results
+
+
+# --------------------------------------------------
+# Idle-time scheduling
+# --------------------------------------------------
+def note_activity():
+    """
+    Record UI input; scheduled steps wait until MAINTENANCE_IDLE_SECONDS have passed since.
+    """
+    global _LAST_ACTIVITY
+    _LAST_ACTIVITY = time.monotonic()
+
+
+def idle_seconds():
+    return time.monotonic() - _LAST_ACTIVITY if _LAST_ACTIVITY else float("inf")
+
+
+def schedule_first_runs(schedule=MAINTENANCE_SCHEDULE, now=None):
+    """
+    Treat every step that has not run yet as having just run, so its first run comes one
+    interval after start() instead of on the first idle tick. A backup left on disk by an
+    earlier session counts as the last backup, so short sessions still get a daily one;
+    "vacuum" stays due while the file still needs converting.
+    """
+    now = time.monotonic() if now is None else now
+    for name in schedule:
+        if name in _LAST_RUN:
+            continue
+        # An unconverted file gets its vacuum on the first idle tick
+        if name == "vacuum" and not database.incremental_vacuum_enabled():
+            continue
+        _LAST_RUN[name] = now
+        if name == "backup":
+            existing = _backups(BACKUP_DIR)
+            if existing:
+                _LAST_RUN[name] = now - max(0.0, time.time() - existing[-1].stat().st_mtime)
+
+
+def due_steps(schedule=MAINTENANCE_SCHEDULE, now=None):
+    """
+    Steps whose interval has passed since they last ran; a step that never ran is due.
+    """
+    now = time.monotonic() if now is None else now
+    return [
+        name for name, interval in schedule.items()
+        if _LAST_RUN.get(name) is None or now - _LAST_RUN[name] >= interval
+    ]
+
+
+def _loop(tick, idle_after):
+    while not _STOP.is_set():
+        if idle_seconds() >= idle_after:
+            for name in due_steps():
+                # Stop between steps as soon as the user comes back
+                if _STOP.is_set() or idle_seconds() < idle_after:
+                    break
+                run_steps([name])
+        _STOP.wait(tick)
+    database.close_thread_connection()
+
+
+def start(tick=MAINTENANCE_TICK_SECONDS, idle_after=MAINTENANCE_IDLE_SECONDS):
+    """
+    Start the maintenance thread. The idle clock starts now and each step first runs one
+    interval from now, so nothing runs during startup. Safe to call twice.
+    """
+    global _THREAD
+    with _LOCK:
+        if _THREAD is not None and _THREAD.is_alive():
+            return _THREAD
+        note_activity()
+        schedule_first_runs()
+        _STOP.clear()
+        _THREAD = threading.Thread(target=_loop, args=(tick, idle_after), name="db-maintenance", daemon=True)
+        _THREAD.start()
+        return _THREAD
+
+
+def stop(timeout=5):
+    global _THREAD
+    with _LOCK:
+        thread, _THREAD = _THREAD, None
+    _STOP.set()
+    if thread is not None:
+        thread.join(timeout)
+
+
+# --------------------------------------------------
+# CLI
+# --------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.models.maintenance", description="FurEver Home database maintenance")
+    parser.add_argument("steps", nargs="*", metavar="step",
+                        help=f"steps to run, in order (default: all scheduled): {', '.join(sorted(STEPS))}")
+    parser.add_argument("--db", help="database file (default: the app database)")
+    parser.add_argument("--backup-to", help="write the backup to this file instead of the backups folder")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.steps if name not in STEPS]
+    if unknown:
+        parser.error(f"unknown step(s): {', '.join(unknown)}")
+
+    if args.db:
+        database.DB_PATH = args.db
+    database.migrate()
+    steps = dict(STEPS)
+    if args.backup_to:
+        steps["backup"] = lambda: backup(dest=args.backup_to)
+    results = run_steps(args.steps or list(MAINTENANCE_SCHEDULE), steps)
+    for name, summary in results.items():
+        print(f"{name}: {summary}")
+    database.close_connections()
+    failed = any("error" in summary or summary.get("ok") is False for summary in results.values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,670 @@
+"""
+Versioned schema migrations keyed on PRAGMA user_version.
+Each step runs once per database file; query helpers can then rely on fixed column names.
+"""
+
+import sqlite3
+
+# Before schema v10 notifications had no role column and admin ids were stored offset by this much.
+ADMIN_ID_OFFSET = 1_000_000
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _v1_baseline(conn):
+    """
+    Create any missing core tables and bring legacy columns up to date.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            users_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL,
+            password TEXT NOT NULL,
+            role TEXT DEFAULT 'adopter',
+            age INT,
+            birthdate TEXT,
+            phone_number TEXT,
+            photo_path TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS admin (
+            admin_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            age INTEGER,
+            birthdate TEXT,
+            phone_number TEXT,
+            email TEXT NOT NULL,
+            password TEXT NOT NULL,
+            photo_path TEXT,
+            facebook_url TEXT,
+            instagram_url TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS admin_pending (
+            pending_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL,
+            password TEXT NOT NULL,
+            phone_number TEXT,
+            birthdate TEXT,
+            photo_path TEXT,
+            facebook_url TEXT,
+            instagram_url TEXT,
+            status TEXT DEFAULT 'pending',
+            created_at TEXT DEFAULT (datetime('now','localtime'))
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS pets (
+            pet_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            breed TEXT,
+            age INTEGER,
+            sex TEXT,
+            vaccinated TEXT,
+            status TEXT DEFAULT 'available',
+            description TEXT,
+            photo_path TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS adoption_requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            adopter_id INTEGER,
+            pet_id INTEGER,
+            information TEXT,
+            status TEXT DEFAULT 'pending',
+            created_at TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS adoption_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            adopter_id INTEGER,
+            pet_id INTEGER,
+            pet_name TEXT,
+            category TEXT,
+            breed TEXT,
+            sex TEXT,
+            adopted_at TEXT,
+            adopter_name TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS notifications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            message TEXT,
+            created_at TEXT,
+            is_read INTEGER DEFAULT 0
+        )
+        """
+    )
+
+    for table in ("admin", "admin_pending"):
+        cols = _columns(conn, table)
+        if "facebook_url" not in cols:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN facebook_url TEXT")
+        if "instagram_url" not in cols:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN instagram_url TEXT")
+
+    # Older DBs called the adoption note column 'reason'.
+    cols = _columns(conn, "adoption_requests")
+    if "information" not in cols:
+        if "reason" in cols:
+            conn.execute("ALTER TABLE adoption_requests RENAME COLUMN reason TO information")
+        else:
+            conn.execute("ALTER TABLE adoption_requests ADD COLUMN information TEXT")
+
+
+def _v2_notification_columns(conn):
+    """
+    Normalize notifications to (id, user_id, message, created_at, is_read).
+    """
+    cols = _columns(conn, "notifications")
+    if "created_at" not in cols:
+        if "date" in cols:
+            conn.execute("ALTER TABLE notifications RENAME COLUMN date TO created_at")
+        else:
+            conn.execute("ALTER TABLE notifications ADD COLUMN created_at TEXT")
+    if "is_read" not in cols:
+        conn.execute("ALTER TABLE notifications ADD COLUMN is_read INTEGER DEFAULT 0")
+    if "role" in cols:
+        # Fold any role-tagged admin rows into the offset encoding used everywhere else.
+        conn.execute(
+            "UPDATE notifications SET user_id = user_id + ? WHERE role='admin' AND user_id < ?",
+            (ADMIN_ID_OFFSET, ADMIN_ID_OFFSET),
+        )
+
+
+# Index set created by migration 3: (name, table, columns). Frozen, since later steps build on it.
+_V3_INDEXES = (
+    ("idx_adoption_requests_adopter_pet_status", "adoption_requests", ("adopter_id", "pet_id", "status")),
+    ("idx_adoption_requests_pet", "adoption_requests", ("pet_id",)),
+    ("idx_pets_status_category", "pets", ("status", "category")),
+    ("idx_notifications_user_created", "notifications", ("user_id", "created_at")),
+    ("idx_users_email", "users", ("email",)),
+    ("idx_admin_email", "admin", ("email",)),
+    ("idx_adoption_history_adopter_adopted", "adoption_history", ("adopter_id", "adopted_at")),
+)
+
+# Added by migration 12 for the newest-first history and notification pages.
+_V12_INDEXES = (
+    ("idx_adoption_history_adopted", "adoption_history", ("adopted_at",)),
+    ("idx_notifications_role_user_created", "notifications", ("role", "user_id", "created_at")),
+)
+
+# Managed secondary indexes at the current schema version.
+INDEXES = tuple(index for index in _V3_INDEXES if index[0] != "idx_notifications_user_created") + (
+    ("idx_notifications_role_user_read_created", "notifications", ("role", "user_id", "is_read", "created_at")),
+) + _V12_INDEXES
+
+
+def ensure_indexes(conn, indexes=INDEXES):
+    for name, table, cols in indexes:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(cols)})")
+
+
+def _v3_indexes(conn):
+    """
+    Store status/category in canonical lowercase so lookups can compare the raw
+    indexed column, then create the managed index set.
+    """
+    conn.execute("UPDATE adoption_requests SET status=LOWER(TRIM(status)) WHERE status IS NOT LOWER(TRIM(status))")
+    conn.execute("UPDATE pets SET status=LOWER(TRIM(status)) WHERE status IS NOT LOWER(TRIM(status))")
+    conn.execute("UPDATE pets SET category=LOWER(TRIM(category)) WHERE category IS NOT LOWER(TRIM(category))")
+    conn.execute("UPDATE adoption_history SET category=LOWER(TRIM(category)) WHERE category IS NOT LOWER(TRIM(category))")
+    ensure_indexes(conn, _V3_INDEXES)
+
+
+def _v4_pet_search(conn):
+    """
+    External-content FTS5 index over pets(name, breed, description), kept in sync by triggers.
+    Builds without FTS5 skip this step; search then falls back to LIKE.
+    """
+    try:
+        conn.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS pets_fts USING fts5(
+                name, breed, description,
+                content='pets', content_rowid='pet_id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+            """
+        )
+    except sqlite3.OperationalError:
+        return
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS pets_fts_ai AFTER INSERT ON pets BEGIN
+            INSERT INTO pets_fts(rowid, name, breed, description)
+            VALUES (new.pet_id, new.name, new.breed, new.description);
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS pets_fts_ad AFTER DELETE ON pets BEGIN
+            INSERT INTO pets_fts(pets_fts, rowid, name, breed, description)
+            VALUES ('delete', old.pet_id, old.name, old.breed, old.description);
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS pets_fts_au AFTER UPDATE OF name, breed, description ON pets BEGIN
+            INSERT INTO pets_fts(pets_fts, rowid, name, breed, description)
+            VALUES ('delete', old.pet_id, old.name, old.breed, old.description);
+            INSERT INTO pets_fts(rowid, name, breed, description)
+            VALUES (new.pet_id, new.name, new.breed, new.description);
+        END
+        """
+    )
+    conn.execute("INSERT INTO pets_fts(pets_fts) VALUES ('rebuild')")
+
+
+def _add_to(table, keys, value_col, delta):
+    """
+    Trigger body fragment adding `delta` to `value_col` of the `table` row whose
+    key columns match `keys` ({column: sql_expr}), creating the row at 0 first.
+    """
+    cols = ", ".join(keys)
+    exprs = ", ".join(keys.values())
+    where = " AND ".join(f"{col} = {expr}" for col, expr in keys.items())
+    return f"""
+            INSERT OR IGNORE INTO {table} ({cols}, {value_col}) VALUES ({exprs}, 0);
+            UPDATE {table} SET {value_col} = {value_col} + ({delta}) WHERE {where};"""
+
+
+def _bump(key_expr, delta):
+    """
+    Trigger body fragment adding `delta` to the stats_counters row named by `key_expr`.
+    """
+    return _add_to("stats_counters", {"key": key_expr}, "value", delta)
+
+
+def _create_triggers(conn, triggers):
+    for name, event, body in triggers:
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN{body}\n        END")
+
+
+# Counter keys: pets:<status>:<category>, requests:<status> and adoptions.
+_PET_KEY = "'pets:' || COALESCE({row}.status, 'available') || ':' || COALESCE({row}.category, '')"
+_REQUEST_KEY = "'requests:' || COALESCE({row}.status, 'pending')"
+
+
+def seed_stats_counters(conn):
+    """
+    Recount stats_counters from the base tables.
+    """
+    conn.execute("DELETE FROM stats_counters")
+    conn.execute(
+        f"INSERT INTO stats_counters (key, value) SELECT {_PET_KEY.format(row='pets')}, COUNT(*) FROM pets GROUP BY 1"
+    )
+    conn.execute(
+        f"""
+        INSERT INTO stats_counters (key, value)
+        SELECT {_REQUEST_KEY.format(row='adoption_requests')}, COUNT(*) FROM adoption_requests GROUP BY 1
+        """
+    )
+    conn.execute("INSERT INTO stats_counters (key, value) SELECT 'adoptions', COUNT(*) FROM adoption_history")
+
+
+def _v5_stats_counters(conn):
+    """
+    Dashboard counters kept current by triggers, so totals are read from a
+    handful of rows instead of counted from the base tables.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS stats_counters (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """
+    )
+    pet_new, pet_old = _PET_KEY.format(row="new"), _PET_KEY.format(row="old")
+    req_new, req_old = _REQUEST_KEY.format(row="new"), _REQUEST_KEY.format(row="old")
+    triggers = (
+        ("stats_pets_ai", "AFTER INSERT ON pets", _bump(pet_new, 1)),
+        ("stats_pets_ad", "AFTER DELETE ON pets", _bump(pet_old, -1)),
+        (
+            "stats_pets_au",
+            f"AFTER UPDATE OF status, category ON pets WHEN {pet_old} IS NOT {pet_new}",
+            _bump(pet_old, -1) + _bump(pet_new, 1),
+        ),
+        ("stats_requests_ai", "AFTER INSERT ON adoption_requests", _bump(req_new, 1)),
+        ("stats_requests_ad", "AFTER DELETE ON adoption_requests", _bump(req_old, -1)),
+        (
+            "stats_requests_au",
+            f"AFTER UPDATE OF status ON adoption_requests WHEN {req_old} IS NOT {req_new}",
+            _bump(req_old, -1) + _bump(req_new, 1),
+        ),
+        ("stats_history_ai", "AFTER INSERT ON adoption_history", _bump("'adoptions'", 1)),
+        ("stats_history_ad", "AFTER DELETE ON adoption_history", _bump("'adoptions'", -1)),
+    )
+    _create_triggers(conn, triggers)
+    seed_stats_counters(conn)
+
+
+# Rollup keys taken from the adoption_history snapshot, so deleted pets still count.
+# Breeds are keyed lowercase, so "Labrador" and "labrador " count as one breed.
+_BREED_KEYS = {"category": "COALESCE({row}.category, '')", "breed": "COALESCE(LOWER(TRIM({row}.breed)), '')"}
+_MONTH_KEYS = {"month": "COALESCE(strftime('%Y-%m', {row}.adopted_at), '')"}
+
+
+def _rollup_keys(keys, row):
+    return {col: expr.format(row=row) for col, expr in keys.items()}
+
+
+def seed_adoption_rollups(conn):
+    """
+    Rebuild both adoption rollups from adoption_history.
+    """
+    for table, keys in (("adoption_breed_rollup", _BREED_KEYS), ("adoption_month_rollup", _MONTH_KEYS)):
+        exprs = _rollup_keys(keys, "adoption_history")
+        conn.execute(f"DELETE FROM {table}")
+        conn.execute(
+            f"""
+            INSERT INTO {table} ({', '.join(exprs)}, adoptions)
+            SELECT {', '.join(exprs.values())}, COUNT(*) FROM adoption_history
+            GROUP BY {', '.join(str(n + 1) for n in range(len(exprs)))}
+            """
+        )
+
+
+def _v6_adoption_rollups(conn):
+    """
+    Adoptions per (category, breed) and per month, updated by triggers as
+    adoption_history rows (one per approval) come and go.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS adoption_breed_rollup (
+            category TEXT NOT NULL,
+            breed TEXT NOT NULL,
+            adoptions INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (category, breed)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS adoption_month_rollup (
+            month TEXT PRIMARY KEY,
+            adoptions INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """
+    )
+    _create_triggers(conn, _rollup_triggers(_ROLLUPS))
+    seed_adoption_rollups(conn)
+
+
+# (trigger prefix, table, key expressions, adoption_history columns the keys read)
+_ROLLUPS = (
+    ("rollup_breed", "adoption_breed_rollup", _BREED_KEYS, "category, breed"),
+    ("rollup_month", "adoption_month_rollup", _MONTH_KEYS, "adopted_at"),
+)
+
+
+def _rollup_triggers(rollups):
+    triggers = []
+    for prefix, table, keys, columns in rollups:
+        new, old = _rollup_keys(keys, "new"), _rollup_keys(keys, "old")
+        triggers += [
+            (f"{prefix}_ai", "AFTER INSERT ON adoption_history", _add_to(table, new, "adoptions", 1)),
+            (f"{prefix}_ad", "AFTER DELETE ON adoption_history", _add_to(table, old, "adoptions", -1)),
+            (
+                f"{prefix}_au",
+                f"AFTER UPDATE OF {columns} ON adoption_history",
+                _add_to(table, old, "adoptions", -1) + _add_to(table, new, "adoptions", 1),
+            ),
+        ]
+    return triggers
+
+
+def _v7_ratings(conn):
+    """
+    Adopter star ratings plus a single rating_summary row (count per star and
+    running sum) that triggers keep current, so the average is one primary-key read.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ratings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            adopter_id INTEGER,
+            stars INTEGER NOT NULL CHECK (stars BETWEEN 1 AND 5),
+            created_at TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rating_summary (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total INTEGER NOT NULL DEFAULT 0,
+            star_sum INTEGER NOT NULL DEFAULT 0,
+            stars_1 INTEGER NOT NULL DEFAULT 0,
+            stars_2 INTEGER NOT NULL DEFAULT 0,
+            stars_3 INTEGER NOT NULL DEFAULT 0,
+            stars_4 INTEGER NOT NULL DEFAULT 0,
+            stars_5 INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    conn.execute("INSERT OR IGNORE INTO rating_summary (id) VALUES (1)")
+    for name, event, row, sign in (
+        ("rating_summary_ai", "AFTER INSERT ON ratings", "new", "+"),
+        ("rating_summary_ad", "AFTER DELETE ON ratings", "old", "-"),
+    ):
+        per_star = ", ".join(f"stars_{n} = stars_{n} {sign} ({row}.stars = {n})" for n in range(1, 6))
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN
+                UPDATE rating_summary
+                SET total = total {sign} 1, star_sum = star_sum {sign} {row}.stars, {per_star}
+                WHERE id = 1;
+            END
+            """
+        )
+
+
+def _v8_history_trigger(conn):
+    """
+    Snapshot a request into adoption_history when it becomes approved, and
+    backfill approved requests that never got a history row.
+    Replaces the read-time backfill that history queries used to run.
+    """
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS adoption_history_on_approve
+        AFTER UPDATE OF status ON adoption_requests
+        WHEN new.status = 'approved' AND old.status IS NOT 'approved'
+        BEGIN
+            INSERT INTO adoption_history (
+                adopter_id, pet_id, pet_name, category, breed, sex, adopted_at, adopter_name
+            )
+            SELECT new.adopter_id,
+                   new.pet_id,
+                   COALESCE(p.name, '(Removed Pet)'),
+                   p.category,
+                   p.breed,
+                   p.sex,
+                   datetime('now','localtime'),
+                   (SELECT name FROM users WHERE users_id = new.adopter_id)
+            FROM (SELECT 1)
+            LEFT JOIN pets p ON p.pet_id = new.pet_id;
+        END
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO adoption_history (
+            adopter_id, pet_id, pet_name, category, breed, sex, adopted_at, adopter_name
+        )
+        SELECT ar.adopter_id,
+               ar.pet_id,
+               COALESCE(p.name, '(Removed Pet)'),
+               p.category,
+               p.breed,
+               p.sex,
+               ar.created_at,
+               u.name
+        FROM adoption_requests ar
+        LEFT JOIN pets p ON ar.pet_id = p.pet_id
+        LEFT JOIN users u ON ar.adopter_id = u.users_id
+        WHERE ar.status='approved'
+          AND NOT EXISTS (
+              SELECT 1 FROM adoption_history ah
+              WHERE ah.adopter_id = ar.adopter_id AND ah.pet_id = ar.pet_id
+          )
+        """
+    )
+
+
+def _v9_history_request_id(conn):
+    """
+    Link each adoption_history row to the approved request it came from, so the
+    request note is a primary-key join instead of a (pet_id, adopter_id, status) match.
+    """
+    if "request_id" not in _columns(conn, "adoption_history"):
+        conn.execute("ALTER TABLE adoption_history ADD COLUMN request_id INTEGER")
+    conn.execute(
+        """
+        UPDATE adoption_history
+        SET request_id = (
+            SELECT MAX(ar.id) FROM adoption_requests ar
+            WHERE ar.pet_id = adoption_history.pet_id
+              AND ar.adopter_id = adoption_history.adopter_id
+              AND ar.status = 'approved'
+        )
+        WHERE request_id IS NULL
+        """
+    )
+    conn.execute("DROP TRIGGER IF EXISTS adoption_history_on_approve")
+    conn.execute(
+        """
+        CREATE TRIGGER adoption_history_on_approve
+        AFTER UPDATE OF status ON adoption_requests
+        WHEN new.status = 'approved' AND old.status IS NOT 'approved'
+        BEGIN
+            INSERT INTO adoption_history (
+                adopter_id, pet_id, pet_name, category, breed, sex, adopted_at, adopter_name, request_id
+            )
+            SELECT new.adopter_id,
+                   new.pet_id,
+                   COALESCE(p.name, '(Removed Pet)'),
+                   p.category,
+                   p.breed,
+                   p.sex,
+                   datetime('now','localtime'),
+                   (SELECT name FROM users WHERE users_id = new.adopter_id),
+                   new.id
+            FROM (SELECT 1)
+            LEFT JOIN pets p ON p.pet_id = new.pet_id;
+        END
+        """
+    )
+
+
+def _v10_notification_role(conn):
+    """
+    Store the recipient's role in its own column instead of offsetting admin ids,
+    and index (role, user_id, is_read, created_at) for per-user and unread lookups.
+    """
+    if "role" not in _columns(conn, "notifications"):
+        conn.execute("ALTER TABLE notifications ADD COLUMN role TEXT NOT NULL DEFAULT 'adopter'")
+    conn.execute(
+        """
+        UPDATE notifications
+        SET role = CASE WHEN user_id >= :offset THEN 'admin' ELSE 'adopter' END,
+            user_id = CASE WHEN user_id >= :offset THEN user_id - :offset ELSE user_id END
+        """,
+        {"offset": ADMIN_ID_OFFSET},
+    )
+    conn.execute("DROP INDEX IF EXISTS idx_notifications_user_created")
+    ensure_indexes(conn)
+
+
+def _v11_notifications_archive(conn):
+    """
+    Compact archive for notifications past the retention policy; no is_read flag or indexes.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS notifications_archive (
+            id INTEGER PRIMARY KEY,
+            role TEXT,
+            user_id INTEGER,
+            message TEXT,
+            created_at TEXT,
+            archived_at TEXT
+        )
+        """
+    )
+
+
+def _v12_page_indexes(conn):
+    """
+    Indexes the history and notification pages walk in (column DESC, id DESC) order;
+    the rowid id is implicit at the end of each.
+    """
+    ensure_indexes(conn, _V12_INDEXES)
+
+
+def _v13_breed_rollup_case(conn):
+    """
+    Re-key adoption_breed_rollup on the lowercased breed: recreate its triggers and
+    rebuild the rollups, which merges rows that differed only in case.
+    """
+    triggers = _rollup_triggers(_ROLLUPS[:1])
+    for name, _event, _body in triggers:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    _create_triggers(conn, triggers)
+    seed_adoption_rollups(conn)
+
+
+def _v14_history_snapshot_backfill(conn):
+    """
+    Fill the category/breed snapshot of legacy adoption_history rows from their pet, so the
+    rollup keys agree with the COALESCE(ah.category, p.category) the history list filters on.
+    The rollup_breed_au trigger moves their counts to the new keys.
+    """
+    for column in ("category", "breed"):
+        conn.execute(
+            f"""
+            UPDATE adoption_history
+            SET {column} = (SELECT p.{column} FROM pets p WHERE p.pet_id = adoption_history.pet_id)
+            WHERE {column} IS NULL
+              AND EXISTS (SELECT 1 FROM pets p WHERE p.pet_id = adoption_history.pet_id AND p.{column} IS NOT NULL)
+            """
+        )
+
+
+MIGRATIONS = (
+    (1, _v1_baseline),
+    (2, _v2_notification_columns),
+    (3, _v3_indexes),
+    (4, _v4_pet_search),
+    (5, _v5_stats_counters),
+    (6, _v6_adoption_rollups),
+    (7, _v7_ratings),
+    (8, _v8_history_trigger),
+    (9, _v9_history_request_id),
+    (10, _v10_notification_role),
+    (11, _v11_notifications_archive),
+    (12, _v12_page_indexes),
+    (13, _v13_breed_rollup_case),
+    (14, _v14_history_snapshot_backfill),
+)
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """
+    Apply every pending migration on `conn`, each in its own transaction.
+    Returns the resulting schema version.
+    """
+    if schema_version(conn) >= SCHEMA_VERSION:
+        return SCHEMA_VERSION
+
+    if conn.in_transaction:
+        conn.commit()
+    for version, step in MIGRATIONS:
+        # BEGIN IMMEDIATE takes the write lock first, so a second process waits and then sees our version.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            step(conn)
+            conn.execute(f"PRAGMA user_version={int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return schema_version(conn)
@@ -0,0 +1,287 @@
+"""
+Optional per-statement instrumentation for database.py.
+
+While profiling is on, database.connect() opens ProfilingConnection instead of a
+plain sqlite3 connection. Its cursors time each statement from execute() through
+its last fetch, count the rows it returned, and attribute it to the database.py
+helper that issued it. Statements at or over slow_ms are kept in a bounded
+slow-query log together with their EXPLAIN QUERY PLAN. While it is off, connections
+are plain sqlite3 connections, so nothing is measured and nothing is paid.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+
+# Frames from these files are plumbing, never the call site of a statement
+_PLUMBING = {__file__, sqlite3.__file__}
+
+
+def _normalize(sql):
+    return " ".join(sql.split())
+
+
+class QueryProfiler:
+    """
+    Thread-safe per-helper statement aggregates plus a bounded slow-query log.
+    helper_file is the module whose public functions count as helpers (database.py).
+    """
+
+    def __init__(self, helper_file, slow_ms=50, slow_log_size=100):
+        self.helper_file = helper_file
+        self.enabled = False
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._helpers = {}
+        self._slow = deque(maxlen=slow_log_size)
+
+    def reset(self):
+        with self._lock:
+            self._helpers.clear()
+            self._slow.clear()
+
+    def record(self, conn, sql, params, elapsed, rows):
+        helper, site = self._call_site()
+        ms = elapsed * 1000.0
+        key = _normalize(sql)
+        with self._lock:
+            entry = self._helpers.get(helper)
+            if entry is None:
+                entry = self._helpers[helper] = {"statements": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "queries": {}}
+            entry["statements"] += 1
+            entry["total_ms"] += ms
+            entry["max_ms"] = max(entry["max_ms"], ms)
+            entry["rows"] += rows
+            query = entry["queries"].get(key)
+            if query is None:
+                query = entry["queries"][key] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "call_site": site}
+            query["count"] += 1
+            query["total_ms"] += ms
+            query["max_ms"] = max(query["max_ms"], ms)
+            query["rows"] += rows
+        if ms >= self.slow_ms:
+            slow = {
+                "helper": helper,
+                "call_site": site,
+                "sql": key,
+                "ms": round(ms, 3),
+                "rows": rows,
+                "plan": self._plan(conn, sql, params),
+                "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            with self._lock:
+                self._slow.append(slow)
+
+    def snapshot(self):
+        """
+        Helpers sorted by total time, each with its statements, plus the slow-query log.
+        """
+        with self._lock:
+            helpers = {}
+            for name, entry in sorted(self._helpers.items(), key=lambda item: -item[1]["total_ms"]):
+                queries = [
+                    dict(query, sql=sql, total_ms=round(query["total_ms"], 3), max_ms=round(query["max_ms"], 3))
+                    for sql, query in sorted(entry["queries"].items(), key=lambda item: -item[1]["total_ms"])
+                ]
+                helpers[name] = {
+                    "statements": entry["statements"],
+                    "total_ms": round(entry["total_ms"], 3),
+                    "avg_ms": round(entry["total_ms"] / entry["statements"], 3),
+                    "max_ms": round(entry["max_ms"], 3),
+                    "rows": entry["rows"],
+                    "queries": queries,
+                }
+            return {
+                "enabled": self.enabled,
+                "slow_ms": self.slow_ms,
+                "helpers": helpers,
+                "slow_queries": list(self._slow),
+            }
+
+    def _call_site(self):
+        """
+        (helper, call_site): the first public function in helper_file on the stack,
+        and the first frame outside it above that (who called the helper).
+        """
+        helper = fallback = site = None
+        frame = sys._getframe(2)
+        while frame is not None:
+            code = frame.f_code
+            filename = code.co_filename
+            if filename == self.helper_file:
+                if helper is None and not code.co_name.startswith(("_", "<")) and code.co_name not in ("connection", "read_connection", "wrapper"):
+                    helper = code.co_name
+            elif filename not in _PLUMBING and "contextlib" not in filename and "functools" not in filename:
+                location = f"{os.path.basename(filename)}:{frame.f_lineno} in {code.co_name}"
+                if helper is not None:
+                    site = location
+                    break
+                if fallback is None:
+                    fallback = f"{os.path.splitext(os.path.basename(filename))[0]}.{code.co_name}"
+                    site = location
+            frame = frame.f_back
+        return helper or fallback or "unknown", site
+
+    @staticmethod
+    def _plan(conn, sql, params):
+        """
+        EXPLAIN QUERY PLAN rows as text, or None if the statement cannot be explained.
+        A plain cursor is used so the plan query is not itself profiled.
+        """
+        try:
+            cur = sqlite3.Cursor(conn)
+            rows = cur.execute("EXPLAIN QUERY PLAN " + sql, params if params is not None else ()).fetchall()
+            return [row[-1] for row in rows]
+        except Exception:
+            return None
+
+
+def format_stats(snapshot, limit=20):
+    """
+    Plain-text rendering of QueryProfiler.snapshot() for a CLI dump.
+    """
+    lines = [f"{'helper':<40} {'stmts':>7} {'total ms':>10} {'avg ms':>8} {'max ms':>8} {'rows':>8}"]
+    for name, entry in list(snapshot["helpers"].items())[:limit]:
+        lines.append(
+            f"{name:<40} {entry['statements']:>7} {entry['total_ms']:>10.2f} {entry['avg_ms']:>8.3f} "
+            f"{entry['max_ms']:>8.3f} {entry['rows']:>8}"
+        )
+    slow = snapshot["slow_queries"]
+    lines.append("")
+    lines.append(f"slow queries (>= {snapshot['slow_ms']} ms): {len(slow)}")
+    for entry in slow[-limit:]:
+        lines.append(f"  {entry['ms']:.2f} ms  {entry['helper']}  ({entry['call_site']})")
+        lines.append(f"    {entry['sql'][:160]}")
+        for step in entry["plan"] or ():
+            lines.append(f"      {step}")
+    return "\n".join(lines)
+
+
+class ProfilingCursor(sqlite3.Cursor):
+    """
+    Times one statement at a time: execute() plus every fetch until the rows run out,
+    the cursor is reused or closed, or it is garbage collected.
+    """
+
+    _sql = None
+    _params = None
+    _elapsed = 0.0
+    _rows = 0
+
+    def _start(self, sql, params):
+        self._finish()
+        self._sql, self._params, self._elapsed, self._rows = sql, params, 0.0, 0
+
+    def _finish(self):
+        sql = self._sql
+        if sql is None:
+            return
+        self._sql = None
+        profiler = getattr(self.connection, "profiler", None)
+        if profiler is not None and profiler.enabled:
+            rows = self._rows or max(self.rowcount, 0)
+            profiler.record(self.connection, sql, self._params, self._elapsed, rows)
+
+    def execute(self, sql, parameters=()):
+        self._start(sql, parameters)
+        start = time.perf_counter()
+        try:
+            cursor = super().execute(sql, parameters)
+        except Exception:
+            self._elapsed += time.perf_counter() - start
+            self._finish()
+            raise
+        self._elapsed += time.perf_counter() - start
+        return cursor
+
+    def executemany(self, sql, seq_of_parameters):
+        self._start(sql, None)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._elapsed += time.perf_counter() - start
+            self._finish()
+
+    def executescript(self, sql_script):
+        self._start(sql_script, None)
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self._elapsed += time.perf_counter() - start
+            self._finish()
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._elapsed += time.perf_counter() - start
+        if row is None:
+            self._finish()
+        else:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._elapsed += time.perf_counter() - start
+        self._rows += len(rows)
+        if len(rows) < size:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._elapsed += time.perf_counter() - start
+        self._rows += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._elapsed += time.perf_counter() - start
+            self._finish()
+            raise
+        self._elapsed += time.perf_counter() - start
+        self._rows += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class ProfilingConnection(sqlite3.Connection):
+    """
+    Connection whose statements all go through ProfilingCursor. database.connect()
+    sets `profiler` on each instance.
+    """
+
+    profiler = None
+
+    def cursor(self, factory=ProfilingCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
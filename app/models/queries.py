@@ -0,0 +1,153 @@
+"""
+Query catalog for database.py: the read statements it runs, built once at import.
+
+sqlite3 keeps prepared statements per connection, keyed on the SQL text. Every
+statement here is a fixed string (filter/cursor variants go through compose(), which
+hands back the same string object for the same parts), so each one is prepared once
+per connection and found again without rebuilding or rehashing the text.
+The schema is normalized by migrations.py, so nothing here depends on detecting columns.
+"""
+
+import functools
+
+# --------------------------------------------------
+# SELECT fragments (record column order; see records.py)
+# --------------------------------------------------
+PET_SELECT = """
+    SELECT pet_id, name, category, breed, age, sex, vaccinated, status, description, photo_path
+    FROM pets
+"""
+
+REQUEST_SELECT = """
+    SELECT ar.id, ar.adopter_id, ar.pet_id, ar.status, ar.created_at, ar.information as reason,
+           u.name as adopter_name, u.photo_path as adopter_photo, u.email as adopter_email, u.phone_number,
+           p.name as pet_name, p.photo_path as pet_photo, p.vaccinated, p.status,
+           p.category, p.breed, p.age, p.sex
+    FROM adoption_requests ar
+    JOIN users u ON ar.adopter_id = u.users_id
+    JOIN pets p ON ar.pet_id = p.pet_id
+"""
+
+# The note comes from the originating request by primary key (adoption_history.request_id).
+ADOPTER_HISTORY_SELECT = """
+    SELECT
+        COALESCE(ah.pet_name, p.name, '(Removed Pet)') as pet_name,
+        COALESCE(ah.category, p.category) as category,
+        COALESCE(ah.breed, p.breed) as breed,
+        p.age,
+        COALESCE(ah.sex, p.sex) as sex,
+        p.vaccinated,
+        p.status,
+        p.description,
+        p.photo_path,
+        ah.adopted_at,
+        ar.information as reason,
+        ah.id
+    FROM adoption_history ah
+    LEFT JOIN pets p ON ah.pet_id = p.pet_id
+    LEFT JOIN adoption_requests ar ON ar.id = ah.request_id
+    WHERE ah.adopter_id=?
+"""
+
+ADOPTER_REQUEST_SELECT = """
+    SELECT ar.id, ar.pet_id, ar.status, ar.created_at, ar.information as reason, p.name as pet_name, p.photo_path, p.vaccinated, p.status,
+           p.category, p.breed, p.age, p.sex
+    FROM adoption_requests ar
+    JOIN pets p ON ar.pet_id = p.pet_id
+    WHERE ar.adopter_id=?
+"""
+
+HISTORY_SELECT = """
+    SELECT
+        COALESCE(ah.pet_name, p.name, '(Removed Pet)') as pet_name,
+        COALESCE(ah.category, p.category) as category,
+        COALESCE(ah.breed, p.breed) as breed,
+        p.age,
+        COALESCE(ah.sex, p.sex) as sex,
+        p.vaccinated,
+        p.status,
+        p.description,
+        p.photo_path,
+        ah.adopted_at as adopted_at,
+        COALESCE(ah.adopter_name, u.name) as adopter_name,
+        u.email as adopter_email,
+        ah.id
+    FROM adoption_history ah
+    LEFT JOIN pets p ON ah.pet_id = p.pet_id
+    LEFT JOIN users u ON ah.adopter_id = u.users_id
+"""
+
+NOTIFICATION_SELECT = "SELECT id, user_id, message, created_at, is_read, role FROM notifications"
+
+HISTORY_CATEGORY = "COALESCE(ah.category, p.category)"
+
+# --------------------------------------------------
+# Fixed statements
+# --------------------------------------------------
+AVAILABLE_PETS = PET_SELECT + " WHERE status='available'"
+AVAILABLE_PETS_BY_CATEGORY = AVAILABLE_PETS + " AND category=?"
+PET_BY_ID = PET_SELECT + " WHERE pet_id=?"
+PET_SELECT_ALIASED = PET_SELECT.replace("FROM pets", "FROM pets p")
+
+# users has no image column; it is the legacy alias of photo_path (as for pets)
+USER_BY_ID = (
+    "SELECT users_id, name, email, password, role, age, birthdate, phone_number, photo_path, photo_path AS image "
+    "FROM users WHERE users_id=?"
+)
+
+REQUEST_BY_ID = REQUEST_SELECT + " WHERE ar.id=?"
+HAS_PENDING_REQUEST = "SELECT 1 FROM adoption_requests WHERE adopter_id=? AND pet_id=? AND status='pending' LIMIT 1"
+ADOPTER_REQUEST_COUNTS = "SELECT status, COUNT(*) FROM adoption_requests WHERE adopter_id=? GROUP BY status"
+
+# Overall counts come from the trigger-maintained breed rollup (a few rows), not adoption_history.
+HISTORY_COUNTS = (
+    "SELECT category, SUM(adoptions) FROM adoption_breed_rollup GROUP BY category HAVING SUM(adoptions) > 0"
+)
+ADOPTER_HISTORY_COUNTS = """
+    SELECT COALESCE(ah.category, p.category), COUNT(*)
+    FROM adoption_history ah
+    LEFT JOIN pets p ON ah.pet_id = p.pet_id
+    WHERE ah.adopter_id=?
+    GROUP BY 1
+"""
+
+NOTIFICATIONS_ALL = NOTIFICATION_SELECT + " ORDER BY created_at DESC"
+NOTIFICATIONS_FOR_USER = NOTIFICATION_SELECT + " WHERE role=? AND user_id=? ORDER BY created_at DESC"
+NOTIFICATIONS_SINCE = NOTIFICATION_SELECT + " WHERE role=? AND user_id=? AND id > ? ORDER BY id"
+COUNT_UNREAD = "SELECT COUNT(*) FROM notifications WHERE role=? AND user_id=? AND is_read=0"
+
+# Every fixed statement above, by name
+CATALOG = {
+    name: value
+    for name, value in list(globals().items())
+    if name.isupper() and isinstance(value, str) and not name.endswith(("_SELECT", "_CATEGORY"))
+}
+
+
+# --------------------------------------------------
+# Composed variants
+# --------------------------------------------------
+# Upper bound on distinct filter/cursor variants kept; far more than the helpers produce.
+COMPOSED_MAX = 128
+
+
+@functools.lru_cache(maxsize=COMPOSED_MAX)
+def compose(*parts):
+    """
+    Join SQL fragments, returning the same string object every time for the same parts.
+    """
+    return "".join(parts)
+
+
+# Statements still written inline in database.py (writes, DDL, one-offs), counted from its
+# execute()/executemany()/executescript() calls; QueryCatalogTests recounts them. Literal SQL is
+# one statement; an f-string renders up to INLINE_VARIANTS texts (PRAGMA names, owner clauses,
+# vacuum page counts). Migrations run once per file and are left out: LRU simply evicts them.
+INLINE_LITERALS = 63
+INLINE_TEMPLATES = 10
+INLINE_VARIANTS = 8
+INLINE_STATEMENTS = INLINE_LITERALS + INLINE_TEMPLATES * INLINE_VARIANTS
+
+# sqlite3 defaults to 128 cached statements, fewer than the app's working set,
+# so hot lookups were being evicted and re-prepared. Size the cache for all of it.
+STATEMENT_CACHE_SIZE = len(CATALOG) + COMPOSED_MAX + INLINE_STATEMENTS
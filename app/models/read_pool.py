@@ -0,0 +1,138 @@
+"""
+Bounded pool of read-only connections for report and dashboard queries.
+
+database.read_connection() checks a connection out of a ReadPool for the length of
+one read transaction. Readers in WAL mode see a snapshot and never take the write
+lock, so long reports no longer share (or hold up) the connections that writes use.
+The pool is sized on its own (READ_POOL_SIZE) and keeps its own counters.
+"""
+
+import threading
+import time
+
+
+class ReadPool:
+    """
+    opener() returns a new read-only connection. Connections are keyed (database.py
+    uses DB_PATH): an idle connection opened for another key is closed instead of reused.
+    """
+
+    def __init__(self, opener, size=4, timeout=10):
+        self.opener = opener
+        self.size = size
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._idle = []
+        self._owners = {}
+        self._open = 0
+        self._generation = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.opened = 0
+        self.wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.peak_in_use = 0
+
+    def acquire(self, key):
+        """
+        Check out a connection for `key`, opening one if the pool has room, otherwise
+        waiting up to `timeout` seconds for one to be released (TimeoutError after that).
+        """
+        started = time.perf_counter()
+        waited = False
+        with self._cond:
+            while True:
+                self._close_idle(lambda owner: owner[0] != key)
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    conn = None
+                    break
+                waited = True
+                remaining = self.timeout - (time.perf_counter() - started)
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    if not self._idle and self._open >= self.size:
+                        self.timeouts += 1
+                        raise TimeoutError(f"No read connection free after {self.timeout}s")
+            generation = self._generation
+        if conn is None:
+            try:
+                conn = self.opener()
+            except BaseException:
+                with self._cond:
+                    self._open -= 1
+                    self._cond.notify()
+                raise
+        with self._cond:
+            if conn not in self._owners:
+                self._owners[conn] = (key, generation)
+                self.opened += 1
+            elapsed = (time.perf_counter() - started) * 1000.0
+            self.checkouts += 1
+            if waited:
+                self.waits += 1
+                self.wait_ms += elapsed
+                self.max_wait_ms = max(self.max_wait_ms, elapsed)
+            self.peak_in_use = max(self.peak_in_use, self._open - len(self._idle))
+        return conn
+
+    def release(self, conn):
+        with self._cond:
+            if self._owners.get(conn, (None, None))[1] == self._generation:
+                self._idle.append(conn)
+            else:
+                self._discard(conn)
+            self._cond.notify()
+
+    def discard(self, conn):
+        """
+        Close a checked-out connection that should not be reused (e.g. after an error).
+        """
+        with self._cond:
+            self._discard(conn)
+            self._cond.notify()
+
+    def close(self):
+        """
+        Close idle connections now; checked-out ones are closed when released.
+        """
+        with self._cond:
+            self._generation += 1
+            self._close_idle(lambda owner: True)
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self.size,
+                "open": self._open,
+                "in_use": self._open - len(self._idle),
+                "idle": len(self._idle),
+                "peak_in_use": self.peak_in_use,
+                "opened": self.opened,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "wait_ms": round(self.wait_ms, 3),
+                "max_wait_ms": round(self.max_wait_ms, 3),
+            }
+
+    def _close_idle(self, stale):
+        keep = []
+        for conn in self._idle:
+            if stale(self._owners[conn]):
+                self._discard(conn)
+            else:
+                keep.append(conn)
+        self._idle = keep
+
+    def _discard(self, conn):
+        self._owners.pop(conn, None)
+        self._open -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,203 @@
+"""
+Compact read-only record types for query results.
+
+Each record is a namedtuple (no per-row __dict__), built straight from the cursor by
+its row_factory. Records keep the dict-style read API the controllers and UI already
+use: rec["name"], rec.get("name"), "name" in rec, keys()/items() and dict(rec).
+A pet's resolved image path checks the filesystem, so it is resolved once, when the
+row is built, and stored as the record's last field.
+"""
+
+import os
+from collections import namedtuple
+
+from app.config import BASE_DIR, IMAGES_DIR
+
+
+def resolve_pet_image(image_value, pet_name, photo_path=None):
+    """
+    Returns an absolute path to a pet image.
+    - If the DB value (image/photo_path) points to a real file, use it.
+    - Otherwise try to find an image in the images/ folder that matches the pet name.
+    - Fall back to a placeholder (handled later by the UI loader).
+    """
+    # Use project-root aware paths so lookups work regardless of the current module location.
+    base_dir = str(BASE_DIR)
+    images_dir = str(IMAGES_DIR)
+
+    def check_candidate(path_value):
+        if not path_value:
+            return None
+        if os.path.isabs(path_value):
+            candidate = path_value
+        else:
+            # First try relative to repo root, then fall back to images/
+            candidate = os.path.join(base_dir, path_value)
+            if not os.path.exists(candidate):
+                candidate = os.path.join(images_dir, path_value)
+        if os.path.exists(candidate) and os.path.isfile(candidate):
+            return candidate
+        return None
+
+    # 1) Use photo_path if present
+    resolved = check_candidate(photo_path)
+    if resolved:
+        return resolved
+
+    # 2) Use the legacy image field if passed
+    resolved = check_candidate(image_value)
+    if resolved:
+        return resolved
+
+    # 2) Try to match a filename based on the pet name
+    if pet_name:
+        safe_name = "".join(ch.lower() for ch in pet_name if ch.isalnum())
+        for ext in (".jpg", ".jpeg", ".png", ".gif"):
+            candidate = os.path.join(images_dir, f"{safe_name}{ext}")
+            if os.path.exists(candidate) and os.path.isfile(candidate):
+                return candidate
+
+    # 3) Let the UI show its own placeholder
+    return None
+
+
+class _Record:
+    """
+    Mapping-style reads on top of a namedtuple. Integer indexing still works,
+    so keyset cursors can be taken from a record by position.
+    """
+
+    __slots__ = ()
+    _derived = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._keys = tuple(cls._fields) + tuple(cls._derived)
+        cls._keyset = frozenset(cls._keys)
+
+    @classmethod
+    def row_factory(cls, _cursor, row):
+        return tuple.__new__(cls, row)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key in self._keyset:
+                return getattr(self, key)
+            raise KeyError(key)
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key in self._keyset:
+            return getattr(self, key)
+        return default
+
+    def __contains__(self, key):
+        return key in self._keyset
+
+    def keys(self):
+        return self._keys
+
+    def values(self):
+        return [getattr(self, key) for key in self._keys]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self._keys]
+
+    def to_dict(self):
+        return dict(self.items())
+
+
+class PetRecord(
+    _Record,
+    namedtuple("PetRecord", "id name category breed age sex vaccinated status description photo_path image"),
+):
+    __slots__ = ()
+
+    @classmethod
+    def row_factory(cls, _cursor, row):
+        return tuple.__new__(cls, (*row, resolve_pet_image(None, row[1], row[9])))
+
+
+class RequestRecord(
+    _Record,
+    namedtuple(
+        "RequestRecord",
+        "id adopter_id pet_id status created_at reason adopter_name adopter_photo adopter_email adopter_phone "
+        "pet_name pet_photo vaccinated pet_status category breed age sex pet_image_resolved",
+    ),
+):
+    __slots__ = ()
+    _derived = ("pet_image",)
+
+    pet_image = None  # legacy DBs may not have an image column
+
+    @classmethod
+    def row_factory(cls, _cursor, row):
+        return tuple.__new__(cls, (*row, resolve_pet_image(None, row[10], row[11])))
+
+
+class AdopterRequestRecord(
+    _Record,
+    namedtuple(
+        "AdopterRequestRecord",
+        "id pet_id status created_at reason pet_name pet_photo vaccinated pet_status category breed age sex "
+        "pet_image_resolved",
+    ),
+):
+    __slots__ = ()
+    _derived = ("pet_image",)
+
+    pet_image = None
+
+    @classmethod
+    def row_factory(cls, _cursor, row):
+        return tuple.__new__(cls, (*row, resolve_pet_image(None, row[5], row[6])))
+
+
+class HistoryRecord(
+    _Record,
+    namedtuple(
+        "HistoryRecord",
+        "pet_name category breed age sex vaccinated status description photo_path adopted_at "
+        "adopter_name adopter_email id",
+    ),
+):
+    __slots__ = ()
+
+
+class AdopterHistoryRecord(
+    _Record,
+    namedtuple(
+        "AdopterHistoryRecord",
+        "pet_name category breed age sex vaccinated status description photo_path adopted_at reason id",
+    ),
+):
+    __slots__ = ()
+
+
+class UserRecord(
+    _Record,
+    namedtuple("UserRecord", "users_id name email password role age birthdate phone photo_path image"),
+):
+    __slots__ = ()
+
+
+class AdminProfileRecord(
+    _Record,
+    namedtuple(
+        "AdminProfileRecord",
+        "admin_id name email phone_number birthdate photo_path facebook_url instagram_url",
+    ),
+):
+    __slots__ = ()
+
+
+class NotificationRecord(
+    _Record,
+    namedtuple("NotificationRecord", "id user_id message created_at is_read role"),
+):
+    __slots__ = ()
+
+    @classmethod
+    def row_factory(cls, _cursor, row):
+        return tuple.__new__(cls, (row[0], row[1], row[2], row[3], bool(row[4]), row[5]))
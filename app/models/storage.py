@@ -0,0 +1,165 @@
+"""
+Storage backends: where database.py's connections point.
+
+FileBackend     the database file on disk (the default).
+MemoryBackend   a private shared-cache in-memory database (file:<name>?mode=memory&cache=shared),
+                seeded from a snapshot: the migrated schema, or a migrated copy of a database file.
+RamDiskBackend  a copy of a database file on a RAM-backed filesystem (/dev/shm when present).
+
+config.DB_BACKEND picks the backend database.py starts with; database.use_backend()
+switches at runtime. Memory and RAM-disk databases are throwaway copies for tests and
+benchmarks: nothing written to them reaches the source file.
+"""
+
+import itertools
+import os
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+
+from app.models import migrations
+
+# seed key -> private :memory: connection holding the migrated seed database
+_SNAPSHOTS = {}
+_SNAPSHOT_LOCK = threading.Lock()
+_NAMES = itertools.count(1)
+
+
+def _readonly_uri(path):
+    return Path(path).resolve().as_uri() + "?mode=ro"
+
+
+def _copy(source, dest):
+    """
+    Consistent copy of the database at `source` into the open connection `dest`.
+    With no -wal file beside it nobody has the source open for writing, so it is read
+    as immutable; a read-only open of a WAL database would otherwise leave -wal/-shm
+    files behind that it cannot remove.
+    """
+    uri = _readonly_uri(source)
+    if not Path(f"{source}-wal").exists():
+        uri += "&immutable=1"
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        conn.backup(dest)
+    finally:
+        conn.close()
+
+
+def _snapshot(seed):
+    """
+    The migrated seed database, built once per seed: the empty schema for seed=None,
+    else a copy of the seed file. Callers hold _SNAPSHOT_LOCK.
+    """
+    key = None if seed is None else str(seed)
+    conn = _SNAPSHOTS.get(key)
+    if conn is None:
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        if seed is not None:
+            _copy(seed, conn)
+        migrations.migrate(conn)
+        # Drop free pages so every copy is as small as possible
+        conn.execute("VACUUM")
+        _SNAPSHOTS[key] = conn
+    return conn
+
+
+def clear_snapshots():
+    """
+    Forget cached seed snapshots, e.g. after the seed file changed on disk.
+    """
+    with _SNAPSHOT_LOCK:
+        for conn in _SNAPSHOTS.values():
+            conn.close()
+        _SNAPSHOTS.clear()
+
+
+class FileBackend:
+    kind = "file"
+    # In WAL mode a reader on its own connection sees a snapshot and never blocks writers
+    separate_readers = True
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.key = str(path)
+
+    def target(self, readonly=False):
+        """
+        (database, uri) arguments for sqlite3.connect().
+        """
+        if readonly:
+            return _readonly_uri(self.path), True
+        return self.key, False
+
+    def close(self):
+        pass
+
+
+class MemoryBackend:
+    """
+    A fresh in-memory database per instance, copied from a cached snapshot of `seed`
+    (a database file; None for the empty migrated schema). Creating one is a page copy
+    from memory, with no file I/O. It lives until close().
+    """
+
+    kind = "memory"
+    # Shared-cache connections lock whole tables against each other, and busy_timeout does
+    # not retry those locks, so database.read_connection() stays on the thread's connection
+    separate_readers = False
+
+    def __init__(self, seed=None, name=None):
+        self.name = name or f"fureverhome-{os.getpid()}-{next(_NAMES)}"
+        self.key = f"file:{self.name}?mode=memory&cache=shared"
+        # The database exists as long as one connection to it is open
+        self._keeper = sqlite3.connect(self.key, uri=True, check_same_thread=False)
+        with _SNAPSHOT_LOCK:
+            _snapshot(seed).backup(self._keeper)
+
+    def target(self, readonly=False):
+        return self.key, True
+
+    def close(self):
+        if self._keeper is not None:
+            self._keeper.close()
+            self._keeper = None
+
+
+class RamDiskBackend(FileBackend):
+    """
+    A copy of `source` in a temporary directory under `directory` (default: /dev/shm if it
+    exists, else the system temp dir). Behaves like a file database, WAL included;
+    close() deletes the copy.
+    """
+
+    kind = "ramdisk"
+
+    def __init__(self, source, directory=None):
+        if directory is None:
+            directory = "/dev/shm" if os.access("/dev/shm", os.W_OK) else tempfile.gettempdir()
+        self._tmpdir = tempfile.TemporaryDirectory(prefix="fureverhome-", dir=directory)
+        path = Path(self._tmpdir.name) / Path(source).name
+        conn = sqlite3.connect(path)
+        try:
+            _copy(source, conn)
+        finally:
+            conn.close()
+        super().__init__(path)
+
+    def close(self):
+        self._tmpdir.cleanup()
+
+
+BACKENDS = {"file": FileBackend, "memory": MemoryBackend, "ramdisk": RamDiskBackend}
+
+
+def open_backend(kind, path):
+    """
+    Backend of the given kind for the database file at `path` (the seed/source for
+    memory and ramdisk).
+    """
+    try:
+        backend = BACKENDS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown database backend: {kind}") from None
+    return backend(path)
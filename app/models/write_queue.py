@@ -0,0 +1,150 @@
+"""
+Single writer thread that applies queued write commands in group commits.
+
+database.py routes its write helpers through a WriteQueue when one is running:
+commands from every thread are applied by one connection, many per transaction,
+so writers in this process never contend for the SQLite write lock. Each command
+runs inside its own SAVEPOINT, so a failing command is rolled back and reported
+on its own future without undoing the rest of the batch.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+def completed(fn, *args, **kwargs):
+    """
+    Run fn now on the calling thread and return its outcome as a finished Future.
+    """
+    future = Future()
+    try:
+        future.set_result(fn(*args, **kwargs))
+    except BaseException as e:
+        future.set_exception(e)
+    return future
+
+
+class WriteQueue:
+    """
+    transaction() must return a context manager that yields a connection with a
+    write transaction already open and commits it on exit (rolls back on error).
+    teardown() is called on the writer thread when it exits.
+    """
+
+    def __init__(self, transaction, teardown=None, max_batch=64, window_ms=0, name="db-writer"):
+        self.transaction = transaction
+        self.teardown = teardown
+        self.max_batch = max_batch
+        self.window_ms = window_ms
+        self.name = name
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.batches = 0
+        self.commands = 0
+        self.largest_batch = 0
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        """
+        Stop accepting commands, apply everything already queued, then exit.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None:
+            thread.join(timeout)
+
+    def is_writer_thread(self):
+        thread = self._thread
+        return thread is not None and thread is threading.current_thread()
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Queue fn(*args, **kwargs) and return a Future of its result. Once the queue
+        is stopped the command runs immediately on the calling thread instead.
+        """
+        with self._lock:
+            if self._thread is not None:
+                future = Future()
+                self._queue.put((fn, args, kwargs, future))
+                return future
+        return completed(fn, *args, **kwargs)
+
+    def stats(self):
+        return {"batches": self.batches, "commands": self.commands, "largest_batch": self.largest_batch}
+
+    def _loop(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    return
+                batch, stopping = self._collect(item)
+                self._apply(batch)
+                if stopping:
+                    return
+        finally:
+            if self.teardown:
+                self.teardown()
+
+    def _collect(self, first):
+        """
+        Take whatever else is already queued (waiting up to window_ms for more), up to max_batch.
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.window_ms / 1000.0
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _apply(self, batch):
+        outcomes = []
+        try:
+            with self.transaction() as conn:
+                for fn, args, kwargs, future in batch:
+                    conn.execute("SAVEPOINT write_command")
+                    try:
+                        value = fn(*args, **kwargs)
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO write_command")
+                        conn.execute("RELEASE write_command")
+                        outcomes.append((future, None, e))
+                    else:
+                        conn.execute("RELEASE write_command")
+                        outcomes.append((future, value, None))
+        except Exception as e:
+            # The group commit itself failed; nothing in the batch was applied
+            for _fn, _args, _kwargs, future in batch:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        self.commands += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        for future, value, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(value)
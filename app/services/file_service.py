@@ -1,5 +1,8 @@
 import os
 import shutil
+from pathlib import Path
+from typing import Optional
+
 from app.config import IMAGES_DIR
 
 
@@ -19,3 +22,15 @@ def copy_photo_to_images(path: str) -> str:
         return filename
     except Exception:
         return path
+
+
+def resolve_in_images(photo_path: str, images_dir=IMAGES_DIR) -> Optional[Path]:
+    """
+    Absolute path of a stored photo name (or path) if it lies inside images_dir, else None.
+    Names such as "../fureverhome.db" or "/etc/hosts" resolve outside and give None.
+    """
+    if not photo_path:
+        return None
+    root = Path(images_dir).resolve()
+    path = (root / photo_path).resolve()
+    return path if root in path.parents else None
@@ -10,8 +10,11 @@ from tkinter import filedialog, messagebox, simpledialog
 from PIL import Image
 
 from app.config import ASSETS_DIR, BASE_DIR, IMAGES_DIR
-from app.controllers import AdminController
+from app.api import controller_for
+from app.controllers import AsyncController
 from app.services.pet_components import load_pet_image
+from app.widgets.notification_badge import UnreadBadge
+from app.widgets.tasks import TaskRunner, ui_task
 
 ctk.set_appearance_mode("light")
 
@@ -74,7 +77,10 @@ class AdminHomePage(ctk.CTkFrame):
         super().__init__(master)
         self.app = app
         self.switch_frame = switch_frame
-        self.controller = AdminController()
+        self.controller = controller_for("admin")
+        # Page code calls the controller through self.api (futures) inside tasks, never directly
+        self.api = AsyncController(self.controller)
+        self.tasks = TaskRunner(self, on_busy=self._set_busy, on_error=self._task_failed)
         self.manage_category = "All"
 
         self.configure(fg_color="#f2f5fa")
@@ -105,7 +111,8 @@ class AdminHomePage(ctk.CTkFrame):
 
         sb_btn("Dashboard", self.show_dashboard).pack(pady=5)
         sb_btn("Requests", self.show_requests).pack(pady=5)
-        sb_btn("Notifications", self.show_notifications).pack(pady=5)
+        notifications_btn = sb_btn("Notifications", self.show_notifications)
+        notifications_btn.pack(pady=5)
         sb_btn("Manage Pets", self.show_manage_pets).pack(pady=5)
         sb_btn("Adoption History", self.show_history).pack(pady=5)
         sb_btn("Pending Admins", self.show_pending_admins).pack(pady=5)
@@ -125,16 +132,46 @@ class AdminHomePage(ctk.CTkFrame):
             command=app.logout,
         ).pack(side="bottom", pady=30)
 
+        self.busy_label = ctk.CTkLabel(sidebar, text="", font=("Georgia", 12, "italic"), text_color="#072658")
+        self.busy_label.pack(side="bottom")
+
         self.content = ctk.CTkFrame(container, fg_color="#f2f5fa")
         self.content.pack(side="left", fill="both", expand=True)
 
+        # An open notifications page registers an appender; every badge poll adds new rows in place.
+        self._notification_appender = None
+        self.unread_badge = UnreadBadge(
+            notifications_btn,
+            "Notifications",
+            lambda: self.api.count_unread(self._get_admin_id()),
+            on_poll=self._on_unread_poll,
+        )
+
         self.show_dashboard()
+        self.unread_badge.poll_now()
 
     # =============================================================
     def clear(self):
+        self._notification_appender = None
+        self.tasks.new_view()
         for w in list(self.content.winfo_children()):
             w.destroy()
 
+    def _on_unread_poll(self, _count):
+        if self._notification_appender:
+            self._notification_appender()
+
+    def _set_busy(self, busy):
+        self.busy_label.configure(text="Loading…" if busy else "")
+        try:
+            self.configure(cursor="watch" if busy else "")
+        except Exception:
+            pass
+
+    def _task_failed(self, error):
+        self.busy_label.configure(text="Something went wrong")
+        messagebox.showerror("Error", f"Something went wrong.\n{error}")
+
     def _get_admin_id(self):
         user = self.app.current_user or {}
         return user.get("id") or user.get("admin_id")
@@ -155,6 +192,7 @@ class AdminHomePage(ctk.CTkFrame):
     # =============================================================
     # 1. DASHBOARD
     # =============================================================
+    @ui_task
     def show_dashboard(self):
         self.clear()
         bg = ctk.CTkFrame(self.content, fg_color="#06215A")
@@ -186,18 +224,18 @@ class AdminHomePage(ctk.CTkFrame):
             ctk.CTkLabel(body, text="Updated now", font=("Georgia", 11), text_color="#64748b").pack(anchor="w", pady=(4, 0))
 
         try:
-            snapshot = self.controller.dashboard_snapshot()
+            snapshot = yield self.api.dashboard_snapshot()
         except Exception:
             snapshot = {
-                "pets": [],
-                "requests": [],
-                "adoption_history": [],
                 "stats": {
                     "available_pets": 0,
                     "requests": 0,
                     "adoptions": 0,
                     "requests_by_status": {},
                     "availability": {},
+                    "top_breeds": [],
+                    "top_months": [],
+                    "ratings": {},
                 },
             }
 
@@ -210,34 +248,18 @@ class AdminHomePage(ctk.CTkFrame):
         stat_card("Requests", reqs)
         stat_card("Adoptions", adoptions)
 
-        available_pets = (snapshot or {}).get("pets", []) or []
-        adoption_history = (snapshot or {}).get("adoption_history", []) or []
-        all_requests = (snapshot or {}).get("requests", []) or []
         status_counts = stats.get("requests_by_status", {}) or {}
 
         pending_requests = status_counts.get("pending", 0)
-        approved_requests = status_counts.get("approved", 0) or len(adoption_history)
+        approved_requests = status_counts.get("approved", 0) or adoptions
         rejected_requests = status_counts.get("rejected", 0)
 
         availability = stats.get("availability", {}) or {}
         if not availability:
             availability = {"No Data": 0}
 
-        top_breeds = [
-            ("Aspins", 18),  # predefined sample insight
-            ("Shih Tzu", 12),
-            ("Persian Mix", 9),
-            ("Golden Retriever", 8),
-            ("Siamese", 7),
-        ]
-
-        top_months = [
-            ("March", 22),  # predefined sample insight
-            ("July", 19),
-            ("December", 17),
-            ("May", 14),
-            ("January", 12),
-        ]
+        top_breeds = stats.get("top_breeds") or [("No Data", 0)]
+        top_months = stats.get("top_months") or [("No Data", 0)]
 
         adoption_breakdown = [
             ("Approved", approved_requests),
@@ -245,9 +267,10 @@ class AdminHomePage(ctk.CTkFrame):
             ("Rejected", rejected_requests),
         ]
 
-        rating_average = 4.6
-        rating_counts = {5: 48, 4: 34, 3: 14, 2: 6, 1: 2}
-        total_ratings = sum(rating_counts.values())
+        ratings = stats.get("ratings", {}) or {}
+        rating_average = ratings.get("average", 0.0)
+        rating_counts = ratings.get("counts") or {n: 0 for n in range(1, 6)}
+        total_ratings = ratings.get("total", 0)
 
         insights = ctk.CTkFrame(scroll, fg_color="#06215A")
         insights.pack(fill="both", expand=True, padx=10, pady=(0, 20))
@@ -296,7 +319,7 @@ class AdminHomePage(ctk.CTkFrame):
         ).pack(anchor="w", padx=16, pady=(2, 10))
 
         adoption_card = make_card(1, 0, "Adoptions (Live)")
-        total_req = max(1, len(all_requests))
+        total_req = max(1, reqs)
         bar_wrap = ctk.CTkFrame(adoption_card, fg_color="#f8fafc", corner_radius=12)
         bar_wrap.pack(fill="x", padx=12, pady=(6, 10))
         stacked = ctk.CTkFrame(bar_wrap, fg_color="#e5e7eb", height=18, corner_radius=9)
@@ -325,7 +348,7 @@ class AdminHomePage(ctk.CTkFrame):
             ctk.CTkLabel(row, text=f"{label}: {count}", font=("Georgia", 12), text_color="#0f172a").pack(side="left")
         ctk.CTkLabel(
             adoption_card,
-            text=f"Live snapshot: {approved_requests} approved out of {len(all_requests)} total requests.",
+            text=f"Live snapshot: {approved_requests} approved out of {reqs} total requests.",
             font=("Georgia", 12),
             text_color="#475569",
         ).pack(anchor="w", padx=16, pady=(2, 12))
@@ -377,6 +400,7 @@ class AdminHomePage(ctk.CTkFrame):
     # =============================================================
     # 2. REQUESTS
     # =============================================================
+    @ui_task
     def show_requests(self):
         self.clear()
         make_header(self.content, "Adoption Requests", "Tap a request to review and approve/decline.")
@@ -402,10 +426,13 @@ class AdminHomePage(ctk.CTkFrame):
         list_frame = ctk.CTkScrollableFrame(shell, fg_color="#D4FAFF")
         list_frame.pack(fill="both", expand=True, padx=20, pady=18)
 
+        # Both queries go out together; the page and the toolbar counts load in parallel
+        page_future = self.api.list_requests_page(getattr(self, "request_filter_status", "All"))
+        counts_future = self.api.request_counts()
         try:
-            data = self.controller.list_requests(getattr(self, "request_filter_status", "All"))
+            data, next_cursor = yield page_future
         except Exception:
-            data = []
+            data, next_cursor = [], None
 
         # Removed "Declined" option since "Rejected" already covers negative outcomes
         status_options = ["All", "Pending", "Approved", "Rejected"]
@@ -425,17 +452,62 @@ class AdminHomePage(ctk.CTkFrame):
         except Exception:
             status_combo.set("All")
 
-        selected_status = (self.request_filter_status or "All").strip().lower()
+        # Counts come from SQL so the toolbar never needs the unfiltered list
+        try:
+            counts = yield counts_future
+        except Exception:
+            counts = {}
+        ctk.CTkLabel(
+            toolbar,
+            text="  •  ".join(f"{opt}: {counts.get(opt.lower(), 0)}" for opt in status_options),
+            font=("Georgia", 12),
+            text_color="#00156A",
+        ).pack(side="left", padx=(8, 4))
+
+        # Pending cards get a checkbox; the bulk buttons act on every checked request in one transaction
+        selected_ids = set()
+
+        def toggle_selected(req_id, var):
+            if var.get():
+                selected_ids.add(req_id)
+            else:
+                selected_ids.discard(req_id)
+
+        @self.tasks.task
+        def approve_selected():
+            if not selected_ids:
+                messagebox.showinfo("Approve", "Select at least one pending request.")
+                return
+            if not messagebox.askyesno("Approve", f"Approve {len(selected_ids)} selected request(s)?"):
+                return
+            try:
+                done = yield self.api.approve_requests(sorted(selected_ids))
+            except Exception as e:
+                messagebox.showerror("Error", f"Unable to approve requests.\n{e}")
+                return
+            messagebox.showinfo("Approved", f"{len(done)} request(s) approved.")
+            self.show_requests()
 
-        def _normalize_status(val: str) -> str:
-            v = (val or "pending").strip().lower()
-            return "rejected" if v == "declined" else v
+        @self.tasks.task
+        def decline_selected():
+            if not selected_ids:
+                messagebox.showinfo("Reject", "Select at least one pending request.")
+                return
+            reason = simpledialog.askstring("Reject Requests", "Enter a decline reason (optional):")
+            if reason is None:
+                return
+            try:
+                done = yield self.api.decline_requests(sorted(selected_ids), reason or "")
+            except Exception as e:
+                messagebox.showerror("Error", f"Unable to reject requests.\n{e}")
+                return
+            messagebox.showinfo("Rejected", f"{len(done)} request(s) rejected.")
+            self.show_requests()
 
-        if selected_status and selected_status != "all":
-            data = [
-                r for r in data
-                if _normalize_status(r.get("status")) == selected_status
-            ]
+        ctk.CTkButton(toolbar, text="Reject Selected", width=140, fg_color="#DC2626", hover_color="#B91C1C",
+                      command=decline_selected).pack(side="right", padx=(6, 4))
+        ctk.CTkButton(toolbar, text="Approve Selected", width=150, fg_color="#16A34A", hover_color="#15803D",
+                      command=approve_selected).pack(side="right", padx=6)
 
         base_images = IMAGES_ROOT
         base_assets = ASSETS_ROOT
@@ -463,12 +535,13 @@ class AdminHomePage(ctk.CTkFrame):
             ctk.CTkLabel(list_frame, text="No adoption requests found.", font=("Georgia", 14), text_color="#666").pack(pady=12)
             return
 
+        @self.tasks.task
         def open_request_detail(req):
             # ---------------------------
             # LOAD DATA
             # ---------------------------
             try:
-                full = self.controller.get_request(req.get("id"))
+                full = yield self.api.get_request(req.get("id"))
             except Exception:
                 full = req
 
@@ -654,11 +727,12 @@ class AdminHomePage(ctk.CTkFrame):
 
         
             # ---------------------------------------
+            @self.tasks.task
             def do_approve():
                 if not messagebox.askyesno("Approve", "Approve this adoption request?"):
                     return
                 try:
-                    self.controller.approve_request(req.get("id"))
+                    yield self.api.approve_request(req.get("id"))
                     messagebox.showinfo("Approved", "Request approved. Pet marked as adopted.")
                 except Exception as e:
                     messagebox.showerror("Error", f"Unable to approve request.\n{e}")
@@ -669,12 +743,13 @@ class AdminHomePage(ctk.CTkFrame):
                 self.show_requests()
 
 
+            @self.tasks.task
             def do_decline():
                 reason = simpledialog.askstring("Decline Request", "Enter a decline reason (optional):")
                 if reason is None:
                     return
                 try:
-                    self.controller.decline_request(req.get("id"), reason or "")
+                    yield self.api.decline_request(req.get("id"), reason or "")
                     messagebox.showinfo("Declined", "Request declined.")
                 except Exception as e:
                     messagebox.showerror("Error", f"Unable to decline request.\n{e}")
@@ -685,6 +760,7 @@ class AdminHomePage(ctk.CTkFrame):
                 self.show_requests()
 
 
+            @self.tasks.task
             def do_delete():
                 if status_raw.lower() == "approved":
                     messagebox.showinfo("Not Allowed", "Approved requests are kept for history and cannot be deleted.")
@@ -694,7 +770,7 @@ class AdminHomePage(ctk.CTkFrame):
                     return
 
                 try:
-                    ok = self.controller.delete_request(req.get("id"))
+                    ok = yield self.api.delete_request(req.get("id"))
                 except Exception as e:
                     messagebox.showerror("Error", f"Unable to delete request.\n{e}")
                     return
@@ -720,29 +796,67 @@ class AdminHomePage(ctk.CTkFrame):
                         fg_color="#4B5563", hover_color="#374151",
                         command=do_delete).pack(side="right", padx=20)
 
-        for r in data:
-            card = ctk.CTkFrame(list_frame, fg_color="white", corner_radius=18, border_width=1, border_color="#b7d4ff")
-            card.pack(fill="x", padx=8, pady=8)
-            top = ctk.CTkFrame(card, fg_color="#f8fafc")
-            top.pack(fill="x", padx=12, pady=8)
-            avatar = resolve_photo(r.get("adopter_photo"), size=(70, 70))
-            if avatar:
-                lbl = ctk.CTkLabel(top, image=avatar, text="")
-                lbl.image = avatar
-                lbl.pack(side="left", padx=(0, 12))
-            else:
-                ctk.CTkLabel(top, text="No Photo", width=70, height=70, fg_color="#e5e7eb", text_color="#666", corner_radius=10).pack(side="left", padx=(0, 12))
-            info = ctk.CTkFrame(top, fg_color="#f8fafc")
-            info.pack(side="left", fill="both", expand=True)
-            ctk.CTkLabel(info, text=r.get("adopter_name",""), font=("Georgia", 16, "bold"), text_color="#111").pack(anchor="w")
-            ctk.CTkLabel(info, text=r.get("adopter_email") or "", font=("Georgia", 12), text_color="#334155").pack(anchor="w")
-            ctk.CTkLabel(info, text=f"Pet: {r.get('pet_name','')}", font=("Georgia", 13), text_color="#333").pack(anchor="w")
-            ctk.CTkLabel(info, text=f"Category: {r.get('category','')}", font=("Georgia", 12), text_color="#555").pack(anchor="w")
-            ctk.CTkLabel(info, text=f"Status: {r.get('status','pending').title()} • Requested: {r.get('created_at') or ''}",
-                         font=("Georgia", 12), text_color="#555").pack(anchor="w", pady=(2,0))
-
-            ctk.CTkButton(card, text="View / Act", width=140, fg_color="#1E63D1", hover_color="#174DA6",
-                          command=lambda req=r: open_request_detail(req)).pack(anchor="e", padx=12, pady=(0, 10))
+        def render_cards(rows):
+            for r in rows:
+                card = ctk.CTkFrame(list_frame, fg_color="white", corner_radius=18, border_width=1, border_color="#b7d4ff")
+                card.pack(fill="x", padx=8, pady=8)
+                top = ctk.CTkFrame(card, fg_color="#f8fafc")
+                top.pack(fill="x", padx=12, pady=8)
+                if str(r.get("status") or "pending").lower() == "pending":
+                    var = ctk.BooleanVar(value=False)
+                    ctk.CTkCheckBox(
+                        top, text="", width=24, variable=var,
+                        command=lambda rid=r.get("id"), v=var: toggle_selected(rid, v),
+                    ).pack(side="left", padx=(0, 8))
+                avatar = resolve_photo(r.get("adopter_photo"), size=(70, 70))
+                if avatar:
+                    lbl = ctk.CTkLabel(top, image=avatar, text="")
+                    lbl.image = avatar
+                    lbl.pack(side="left", padx=(0, 12))
+                else:
+                    ctk.CTkLabel(top, text="No Photo", width=70, height=70, fg_color="#e5e7eb", text_color="#666", corner_radius=10).pack(side="left", padx=(0, 12))
+                info = ctk.CTkFrame(top, fg_color="#f8fafc")
+                info.pack(side="left", fill="both", expand=True)
+                ctk.CTkLabel(info, text=r.get("adopter_name",""), font=("Georgia", 16, "bold"), text_color="#111").pack(anchor="w")
+                ctk.CTkLabel(info, text=r.get("adopter_email") or "", font=("Georgia", 12), text_color="#334155").pack(anchor="w")
+                ctk.CTkLabel(info, text=f"Pet: {r.get('pet_name','')}", font=("Georgia", 13), text_color="#333").pack(anchor="w")
+                ctk.CTkLabel(info, text=f"Category: {r.get('category','')}", font=("Georgia", 12), text_color="#555").pack(anchor="w")
+                ctk.CTkLabel(info, text=f"Status: {r.get('status','pending').title()} • Requested: {r.get('created_at') or ''}",
+                             font=("Georgia", 12), text_color="#555").pack(anchor="w", pady=(2,0))
+
+                ctk.CTkButton(card, text="View / Act", width=140, fg_color="#1E63D1", hover_color="#174DA6",
+                              command=lambda req=r: open_request_detail(req)).pack(anchor="e", padx=12, pady=(0, 10))
+
+        render_cards(data)
+        self._add_load_more(
+            list_frame,
+            next_cursor,
+            lambda cursor: self.api.list_requests_page(self.request_filter_status, after=cursor),
+            render_cards,
+        )
+
+    def _add_load_more(self, parent, cursor, fetch_page, render_rows):
+        """
+        Append a "Load more" button that fetches the next page and renders it in place.
+        fetch_page(cursor) returns a Future of (rows, next_cursor).
+        """
+        if cursor is None:
+            return
+
+        @self.tasks.task
+        def load_more():
+            button.configure(text="Loading…", state="disabled")
+            try:
+                rows, next_cursor = yield fetch_page(cursor)
+            except Exception:
+                rows, next_cursor = [], None
+            button.destroy()
+            render_rows(rows)
+            self._add_load_more(parent, next_cursor, fetch_page, render_rows)
+
+        button = ctk.CTkButton(parent, text="Load more", width=160, fg_color="#1E63D1", hover_color="#174DA6",
+                               command=load_more)
+        button.pack(pady=(6, 12))
 
     def _set_request_status_filter(self, value):
         self.request_filter_status = value or "All"
@@ -751,6 +865,7 @@ class AdminHomePage(ctk.CTkFrame):
     # =============================================================
     # NOTIFICATIONS
     # =============================================================
+    @ui_task
     def show_notifications(self):
         self.clear()
         make_header(self.content, "Notifications", "System alerts and request updates.")
@@ -781,36 +896,77 @@ class AdminHomePage(ctk.CTkFrame):
             return
 
         try:
-            notifications = self.controller.list_notifications(admin_id)
+            notifications = list((yield self.api.list_notifications(admin_id)))
         except Exception as e:
             messagebox.showerror("Error", f"Unable to fetch notifications.\n{e}")
             return
+        # cards: id -> card frame; read: ids marked read since the page was loaded
+        state = {
+            "last_id": max((note.get("id") or 0 for note in notifications), default=0),
+            "empty": None,
+            "cards": {},
+            "read": set(),
+        }
+
+        def is_read(note):
+            return bool(note.get("is_read")) or note.get("id") in state["read"]
 
-        def refresh():
-            self.show_notifications()
+        def show_empty():
+            if not state["cards"] and state["empty"] is None:
+                state["empty"] = ctk.CTkLabel(scroll, text="No notifications yet.", font=("Georgia", 14), text_color="#666")
+                state["empty"].pack(pady=14)
 
+        def patch_read(note_id):
+            """
+            Redraw one card as read, in its place.
+            """
+            state["read"].add(note_id)
+            card = state["cards"].get(note_id)
+            note = next((n for n in notifications if n.get("id") == note_id), None)
+            if card is not None and note is not None:
+                render(note, before=card)
+                card.destroy()
+
+        def patch_removed(note_ids):
+            for note_id in note_ids:
+                card = state["cards"].pop(note_id, None)
+                if card is not None:
+                    card.destroy()
+            notifications[:] = [n for n in notifications if n.get("id") not in note_ids]
+            show_empty()
+
+        @self.tasks.task
         def mark_all():
-            for note in notifications:
+            for note in list(notifications):
+                if is_read(note):
+                    continue
                 try:
-                    self.controller.mark_notification_read(note.get("id"))
+                    yield self.api.mark_notification_read(note.get("id"), admin_id=admin_id)
                 except Exception:
                     continue
-            refresh()
+                patch_read(note.get("id"))
+            self.unread_badge.poll_now()
 
+        @self.tasks.task
         def clear_all():
             if not notifications:
                 return
             if not messagebox.askyesno("Clear Notifications", "Remove all notifications?"):
                 return
             try:
-                self.controller.clear_notifications(admin_id)
+                yield self.api.clear_notifications(admin_id)
             except Exception as e:
                 messagebox.showerror("Error", f"Unable to clear notifications.\n{e}")
                 return
-            refresh()
+            patch_removed({n.get("id") for n in notifications})
+            self.unread_badge.poll_now()
+
+        def check_new():
+            append_new()
+            self.unread_badge.poll_now()
 
         ctk.CTkButton(toolbar, text="Refresh", width=120, fg_color="#0B84FF", hover_color="#0861BD",
-                      text_color="white", command=refresh).pack(side="right", padx=6)
+                      text_color="white", command=check_new).pack(side="right", padx=6)
         ctk.CTkButton(toolbar, text="Mark All Read", width=140, fg_color="#1E63D1", hover_color="#174DA6",
                       text_color="white", command=mark_all).pack(side="right", padx=6)
         ctk.CTkButton(toolbar, text="Clear All", width=120, fg_color="#D64545", hover_color="#B53030",
@@ -819,28 +975,32 @@ class AdminHomePage(ctk.CTkFrame):
         scroll = ctk.CTkScrollableFrame(container, fg_color="white")
         scroll.pack(fill="both", expand=True, padx=10, pady=10)
 
-        if not notifications:
-            ctk.CTkLabel(scroll, text="No notifications yet.", font=("Georgia", 14), text_color="#666").pack(pady=14)
-            return
-
+        @self.tasks.task
         def mark_one(note_id):
             try:
-                self.controller.mark_notification_read(note_id)
-                refresh()
+                yield self.api.mark_notification_read(note_id, admin_id=admin_id)
+                patch_read(note_id)
+                self.unread_badge.poll_now()
             except Exception as e:
                 messagebox.showerror("Error", f"Unable to mark notification.\n{e}")
 
+        @self.tasks.task
         def remove_one(note_id):
             try:
-                self.controller.delete_notification(note_id)
-                refresh()
+                yield self.api.delete_notification(note_id, admin_id=admin_id)
+                patch_removed({note_id})
+                self.unread_badge.poll_now()
             except Exception as e:
                 messagebox.showerror("Error", f"Unable to remove notification.\n{e}")
 
-        for note in notifications:
-            bg = "#eef2ff" if not note.get("is_read") else "#f8fafc"
+        def render(note, before=None):
+            bg = "#eef2ff" if not is_read(note) else "#f8fafc"
             card = ctk.CTkFrame(scroll, fg_color=bg, corner_radius=12, border_width=1, border_color="#E5E7EB")
-            card.pack(fill="x", padx=8, pady=6)
+            if before is not None:
+                card.pack(fill="x", padx=8, pady=6, before=before)
+            else:
+                card.pack(fill="x", padx=8, pady=6)
+            state["cards"][note.get("id")] = card
 
             ctk.CTkLabel(
                 card,
@@ -859,7 +1019,7 @@ class AdminHomePage(ctk.CTkFrame):
             btns = ctk.CTkFrame(card, fg_color=bg)
             btns.pack(anchor="e", padx=10, pady=(0, 10))
 
-            if not note.get("is_read"):
+            if not is_read(note):
                 ctk.CTkButton(
                     btns,
                     text="Mark as Read",
@@ -876,10 +1036,42 @@ class AdminHomePage(ctk.CTkFrame):
                 hover_color="#B53030",
                 command=lambda nid=note.get("id"): remove_one(nid),
             ).pack(side="left", padx=5)
+            return card
+
+        @self.tasks.task
+        def append_new():
+            """
+            Add only notifications newer than the last one shown, newest on top.
+            """
+            try:
+                if not scroll.winfo_exists():
+                    return
+                fresh = yield self.api.get_notifications_since(admin_id, state["last_id"])
+            except Exception:
+                return
+            # Two overlapping polls can return the same rows; only keep what is still new
+            fresh = [note for note in fresh if (note.get("id") or 0) > state["last_id"]]
+            if not fresh:
+                return
+            if state["empty"] is not None:
+                state["empty"].destroy()
+                state["empty"] = None
+            top = next(iter(scroll.winfo_children()), None)
+            for note in fresh:
+                top = render(note, before=top)
+            notifications.extend(fresh)
+            state["last_id"] = max(note.get("id") or 0 for note in fresh)
+
+        for note in notifications:
+            render(note)
+        show_empty()
+        self._notification_appender = append_new
+        self.unread_badge.poll_now()
 
     # =============================================================
     # PENDING ADMINS
     # =============================================================
+    @ui_task
     def show_pending_admins(self):
         self.clear()
         make_header(self.content, "Pending Admins", "Approve or decline new admin sign-ups.")
@@ -901,7 +1093,7 @@ class AdminHomePage(ctk.CTkFrame):
         container.pack(fill="both", expand=True, padx=18, pady=18)
 
         try:
-            pending = self.controller.list_pending_admins()
+            pending = yield self.api.list_pending_admins()
         except Exception:
             pending = []
 
@@ -931,9 +1123,10 @@ class AdminHomePage(ctk.CTkFrame):
             btns = ctk.CTkFrame(row, fg_color="#f8fafc")
             btns.pack(anchor="e", padx=10, pady=(0, 8))
 
+            @self.tasks.task
             def approve(pending_id=req.get("pending_id")):
                 try:
-                    ok = self.controller.approve_pending_admin(pending_id)
+                    ok = yield self.api.approve_pending_admin(pending_id)
                     if ok:
                         messagebox.showinfo("Approved", "Pending admin approved and added.")
                     else:
@@ -942,11 +1135,12 @@ class AdminHomePage(ctk.CTkFrame):
                 except Exception as e:
                     messagebox.showerror("Error", f"Failed to approve admin.\n{e}")
 
+            @self.tasks.task
             def decline(pending_id=req.get("pending_id")):
                 if not messagebox.askyesno("Decline", "Decline this admin request?"):
                     return
                 try:
-                    self.controller.decline_pending_admin(pending_id)
+                    yield self.api.decline_pending_admin(pending_id)
                     messagebox.showinfo("Declined", "Pending admin declined.")
                     self.show_pending_admins()
                 except Exception as e:
@@ -1002,6 +1196,8 @@ class AdminHomePage(ctk.CTkFrame):
         def reset_filter():
             self.manage_category = "All"
             self.category_combo.set("All")
+            self.manage_search = ""
+            self.manage_search_entry.delete(0, "end")
             self._render_manage_cards()
 
         ctk.CTkButton(
@@ -1013,6 +1209,31 @@ class AdminHomePage(ctk.CTkFrame):
         ctk.CTkButton(
             filter_bar, text="Add Pet", width=140, fg_color="#0E5A2A", hover_color="#1B8542", command=self.open_add_pet
         ).pack(side="right", padx=12, pady=10)
+        ctk.CTkButton(
+            filter_bar, text="Delete Selected", width=150, fg_color="#D64545", hover_color="#B53030",
+            command=self.delete_selected_pets,
+        ).pack(side="right", padx=(12, 0), pady=10)
+
+        # Search re-renders 250 ms after the last keystroke instead of on every key
+        self.manage_search_entry = ctk.CTkEntry(
+            filter_bar, width=260, placeholder_text="Search name, breed or description"
+        )
+        self.manage_search_entry.pack(side="right", padx=(12, 0), pady=10)
+        if getattr(self, "manage_search", ""):
+            self.manage_search_entry.insert(0, self.manage_search)
+        self._manage_search_job = None
+
+        def run_search():
+            self._manage_search_job = None
+            self.manage_search = self.manage_search_entry.get().strip()
+            self._render_manage_cards()
+
+        def schedule_search(_event=None):
+            if self._manage_search_job is not None:
+                self.after_cancel(self._manage_search_job)
+            self._manage_search_job = self.after(250, run_search)
+
+        self.manage_search_entry.bind("<KeyRelease>", schedule_search)
         
 
         scroll = ctk.CTkScrollableFrame(bg, fg_color="#06215A", corner_radius=0)
@@ -1023,16 +1244,23 @@ class AdminHomePage(ctk.CTkFrame):
     def _fetch_pets_for_manage(self, category=None):
         cat = (category or self.manage_category or "All").lower()
         try:
-            return self.controller.list_pets(cat)
+            return (yield self.api.search_pets(getattr(self, "manage_search", ""), cat))
         except Exception:
             return []
 
+    @ui_task
     def _render_manage_cards(self):
+        # Keep the current grid until the new results arrive; a newer search supersedes this one
+        self._manage_render_seq = seq = getattr(self, "_manage_render_seq", 0) + 1
+        pets = yield from self._fetch_pets_for_manage()
+        if seq != self._manage_render_seq:
+            return
+
         # clear existing grid
         for w in list(self.manage_scroll.winfo_children()):
             w.destroy()
+        self.selected_pet_ids = set()
 
-        pets = self._fetch_pets_for_manage()
         if not pets:
             ctk.CTkLabel(self.manage_scroll, text="No pets found.", font=("Georgia", 20), text_color="white").pack(
                 pady=30
@@ -1064,7 +1292,14 @@ class AdminHomePage(ctk.CTkFrame):
                 placeholder.pack(pady=(20, 10))
 
             name = pet.get("name", "Unknown")
-            ctk.CTkLabel(card, text=name, font=("Georgia", 18, "bold"), text_color="#000").pack(anchor="w", padx=20)
+            name_row = ctk.CTkFrame(card, fg_color="white")
+            name_row.pack(fill="x", padx=20)
+            ctk.CTkLabel(name_row, text=name, font=("Georgia", 18, "bold"), text_color="#000").pack(side="left")
+            select_var = ctk.BooleanVar(value=False)
+            ctk.CTkCheckBox(
+                name_row, text="Select", width=24, variable=select_var, font=("Georgia", 12), text_color="#444",
+                command=lambda pid=pet.get("id"), v=select_var: self._toggle_pet_selected(pid, v),
+            ).pack(side="right")
 
             breed = pet.get("breed", "Unknown")
             age = pet.get("age", "N/A")
@@ -1117,8 +1352,34 @@ class AdminHomePage(ctk.CTkFrame):
                 col = 0
                 row += 1
 
+    def _toggle_pet_selected(self, pet_id, var):
+        if var.get():
+            self.selected_pet_ids.add(pet_id)
+        else:
+            self.selected_pet_ids.discard(pet_id)
+
+    @ui_task
+    def delete_selected_pets(self):
+        selected = sorted(getattr(self, "selected_pet_ids", set()))
+        if not selected:
+            messagebox.showinfo("Delete", "Select at least one pet to delete.")
+            return
+        confirm = messagebox.askyesno(
+            "Confirm Delete",
+            f"Delete {len(selected)} selected pet(s)? The records and any stored images will be removed.",
+        )
+        if not confirm:
+            return
+        try:
+            yield self.api.delete_pets(selected)
+            messagebox.showinfo("Deleted", f"{len(selected)} pet(s) deleted.")
+            self._render_manage_cards()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to delete pets: {e}")
+
+    @ui_task
     def delete_pet(self, pet):
-        pet_id = pet.get("id") if isinstance(pet, dict) else None
+        pet_id = pet.get("id") if pet else None
         if not pet_id:
             messagebox.showerror("Error", "Missing pet id.")
             return
@@ -1131,7 +1392,7 @@ class AdminHomePage(ctk.CTkFrame):
         if not confirm:
             return
         try:
-            self.controller.delete_pet(pet_id, img_path)
+            yield self.api.delete_pet(pet_id, img_path)
             messagebox.showinfo("Deleted", "Pet deleted successfully.")
             self._render_manage_cards()
         except Exception as e:
@@ -1208,6 +1469,7 @@ class AdminHomePage(ctk.CTkFrame):
         btn_frame = ctk.CTkFrame(win, fg_color="transparent")
         btn_frame.pack(side="bottom", pady=12, padx=12, fill="x")
 
+        @self.tasks.task
         def save_changes():
             name = fields["name"].get().strip()
             breed = fields["breed"].get().strip()
@@ -1228,7 +1490,7 @@ class AdminHomePage(ctk.CTkFrame):
                 return
 
             try:
-                self.controller.update_pet(
+                yield self.api.update_pet(
                     pet.get("id"),
                     name,
                     breed,
@@ -1331,6 +1593,7 @@ class AdminHomePage(ctk.CTkFrame):
         btn_frame = ctk.CTkFrame(win, fg_color="transparent")
         btn_frame.pack(side="bottom", pady=12, padx=12, fill="x")
 
+        @self.tasks.task
         def save_new_pet():
             name = fields["name"].get().strip()
             breed = fields["breed"].get().strip()
@@ -1352,7 +1615,7 @@ class AdminHomePage(ctk.CTkFrame):
                 return
 
             try:
-                self.controller.add_pet(
+                yield self.api.add_pet(
                     name=name,
                     category=category,
                     breed=breed,
@@ -1384,6 +1647,7 @@ class AdminHomePage(ctk.CTkFrame):
     # =============================================================
     # 5. ADOPTION HISTORY
     # =============================================================
+    @ui_task
     def show_history(self):
         self.clear()
         make_header(self.content, "Adoption History", "See every adopted pet with full details.")
@@ -1428,13 +1692,26 @@ class AdminHomePage(ctk.CTkFrame):
             cat_combo.set("All")
         cat_combo.pack(side="left", padx=(0, 12))
 
+        counts_future = self.api.history_counts()
+        page_future = self.api.adoption_history_page(self.history_category_filter)
+        try:
+            counts = yield counts_future
+        except Exception:
+            counts = {}
+        ctk.CTkLabel(
+            toolbar,
+            text="  •  ".join(f"{opt.title()}: {counts.get(opt.lower(), 0)}" for opt in ("All", "dog", "cat")),
+            font=("Georgia", 12),
+            text_color="#00156A",
+        ).pack(side="left")
+
         table = ctk.CTkScrollableFrame(shell, fg_color="#D4FAFF")
         table.pack(fill="both", expand=True, padx=26, pady=(0, 22))
 
         try:
-            hist = self.controller.adoption_history(self.history_category_filter)
+            hist, next_cursor = yield page_future
         except Exception:
-            hist = []
+            hist, next_cursor = [], None
 
         if not hist:
             ctk.CTkLabel(table, text="No adoptions yet.", font=("Georgia", 14)).pack(pady=12)
@@ -1466,74 +1743,83 @@ class AdminHomePage(ctk.CTkFrame):
                         continue
             return None
 
-        for h in hist:
-            pet_name = h.get("pet_name") or "Unknown Pet"
-            adopted = h.get("adopted_at") or h.get("date") or ""
-            adopter = h.get("adopter_name") or "Adopter"
-            adopter_email = h.get("adopter_email") or ""
-            desc = h.get("description") or "No description provided."
-            category = h.get("category") or ""
-            breed = h.get("breed") or ""
-            age = h.get("age") or "N/A"
-            sex = h.get("sex") or "N/A"
-            vaccinated = h.get("vaccinated")
-            vaccinated_txt = "Vaccinated" if str(vaccinated).lower() in ("1", "true", "yes") else "Not vaccinated"
-            status = h.get("status") or ""
-            photo = resolve_pet_image(h.get("photo_path"))
-
-            card = ctk.CTkFrame(table, fg_color="white", corner_radius=22, border_width=1, border_color="#b7d4ff")
-            card.pack(fill="x", padx=10, pady=10)
-
-            body = ctk.CTkFrame(card, fg_color="white")
-            body.pack(fill="both", expand=True, padx=14, pady=14)
-
-            img = ctk.CTkLabel(body, image=photo, text="No Image" if not photo else "")
-            img.image = photo
-            img.pack(side="left", padx=(0, 16), pady=6)
-
-            info = ctk.CTkFrame(body, fg_color="white")
-            info.pack(side="left", fill="both", expand=True)
-
-            header = ctk.CTkFrame(info, fg_color="white")
-            header.pack(fill="x")
-            ctk.CTkLabel(header, text=pet_name, font=("Georgia", 24, "bold"), text_color="#0f172a").pack(side="left", anchor="w")
-
-            status_lower = str(status).lower()
-            badge_color = "#22C55E" if status_lower == "approved" else "#EAB308" if status_lower == "pending" else "#EF4444"
-            ctk.CTkLabel(
-                header,
-                text=status.title() if status else "Status Unknown",
-                font=("Georgia", 12, "bold"),
-                text_color="white",
-                fg_color=badge_color,
-                corner_radius=12,
-                padx=10,
-                pady=4,
-            ).pack(side="right", padx=(8, 0))
-
-            meta_parts = [part for part in [category, breed] if part]
-            meta = " • ".join(meta_parts) if meta_parts else "Pet details"
-            ctk.CTkLabel(info, text=meta, font=("Georgia", 14), text_color="#334155").pack(anchor="w", pady=(6, 6))
-
-            stats_row = ctk.CTkFrame(info, fg_color="white")
-            stats_row.pack(fill="x", pady=(0, 4))
-            ctk.CTkLabel(stats_row, text=f"Age: {age}", font=("Georgia", 13), text_color="#111").pack(side="left", padx=(0, 10))
-            ctk.CTkLabel(stats_row, text=f"Sex: {sex}", font=("Georgia", 13), text_color="#111").pack(side="left", padx=(0, 10))
-            ctk.CTkLabel(stats_row, text=vaccinated_txt, font=("Georgia", 12, "bold"), text_color="#0f172a").pack(side="left")
-
-            adopter_line = f"Adopter: {adopter}"
-            if adopter_email:
-                adopter_line += f" ({adopter_email})"
-            ctk.CTkLabel(info, text=adopter_line, font=("Georgia", 12), text_color="#0f172a").pack(anchor="w")
-            ctk.CTkLabel(info, text=f"Adopted on: {adopted}", font=("Georgia", 12), text_color="#0f172a").pack(anchor="w", pady=(0, 6))
-            ctk.CTkLabel(
-                info,
-                text=desc,
-                font=("Georgia", 13),
-                text_color="#1f2937",
-                wraplength=760,
-                justify="left",
-            ).pack(anchor="w", pady=(6, 0))
+        def render_rows(rows):
+            for h in rows:
+                pet_name = h.get("pet_name") or "Unknown Pet"
+                adopted = h.get("adopted_at") or h.get("date") or ""
+                adopter = h.get("adopter_name") or "Adopter"
+                adopter_email = h.get("adopter_email") or ""
+                desc = h.get("description") or "No description provided."
+                category = h.get("category") or ""
+                breed = h.get("breed") or ""
+                age = h.get("age") or "N/A"
+                sex = h.get("sex") or "N/A"
+                vaccinated = h.get("vaccinated")
+                vaccinated_txt = "Vaccinated" if str(vaccinated).lower() in ("1", "true", "yes") else "Not vaccinated"
+                status = h.get("status") or ""
+                photo = resolve_pet_image(h.get("photo_path"))
+
+                card = ctk.CTkFrame(table, fg_color="white", corner_radius=22, border_width=1, border_color="#b7d4ff")
+                card.pack(fill="x", padx=10, pady=10)
+
+                body = ctk.CTkFrame(card, fg_color="white")
+                body.pack(fill="both", expand=True, padx=14, pady=14)
+
+                img = ctk.CTkLabel(body, image=photo, text="No Image" if not photo else "")
+                img.image = photo
+                img.pack(side="left", padx=(0, 16), pady=6)
+
+                info = ctk.CTkFrame(body, fg_color="white")
+                info.pack(side="left", fill="both", expand=True)
+
+                header = ctk.CTkFrame(info, fg_color="white")
+                header.pack(fill="x")
+                ctk.CTkLabel(header, text=pet_name, font=("Georgia", 24, "bold"), text_color="#0f172a").pack(side="left", anchor="w")
+
+                status_lower = str(status).lower()
+                badge_color = "#22C55E" if status_lower == "approved" else "#EAB308" if status_lower == "pending" else "#EF4444"
+                ctk.CTkLabel(
+                    header,
+                    text=status.title() if status else "Status Unknown",
+                    font=("Georgia", 12, "bold"),
+                    text_color="white",
+                    fg_color=badge_color,
+                    corner_radius=12,
+                    padx=10,
+                    pady=4,
+                ).pack(side="right", padx=(8, 0))
+
+                meta_parts = [part for part in [category, breed] if part]
+                meta = " • ".join(meta_parts) if meta_parts else "Pet details"
+                ctk.CTkLabel(info, text=meta, font=("Georgia", 14), text_color="#334155").pack(anchor="w", pady=(6, 6))
+
+                stats_row = ctk.CTkFrame(info, fg_color="white")
+                stats_row.pack(fill="x", pady=(0, 4))
+                ctk.CTkLabel(stats_row, text=f"Age: {age}", font=("Georgia", 13), text_color="#111").pack(side="left", padx=(0, 10))
+                ctk.CTkLabel(stats_row, text=f"Sex: {sex}", font=("Georgia", 13), text_color="#111").pack(side="left", padx=(0, 10))
+                ctk.CTkLabel(stats_row, text=vaccinated_txt, font=("Georgia", 12, "bold"), text_color="#0f172a").pack(side="left")
+
+                adopter_line = f"Adopter: {adopter}"
+                if adopter_email:
+                    adopter_line += f" ({adopter_email})"
+                ctk.CTkLabel(info, text=adopter_line, font=("Georgia", 12), text_color="#0f172a").pack(anchor="w")
+                ctk.CTkLabel(info, text=f"Adopted on: {adopted}", font=("Georgia", 12), text_color="#0f172a").pack(anchor="w", pady=(0, 6))
+                ctk.CTkLabel(
+                    info,
+                    text=desc,
+                    font=("Georgia", 13),
+                    text_color="#1f2937",
+                    wraplength=760,
+                    justify="left",
+                ).pack(anchor="w", pady=(6, 0))
+
+        render_rows(hist)
+        self._add_load_more(
+            table,
+            next_cursor,
+            lambda cursor: self.api.adoption_history_page(self.history_category_filter, after=cursor),
+            render_rows,
+        )
 
     # =============================================================
     # 6. PROFILE PAGE
@@ -1656,6 +1942,7 @@ class AdminHomePage(ctk.CTkFrame):
             entry.pack(padx=10, pady=5)
             self.profile_entries[label] = entry
 
+        @self.tasks.task
         def save_profile():
             photo_path = img_entry.get().strip()
             try:
@@ -1669,7 +1956,7 @@ class AdminHomePage(ctk.CTkFrame):
                 else:
                     age_val = user.get("age")
 
-                updated = self.controller.update_admin_profile(
+                updated = yield self.api.update_admin_profile(
                     self._get_admin_id(),
                     self.profile_entries["Full Name"].get(),
                     age_val,
@@ -1695,11 +1982,12 @@ class AdminHomePage(ctk.CTkFrame):
         # Bottom-right aligned actions
         ctk.CTkButton(actions, text="Save Profile", fg_color="#1E40AF", hover_color="#1E3A8A", width=180, height=40, command=save_profile).pack(side="right", padx=(0, 8), pady=4)
 
+        @self.tasks.task
         def delete_account():
             if not messagebox.askyesno("Delete Account", "Delete this admin account?"):
                 return
             try:
-                self.controller.delete_admin_account(self._get_admin_id(), user.get("photo_path") or user.get("image") or "")
+                yield self.api.delete_admin_account(self._get_admin_id(), user.get("photo_path") or user.get("image") or "")
                 messagebox.showinfo("Deleted", "Admin account deleted.")
                 self.app.logout()
             except Exception as e:
@@ -1912,6 +2200,7 @@ class AdminHomePage(ctk.CTkFrame):
     # =============================================================
     # 8. ABOUT US
     # =============================================================
+    @ui_task
     def show_about(self):
         self.clear()
         hero = ctk.CTkFrame(self.content, fg_color="#00156A")
@@ -1939,7 +2228,7 @@ class AdminHomePage(ctk.CTkFrame):
         )
 
         try:
-            admins = self.controller.admin_profiles()
+            admins = yield self.api.admin_profiles()
         except Exception:
             admins = []
 
@@ -7,8 +7,11 @@ from tkinter import filedialog, messagebox
 from PIL import Image, ImageDraw, ImageFont, ImageOps
 
 from app.config import ASSETS_DIR, BASE_DIR, IMAGES_DIR
-from app.controllers import AdopterController
+from app.api import controller_for
+from app.controllers import AsyncController
 from app.services.pet_components import load_pet_image
+from app.widgets.notification_badge import UnreadBadge
+from app.widgets.tasks import TaskRunner, ui_task
 ctk.set_appearance_mode("light")
 
 LOGO_FILE = "FurEver_Home_Logo.png"
@@ -65,7 +68,10 @@ class AdopterHomePage(ctk.CTkFrame):
         super().__init__(master)
         self.app = app
         self.switch_frame = switch_frame
-        self.controller = AdopterController()
+        self.controller = controller_for("adopter")
+        # Page code calls the controller through self.api (futures) inside tasks, never directly
+        self.api = AsyncController(self.controller)
+        self.tasks = TaskRunner(self, on_busy=self._set_busy, on_error=self._task_failed)
         self.user = app.current_user or {}
 
         self.configure(fg_color="#f2f5fa")
@@ -96,7 +102,8 @@ class AdopterHomePage(ctk.CTkFrame):
 
         sb_btn("Available Pets", self.show_pet_list).pack(pady=5)
         sb_btn("My Requests", self.show_requests).pack(pady=5)
-        sb_btn("Notifications", self.show_notifications).pack(pady=5)
+        notifications_btn = sb_btn("Notifications", self.show_notifications)
+        notifications_btn.pack(pady=5)
         sb_btn("Adoption History", self.show_history).pack(pady=5)
         sb_btn("Profile", self.show_profile).pack(pady=5)
         sb_btn("Help Center", self.show_help_center).pack(pady=5)
@@ -114,15 +121,45 @@ class AdopterHomePage(ctk.CTkFrame):
             command=lambda: app.show_page("login"),  # Ensure this takes the user to the login page
         ).pack(side="bottom", pady=30)
 
+        self.busy_label = ctk.CTkLabel(sidebar, text="", font=("Georgia", 12, "italic"), text_color="#072658")
+        self.busy_label.pack(side="bottom")
+
         self.content = ctk.CTkFrame(container, fg_color="#f2f5fa")
         self.content.pack(side="left", fill="both", expand=True)
 
+        # An open notifications page registers an appender; every badge poll adds new rows in place.
+        self._notification_appender = None
+        self.unread_badge = UnreadBadge(
+            notifications_btn,
+            "Notifications",
+            lambda: self.api.count_unread(self._get_user_id()),
+            on_poll=self._on_unread_poll,
+        )
+
         self.show_pet_list()
+        self.unread_badge.poll_now()
 
     def clear(self):
+        self._notification_appender = None
+        self.tasks.new_view()
         for w in list(self.content.winfo_children()):
             w.destroy()
 
+    def _on_unread_poll(self, _count):
+        if self._notification_appender:
+            self._notification_appender()
+
+    def _set_busy(self, busy):
+        self.busy_label.configure(text="Loading…" if busy else "")
+        try:
+            self.configure(cursor="watch" if busy else "")
+        except Exception:
+            pass
+
+    def _task_failed(self, error):
+        self.busy_label.configure(text="Something went wrong")
+        messagebox.showerror("Error", f"Something went wrong.\n{error}")
+
     def _get_user_id(self):
         """
         Normalize adopter id lookups (some logins store `users_id`, others `id`/`user_id`).
@@ -179,6 +216,8 @@ class AdopterHomePage(ctk.CTkFrame):
         def reset_filter():
             self.adopter_category = "All"
             self.adopter_category_combo.set("All")
+            self.adopter_search = ""
+            self.adopter_search_entry.delete(0, "end")
             self._render_pet_cards(bg)
 
         ctk.CTkButton(
@@ -188,25 +227,52 @@ class AdopterHomePage(ctk.CTkFrame):
             filter_bar, text="Reset", width=120, fg_color="#BF2121", hover_color="#374151", command=reset_filter
         ).pack(side="left", padx=6, pady=10)
 
+        # Search re-renders 250 ms after the last keystroke instead of on every key
+        self.adopter_search_entry = ctk.CTkEntry(
+            filter_bar, width=260, placeholder_text="Search name, breed or description"
+        )
+        self.adopter_search_entry.pack(side="right", padx=14, pady=10)
+        if getattr(self, "adopter_search", ""):
+            self.adopter_search_entry.insert(0, self.adopter_search)
+        self._pet_search_job = None
+
+        def run_search():
+            self._pet_search_job = None
+            self.adopter_search = self.adopter_search_entry.get().strip()
+            self._render_pet_cards(bg)
+
+        def schedule_search(_event=None):
+            if self._pet_search_job is not None:
+                self.after_cancel(self._pet_search_job)
+            self._pet_search_job = self.after(250, run_search)
+
+        self.adopter_search_entry.bind("<KeyRelease>", schedule_search)
+
         scroll = ctk.CTkScrollableFrame(bg, fg_color="#06215A", corner_radius=0)
         scroll.pack(fill="both", expand=True, padx=50, pady=(8, 32))
         self.pet_scroll = scroll
         self._render_pet_cards(bg)
 
+    @ui_task
     def _render_pet_cards(self, bg):
-        # clear existing grid in scroll
-        for w in list(self.pet_scroll.winfo_children()):
-            w.destroy()
-
-        # fetch pets with category filter
+        # fetch pets with category filter and optional search text; a newer search supersedes this one
+        self._pet_render_seq = seq = getattr(self, "_pet_render_seq", 0) + 1
         cat = getattr(self, "adopter_category", "All")
+        query = getattr(self, "adopter_search", "")
         try:
-            pets = self.controller.list_pets(cat)
+            pets = yield self.api.search_pets(query, cat)
         except Exception:
             pets = []
+        if seq != self._pet_render_seq:
+            return
+
+        # clear existing grid in scroll
+        for w in list(self.pet_scroll.winfo_children()):
+            w.destroy()
 
         if not pets:
-            ctk.CTkLabel(self.pet_scroll, text="No pets available right now.", font=("Georgia", 18), text_color="white").pack(
+            empty_msg = "No pets match your search." if query else "No pets available right now."
+            ctk.CTkLabel(self.pet_scroll, text=empty_msg, font=("Georgia", 18), text_color="white").pack(
                 pady=24
             )
             return
@@ -456,6 +522,7 @@ class AdopterHomePage(ctk.CTkFrame):
         bottom = ctk.CTkFrame(form, fg_color="#FAFAFA")
         bottom.pack(fill="x", pady=14)
 
+        @self.tasks.task
         def submit():
             if not agree_var.get():
                 messagebox.showerror("Error", "You must agree to the Terms & Conditions and Privacy Policy before submitting.")
@@ -473,7 +540,7 @@ class AdopterHomePage(ctk.CTkFrame):
 
             # Avoid duplicate pending requests for the same pet
             try:
-                if self.controller.has_pending_request(user_id, pet_pk):
+                if (yield self.api.has_pending_request(user_id, pet_pk)):
                     messagebox.showinfo("Already Requested", "You already have a pending request for this pet.")
                     return
             except Exception:
@@ -492,7 +559,7 @@ class AdopterHomePage(ctk.CTkFrame):
             )
 
             try:
-                self.controller.submit_request(user_id, pet_pk, note, pet_name)
+                yield self.api.submit_request(user_id, pet_pk, note, pet_name)
                 messagebox.showinfo("Success", "Your application has been submitted.")
                 form.destroy()
                 self.show_requests()
@@ -507,6 +574,7 @@ class AdopterHomePage(ctk.CTkFrame):
         ).pack(side="right", padx=(0, 10))
 
     # --------------------------------------------------
+    @ui_task
     def show_requests(self):
         self.clear()
         make_header(self.content, "My Adoption Requests")
@@ -567,8 +635,19 @@ class AdopterHomePage(ctk.CTkFrame):
             messagebox.showerror("Error", "Cannot show requests: adopter ID not found.")
             return
 
+        # Both queries go out together; the counts and the first page load in parallel
+        counts_future = self.api.request_counts(user_id)
+        page_future = self.api.list_requests_page(user_id, getattr(self, "request_status_filter", "All"))
+        counts = yield counts_future
+        ctk.CTkLabel(
+            filter_bar,
+            text="  •  ".join(f"{opt}: {counts.get(opt.lower(), 0)}" for opt in status_values),
+            font=("Georgia", 12),
+            text_color="#0a2c68",
+        ).pack(side="left", padx=12, pady=10)
+
         try:
-            requests = self.controller.list_requests(user_id, getattr(self, "request_status_filter", "All"))
+            requests, next_cursor = yield page_future
         except Exception as e:
             messagebox.showerror("Error", f"Unable to fetch requests.\n{e}")
             return
@@ -598,12 +677,13 @@ class AdopterHomePage(ctk.CTkFrame):
                         continue
             return None
 
+        @self.tasks.task
         def open_request_detail(req):
             # ---------------------------
             # LOAD DATA
             # ---------------------------
             try:
-                full = self.controller.get_request(req.get("id"))
+                full = yield self.api.get_request(req.get("id"), adopter_id=user_id)
             except Exception:
                 full = req
 
@@ -802,81 +882,116 @@ class AdopterHomePage(ctk.CTkFrame):
                 command=detail.destroy,
             ).pack(side="right", padx=20, pady=8)
 
-        for r in requests:
-            card = ctk.CTkFrame(scroll, fg_color="white", corner_radius=16, border_width=1, border_color="#b7d4ff")
-            card.pack(fill="x", padx=8, pady=8)
-
-            pet_name = r.get("pet_name", "Unknown Pet")
-            status_raw = str(r.get("status", "pending")).strip().lower()
-            status = status_raw.title()
-            created = r.get("created_at") or r.get("requested_at") or ""
-            req_id = r.get("id")
-            pet_photo = r.get("pet_image_resolved") or r.get("pet_photo") or r.get("pet_image") or ""
+        def render_cards(rows):
+            for r in rows:
+                card = ctk.CTkFrame(scroll, fg_color="white", corner_radius=16, border_width=1, border_color="#b7d4ff")
+                card.pack(fill="x", padx=8, pady=8)
 
-            row = ctk.CTkFrame(card, fg_color="#f8fafc")
-            row.pack(fill="x", padx=6, pady=6)
+                pet_name = r.get("pet_name", "Unknown Pet")
+                status_raw = str(r.get("status", "pending")).strip().lower()
+                status = status_raw.title()
+                created = r.get("created_at") or r.get("requested_at") or ""
+                req_id = r.get("id")
+                pet_photo = r.get("pet_image_resolved") or r.get("pet_photo") or r.get("pet_image") or ""
 
-            thumb_frame = ctk.CTkFrame(row, fg_color="#f8fafc")
-            thumb_frame.pack(side="left", padx=10, pady=6)
-            try:
-                thumb_img = load_pet_image(pet_photo, size=(120, 90))
-                lbl = ctk.CTkLabel(thumb_frame, image=thumb_img, text="")
-                lbl.image = thumb_img
-                lbl.pack()
-            except Exception:
-                ctk.CTkLabel(thumb_frame, text="No Image", fg_color="#e5e7eb", width=120, height=90).pack()
+                row = ctk.CTkFrame(card, fg_color="#f8fafc")
+                row.pack(fill="x", padx=6, pady=6)
 
-            info = ctk.CTkFrame(row, fg_color="#f8fafc")
-            info.pack(side="left", fill="both", expand=True, padx=8, pady=4)
-            ctk.CTkLabel(info, text=pet_name, font=("Georgia", 16, "bold"), text_color="#111").pack(
-                anchor="w", padx=6, pady=(2, 0)
-            )
-            ctk.CTkLabel(info, text=f"Status: {status}", font=("Georgia", 13), text_color="#444").pack(anchor="w", padx=6)
-            ctk.CTkLabel(info, text=f"Submitted on: {created}", font=("Georgia", 12), text_color="#666").pack(
-                anchor="w", padx=6, pady=(0, 4)
-            )
+                thumb_frame = ctk.CTkFrame(row, fg_color="#f8fafc")
+                thumb_frame.pack(side="left", padx=10, pady=6)
+                try:
+                    thumb_img = load_pet_image(pet_photo, size=(120, 90))
+                    lbl = ctk.CTkLabel(thumb_frame, image=thumb_img, text="")
+                    lbl.image = thumb_img
+                    lbl.pack()
+                except Exception:
+                    ctk.CTkLabel(thumb_frame, text="No Image", fg_color="#e5e7eb", width=120, height=90).pack()
 
-            btns = ctk.CTkFrame(row, fg_color="#f8fafc")
-            btns.pack(side="right", padx=8, pady=6)
+                info = ctk.CTkFrame(row, fg_color="#f8fafc")
+                info.pack(side="left", fill="both", expand=True, padx=8, pady=4)
+                ctk.CTkLabel(info, text=pet_name, font=("Georgia", 16, "bold"), text_color="#111").pack(
+                    anchor="w", padx=6, pady=(2, 0)
+                )
+                ctk.CTkLabel(info, text=f"Status: {status}", font=("Georgia", 13), text_color="#444").pack(anchor="w", padx=6)
+                ctk.CTkLabel(info, text=f"Submitted on: {created}", font=("Georgia", 12), text_color="#666").pack(
+                    anchor="w", padx=6, pady=(0, 4)
+                )
 
-            def delete_request(req=req_id):
-                if not messagebox.askyesno("Delete Request", "Delete this request? This cannot be undone."):
-                    return
-                try:
-                    ok = self.controller.delete_request(req, adopter_id=user_id)
-                except Exception as e:
-                    messagebox.showerror("Error", f"Unable to delete request.\n{e}")
-                    return
-                if ok:
-                    messagebox.showinfo("Deleted", "Request removed.")
-                else:
-                    messagebox.showerror("Error", "Unable to delete this request (approved requests are kept for history).")
-                self.show_requests()
+                btns = ctk.CTkFrame(row, fg_color="#f8fafc")
+                btns.pack(side="right", padx=8, pady=6)
 
-            ctk.CTkButton(btns, text="View Details", width=140, command=lambda req=r: open_request_detail(req)).pack(
-                anchor="e", padx=4, pady=(0, 6)
-            )
-            if r.get("status", "").lower() == "pending" and req_id:
-                def cancel_request(req=req_id):
-                    if not messagebox.askyesno("Cancel Request", "Cancel this adoption request?"):
+                @self.tasks.task
+                def delete_request(req=req_id):
+                    if not messagebox.askyesno("Delete Request", "Delete this request? This cannot be undone."):
                         return
                     try:
-                        ok = self.controller.cancel_request(req, adopter_id=user_id)
+                        ok = yield self.api.delete_request(req, adopter_id=user_id)
                     except Exception as e:
-                        messagebox.showerror("Error", f"Unable to cancel request.\n{e}")
+                        messagebox.showerror("Error", f"Unable to delete request.\n{e}")
                         return
                     if ok:
-                        messagebox.showinfo("Cancelled", "Your adoption request has been cancelled.")
+                        messagebox.showinfo("Deleted", "Request removed.")
                     else:
-                        messagebox.showerror("Error", "Unable to cancel this request (it may already be processed).")
+                        messagebox.showerror("Error", "Unable to delete this request (approved requests are kept for history).")
                     self.show_requests()
-                ctk.CTkButton(btns, text="Cancel", width=120, fg_color="#D64545", hover_color="#B53030",
-                              command=cancel_request).pack(anchor="e", padx=4, pady=(0, 6))
 
-            ctk.CTkButton(btns, text="Delete", width=120, fg_color="#4B5563", hover_color="#374151",
-                          command=delete_request).pack(anchor="e", padx=4, pady=(0, 6))
+                ctk.CTkButton(btns, text="View Details", width=140, command=lambda req=r: open_request_detail(req)).pack(
+                    anchor="e", padx=4, pady=(0, 6)
+                )
+                if r.get("status", "").lower() == "pending" and req_id:
+                    @self.tasks.task
+                    def cancel_request(req=req_id):
+                        if not messagebox.askyesno("Cancel Request", "Cancel this adoption request?"):
+                            return
+                        try:
+                            ok = yield self.api.cancel_request(req, adopter_id=user_id)
+                        except Exception as e:
+                            messagebox.showerror("Error", f"Unable to cancel request.\n{e}")
+                            return
+                        if ok:
+                            messagebox.showinfo("Cancelled", "Your adoption request has been cancelled.")
+                        else:
+                            messagebox.showerror("Error", "Unable to cancel this request (it may already be processed).")
+                        self.show_requests()
+                    ctk.CTkButton(btns, text="Cancel", width=120, fg_color="#D64545", hover_color="#B53030",
+                                  command=cancel_request).pack(anchor="e", padx=4, pady=(0, 6))
+
+                ctk.CTkButton(btns, text="Delete", width=120, fg_color="#4B5563", hover_color="#374151",
+                              command=delete_request).pack(anchor="e", padx=4, pady=(0, 6))
+
+        render_cards(requests)
+        self._add_load_more(
+            scroll,
+            next_cursor,
+            lambda cursor: self.api.list_requests_page(user_id, self.request_status_filter, after=cursor),
+            render_cards,
+        )
+
+    def _add_load_more(self, parent, cursor, fetch_page, render_rows):
+        """
+        Append a "Load more" button that fetches the next page and renders it in place.
+        fetch_page(cursor) returns a Future of (rows, next_cursor).
+        """
+        if cursor is None:
+            return
+
+        @self.tasks.task
+        def load_more():
+            button.configure(text="Loading…", state="disabled")
+            try:
+                rows, next_cursor = yield fetch_page(cursor)
+            except Exception:
+                rows, next_cursor = [], None
+            button.destroy()
+            render_rows(rows)
+            self._add_load_more(parent, next_cursor, fetch_page, render_rows)
+
+        button = ctk.CTkButton(parent, text="Load more", width=160, fg_color="#265AAD", hover_color="#73A7FC",
+                               command=load_more)
+        button.pack(pady=(6, 12))
 
     # --------------------------------------------------
+    @ui_task
     def show_notifications(self):
         self.clear()
         make_header(self.content, "Notifications", "Status updates and reminders.")
@@ -907,36 +1022,77 @@ class AdopterHomePage(ctk.CTkFrame):
             return
 
         try:
-            notifications = self.controller.list_notifications(user_id)
+            notifications = list((yield self.api.list_notifications(user_id)))
         except Exception as e:
             messagebox.showerror("Error", f"Unable to fetch notifications.\n{e}")
             return
+        # cards: id -> card frame; read: ids marked read since the page was loaded
+        state = {
+            "last_id": max((note.get("id") or 0 for note in notifications), default=0),
+            "empty": None,
+            "cards": {},
+            "read": set(),
+        }
+
+        def is_read(note):
+            return bool(note.get("is_read")) or note.get("id") in state["read"]
 
-        def refresh():
-            self.show_notifications()
+        def show_empty():
+            if not state["cards"] and state["empty"] is None:
+                state["empty"] = ctk.CTkLabel(scroll, text="No notifications yet.", font=("Georgia", 14), text_color="#666")
+                state["empty"].pack(pady=14)
 
+        def patch_read(note_id):
+            """
+            Redraw one card as read, in its place.
+            """
+            state["read"].add(note_id)
+            card = state["cards"].get(note_id)
+            note = next((n for n in notifications if n.get("id") == note_id), None)
+            if card is not None and note is not None:
+                render(note, before=card)
+                card.destroy()
+
+        def patch_removed(note_ids):
+            for note_id in note_ids:
+                card = state["cards"].pop(note_id, None)
+                if card is not None:
+                    card.destroy()
+            notifications[:] = [n for n in notifications if n.get("id") not in note_ids]
+            show_empty()
+
+        @self.tasks.task
         def mark_all():
-            for note in notifications:
+            for note in list(notifications):
+                if is_read(note):
+                    continue
                 try:
-                    self.controller.mark_notification_read(note.get("id"))
+                    yield self.api.mark_notification_read(note.get("id"), user_id=user_id)
                 except Exception:
                     continue
-            refresh()
+                patch_read(note.get("id"))
+            self.unread_badge.poll_now()
 
+        @self.tasks.task
         def clear_all():
             if not notifications:
                 return
             if not messagebox.askyesno("Clear Notifications", "Remove all notifications?"):
                 return
             try:
-                self.controller.clear_notifications(user_id)
+                yield self.api.clear_notifications(user_id)
             except Exception as e:
                 messagebox.showerror("Error", f"Unable to clear notifications.\n{e}")
                 return
-            refresh()
+            patch_removed({n.get("id") for n in notifications})
+            self.unread_badge.poll_now()
+
+        def check_new():
+            append_new()
+            self.unread_badge.poll_now()
 
         ctk.CTkButton(toolbar, text="Refresh", width=120, fg_color="#0B84FF", hover_color="#0861BD",
-                      text_color="white", command=refresh).pack(side="right", padx=6)
+                      text_color="white", command=check_new).pack(side="right", padx=6)
         ctk.CTkButton(toolbar, text="Mark All Read", width=140, fg_color="#1E63D1", hover_color="#174DA6",
                       text_color="white", command=mark_all).pack(side="right", padx=6)
         ctk.CTkButton(toolbar, text="Clear All", width=120, fg_color="#D64545", hover_color="#B53030",
@@ -945,28 +1101,32 @@ class AdopterHomePage(ctk.CTkFrame):
         scroll = ctk.CTkScrollableFrame(container, fg_color="white")
         scroll.pack(fill="both", expand=True, padx=10, pady=10)
 
-        if not notifications:
-            ctk.CTkLabel(scroll, text="No notifications yet.", font=("Georgia", 14), text_color="#666").pack(pady=14)
-            return
-
+        @self.tasks.task
         def mark_one(note_id):
             try:
-                self.controller.mark_notification_read(note_id)
-                refresh()
+                yield self.api.mark_notification_read(note_id, user_id=user_id)
+                patch_read(note_id)
+                self.unread_badge.poll_now()
             except Exception as e:
                 messagebox.showerror("Error", f"Unable to mark notification.\n{e}")
 
+        @self.tasks.task
         def remove_one(note_id):
             try:
-                self.controller.delete_notification(note_id)
-                refresh()
+                yield self.api.delete_notification(note_id, user_id=user_id)
+                patch_removed({note_id})
+                self.unread_badge.poll_now()
             except Exception as e:
                 messagebox.showerror("Error", f"Unable to remove notification.\n{e}")
 
-        for note in notifications:
-            bg = "#eef2ff" if not note.get("is_read") else "#f8fafc"
+        def render(note, before=None):
+            bg = "#eef2ff" if not is_read(note) else "#f8fafc"
             card = ctk.CTkFrame(scroll, fg_color=bg, corner_radius=12, border_width=1, border_color="#E5E7EB")
-            card.pack(fill="x", padx=8, pady=6)
+            if before is not None:
+                card.pack(fill="x", padx=8, pady=6, before=before)
+            else:
+                card.pack(fill="x", padx=8, pady=6)
+            state["cards"][note.get("id")] = card
 
             ctk.CTkLabel(
                 card,
@@ -985,7 +1145,7 @@ class AdopterHomePage(ctk.CTkFrame):
             btns = ctk.CTkFrame(card, fg_color=bg)
             btns.pack(anchor="e", padx=10, pady=(0, 10))
 
-            if not note.get("is_read"):
+            if not is_read(note):
                 ctk.CTkButton(
                     btns,
                     text="Mark as Read",
@@ -1002,8 +1162,40 @@ class AdopterHomePage(ctk.CTkFrame):
                 hover_color="#B53030",
                 command=lambda nid=note.get("id"): remove_one(nid),
             ).pack(side="left", padx=5)
+            return card
+
+        @self.tasks.task
+        def append_new():
+            """
+            Add only notifications newer than the last one shown, newest on top.
+            """
+            try:
+                if not scroll.winfo_exists():
+                    return
+                fresh = yield self.api.get_notifications_since(user_id, state["last_id"])
+            except Exception:
+                return
+            # Two overlapping polls can return the same rows; only keep what is still new
+            fresh = [note for note in fresh if (note.get("id") or 0) > state["last_id"]]
+            if not fresh:
+                return
+            if state["empty"] is not None:
+                state["empty"].destroy()
+                state["empty"] = None
+            top = next(iter(scroll.winfo_children()), None)
+            for note in fresh:
+                top = render(note, before=top)
+            notifications.extend(fresh)
+            state["last_id"] = max(note.get("id") or 0 for note in fresh)
+
+        for note in notifications:
+            render(note)
+        show_empty()
+        self._notification_appender = append_new
+        self.unread_badge.poll_now()
 
     # --------------------------------------------------
+    @ui_task
     def show_history(self):
         self.clear()
         make_header(self.content, "Adoption History", "Your adopted pets and their details.")
@@ -1052,7 +1244,7 @@ class AdopterHomePage(ctk.CTkFrame):
 
         user_id = self._get_user_id()
         try:
-            hist = self.controller.adoption_history(user_id, self.history_category_filter)
+            hist = yield self.api.adoption_history(user_id, self.history_category_filter)
         except Exception:
             hist = []
 
@@ -1256,6 +1448,7 @@ class AdopterHomePage(ctk.CTkFrame):
             entries[key] = entry
             entry.pack(padx=40, pady=5)
 
+        @self.tasks.task
         def save_profile():
             if not user_id:
                 messagebox.showerror("Error", "Missing user id. Please log in again.")
@@ -1266,7 +1459,7 @@ class AdopterHomePage(ctk.CTkFrame):
             if age_raw.lower() in ("none", "n/a", "na", "unknown"):
                 age_raw = ""
             try:
-                updated = self.controller.update_profile(
+                updated = yield self.api.update_profile(
                     user_id,
                     entries["name"].get().strip(),
                     entries["email"].get().strip(),
@@ -1285,6 +1478,7 @@ class AdopterHomePage(ctk.CTkFrame):
         actions.pack(fill="x", padx=30, pady=(20, 10))
         ctk.CTkButton(actions, text="Save Profile", fg_color="#1E40AF", hover_color="#1E3A8A", width=180, height=40, command=save_profile).pack(side="right", padx=(0, 8), pady=4)
 
+        @self.tasks.task
         def delete_account():
             if not messagebox.askyesno("Delete Account", "Delete your adopter account? This cannot be undone."):
                 return
@@ -1293,7 +1487,7 @@ class AdopterHomePage(ctk.CTkFrame):
                 return
             img_path = user.get("photo_path") or user.get("image") or ""
             try:
-                self.controller.delete_account(user_id, img_path)
+                yield self.api.delete_account(user_id, img_path)
                 messagebox.showinfo("Deleted", "Your account was deleted.")
                 self.app.logout()
             except Exception as e:
@@ -1563,6 +1757,7 @@ class AdopterHomePage(ctk.CTkFrame):
         messagebox.showinfo("Saved", f"Adoption form saved to:\n{save_path}")
 
     # --------------------------------------------------
+    @ui_task
     def show_about(self):
         self.clear()
         hero = ctk.CTkFrame(self.content, fg_color="#00156A")
@@ -1589,7 +1784,7 @@ class AdopterHomePage(ctk.CTkFrame):
         )
 
         try:
-            admins = self.controller.admin_profiles()
+            admins = yield self.api.admin_profiles()
         except Exception:
             admins = []
 
@@ -1703,11 +1898,12 @@ class AdopterHomePage(ctk.CTkFrame):
         stars_frame.pack(pady=10)
         rating_var = ctk.StringVar(value="0")
 
+        @self.tasks.task
         def rate(n):
             rating_var.set(str(n))
             messagebox.showinfo("Thank you!", f"You rated us {n} stars!")
             try:
-                self.controller.notify_admins_rating(n)
+                yield self.api.submit_rating(self._get_user_id(), n)
             except Exception:
                 pass
 
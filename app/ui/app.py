@@ -1,6 +1,9 @@
 import customtkinter as ctk
 
-from app.config import APP_TITLE, WINDOW_SIZE, BG_COLOR
+from app.config import APP_MODE, APP_TITLE, WINDOW_SIZE, BG_COLOR, WRITE_QUEUE_ENABLED
+from app.api.client import default_client
+from app.controllers import async_controller
+from app.models import database, maintenance
 from app.views.login import LoginPage
 from app.ui.admin_pages import AdminHomePage
 from app.ui.adopter_pages import AdopterHomePage
@@ -41,6 +44,10 @@ class App(ctk.CTk):
         self.build_pages()
         self.show_page("login")
 
+        # Background maintenance waits for the UI to go idle
+        for sequence in ("<KeyPress>", "<ButtonPress>", "<Motion>", "<MouseWheel>"):
+            self.bind_all(sequence, lambda _e: maintenance.note_activity(), add="+")
+
     def build_pages(self):
         self.pages["login"] = LoginPage(self.container, self)
         self.pages["admin_home"] = AdminHomePage(self.container, self)
@@ -76,9 +83,30 @@ class App(ctk.CTk):
 
     def logout(self):
         self.current_user = None
+        if APP_MODE == "remote":
+            try:
+                default_client().logout()
+            except OSError:
+                pass
         self.show_page("login")
 
 
 def run_app():
+    # In remote mode the API server owns the database; this process never opens it.
+    local = APP_MODE != "remote"
+    if local:
+        # Upgrade legacy databases before any screen queries them.
+        database.migrate()
+        if WRITE_QUEUE_ENABLED:
+            database.start_writer()
+        maintenance.start()
     app = App()
-    app.mainloop()
+    try:
+        app.mainloop()
+    finally:
+        async_controller.shutdown()
+        if local:
+            database.stop_writer()
+            maintenance.stop()
+            if database.profiling_enabled():
+                print(database.format_stats())
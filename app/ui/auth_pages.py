@@ -2,14 +2,14 @@
 import customtkinter as ctk
 from tkinter import messagebox
 
-from app.controllers import AuthController
+from app.api import controller_for
 
 
 class LoginPage(ctk.CTkFrame):
     def __init__(self, master, app):
         super().__init__(master)
         self.app = app
-        self.auth = AuthController()
+        self.auth = controller_for("auth")
 
         self.pack(fill="both", expand=True)
         self.configure(fg_color="white")
@@ -87,4 +87,4 @@ class LoginPage(ctk.CTkFrame):
         if user.get("role") == "admin":
             self.app.show_page("admin_home")
         else:
-            self.app.show_page("adopter_home")
+            self.app.show_page("adopter_home")
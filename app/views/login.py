@@ -3,7 +3,7 @@ from tkinter import filedialog, messagebox
 import customtkinter as ctk
 
 from app.config import APP_TITLE, BG_COLOR
-from app.controllers.auth_controller import AuthController
+from app.api import controller_for
 from app.widgets.images import safe_ctk_image
 
 
@@ -16,7 +16,7 @@ class LoginPage(ctk.CTkFrame):
     def __init__(self, master, app):
         super().__init__(master, fg_color=BG_COLOR)
         self.app = app
-        self.auth = AuthController()
+        self.auth = controller_for("auth")
         self.reset_target = {}  # {"email":..., "role":...}
 
         # Images (loaded safely)
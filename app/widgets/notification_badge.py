@@ -0,0 +1,98 @@
+from concurrent.futures import Future
+from typing import Callable, Optional, Union
+
+
+class UnreadBadge:
+    """
+    Show an unread count on a sidebar button, polling `count_fn` on the Tk event loop.
+    count_fn may return the count or a Future of it (e.g. from AsyncController);
+    futures are awaited with after() so the event loop never blocks on the query.
+    The poll interval doubles while the count stays the same (up to max_interval_ms)
+    and drops back to interval_ms as soon as it changes. on_change gets the new count
+    when it changes; on_poll gets it after every poll, changed or not.
+    """
+
+    AWAIT_MS = 50
+
+    def __init__(
+        self,
+        button,
+        label: str,
+        count_fn: Callable[[], Union[int, Future]],
+        on_change: Optional[Callable[[int], None]] = None,
+        on_poll: Optional[Callable[[int], None]] = None,
+        interval_ms: int = 5000,
+        max_interval_ms: int = 60000,
+    ):
+        self.button = button
+        self.label = label
+        self.count_fn = count_fn
+        self.on_change = on_change
+        self.on_poll = on_poll
+        self.interval_ms = interval_ms
+        self.max_interval_ms = max_interval_ms
+        self._delay = interval_ms
+        self._count = None
+        self._job = None
+
+    def poll_now(self):
+        """
+        Poll immediately (e.g. after marking notifications read) and restart the backoff.
+        """
+        self.stop()
+        self._delay = self.interval_ms
+        self._tick()
+
+    def stop(self):
+        if self._job is not None:
+            try:
+                self.button.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def _tick(self):
+        self._job = None
+        try:
+            if not self.button.winfo_exists():
+                return
+        except Exception:
+            return
+        try:
+            count = self.count_fn()
+        except Exception:
+            count = self._count
+        if isinstance(count, Future):
+            self._job = self.button.after(self.AWAIT_MS, lambda: self._await(count))
+            return
+        self._apply(count)
+
+    def _await(self, future: Future):
+        self._job = None
+        if not future.done():
+            self._job = self.button.after(self.AWAIT_MS, lambda: self._await(future))
+            return
+        try:
+            count = future.result()
+        except Exception:
+            count = self._count
+        self._apply(count)
+
+    def _apply(self, count):
+        try:
+            if not self.button.winfo_exists():
+                return
+        except Exception:
+            return
+        if count != self._count:
+            changed = self._count is not None
+            self._count = count
+            self.button.configure(text=f"{self.label} ({count})" if count else self.label)
+            self._delay = self.interval_ms
+            if changed and self.on_change:
+                self.on_change(count)
+        else:
+            self._delay = min(self._delay * 2, self.max_interval_ms)
+        if self.on_poll:
+            self.on_poll(count)
+        self._job = self.button.after(self._delay, self._tick)
@@ -0,0 +1,128 @@
+"""
+Run UI flows written as generators without blocking the Tk event loop.
+
+A task yields Futures (usually from AsyncController). The runner polls them with
+after() and resumes the generator on the Tk thread with the result, or throws the
+worker's exception into it, so ordinary try/except blocks around a yield still work:
+
+    @ui_task
+    def show_requests(self):
+        rows = yield self.api.list_requests()
+"""
+
+import functools
+import inspect
+import logging
+from concurrent.futures import Future
+
+POLL_MS = 15
+
+logger = logging.getLogger(__name__)
+
+
+class TaskRunner:
+    """
+    Drives generator tasks for one page. Tasks are tied to the current view;
+    new_view() (called when the page clears its content) drops the remaining
+    steps of tasks started for the previous screen. An exception a task does not
+    catch is logged with its traceback and passed to on_error(exc), so the page
+    can show it instead of leaving a blank screen.
+    """
+
+    def __init__(self, widget, on_busy=None, on_error=None):
+        self.widget = widget
+        self.on_busy = on_busy
+        self.on_error = on_error
+        self.view = 0
+        self._pending = 0
+
+    def new_view(self):
+        self.view += 1
+
+    def spawn(self, result, scoped=True):
+        """
+        Start a task from a generator; any other value is returned unchanged.
+        """
+        if not inspect.isgenerator(result):
+            return result
+        self._step(result, self.view if scoped else None, None, None)
+        return None
+
+    def task(self, fn):
+        """
+        Decorator for nested callbacks: calling the result starts fn as a task.
+        """
+        @functools.wraps(fn)
+        def start(*args, **kwargs):
+            return self.spawn(fn(*args, **kwargs))
+
+        return start
+
+    def _step(self, gen, view, value, error):
+        while True:
+            if view is not None and view != self.view:
+                gen.close()
+                return
+            try:
+                yielded = gen.throw(error) if error is not None else gen.send(value)
+            except StopIteration:
+                return
+            except Exception as e:
+                logger.exception("UI task %s failed", getattr(gen, "__qualname__", gen))
+                self._report(e)
+                return
+            if isinstance(yielded, Future):
+                self._wait(gen, view, yielded)
+                return
+            # Plain values are handed straight back
+            value, error = yielded, None
+
+    def _wait(self, gen, view, future):
+        self._set_busy(1)
+
+        def poll():
+            if not future.done():
+                self._after(poll)
+                return
+            self._set_busy(-1)
+            try:
+                value, error = future.result(), None
+            except Exception as e:
+                value, error = None, e
+            self._step(gen, view, value, error)
+
+        self._after(poll)
+
+    def _after(self, callback):
+        try:
+            self.widget.after(POLL_MS, callback)
+        except Exception:
+            # Widget destroyed (e.g. page rebuilt on login); drop the continuation
+            pass
+
+    def _report(self, error):
+        if self.on_error:
+            try:
+                self.on_error(error)
+            except Exception:
+                logger.exception("UI task error handler failed")
+
+    def _set_busy(self, delta):
+        was_busy = self._pending > 0
+        self._pending += delta
+        if self.on_busy and was_busy != (self._pending > 0):
+            try:
+                self.on_busy(self._pending > 0)
+            except Exception:
+                pass
+
+
+def ui_task(method):
+    """
+    Decorator for page methods whose body yields futures; runs them on `self.tasks`.
+    """
+    @functools.wraps(method)
+    def start(self, *args, **kwargs):
+        return self.tasks.spawn(method(self, *args, **kwargs))
+
+    return start
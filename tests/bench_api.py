@@ -0,0 +1,184 @@
+"""
+Load generator for the API server: concurrent keep-alive clients, requests per second
+and latency percentiles.
+
+Without --url a server is started on a copy of fureverhome.db (python -m app.api.server
+in a subprocess, so the clients do not share its interpreter), with one bench admin and
+one bench adopter added to the copy. Each client signs in as both, then loops over a mix
+of controller calls and a conditional photo GET, the way a workstation browsing the pet
+list would.
+
+Run from the repo root: python tests/bench_api.py [--clients N] [--seconds S] [--target-rps R]
+                        [--url URL --admin EMAIL:PASSWORD --adopter EMAIL:PASSWORD]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+
+BENCH_ADMIN = "bench-admin@example.com:benchpw1"
+BENCH_ADOPTER = "bench-adopter@example.com:benchpw1"
+
+# (method, path, body, session role); "{adopter_id}" is filled in after signing in
+MIX = (
+    ("POST", "/api/adopter/list_pets", {}, "adopter"),
+    ("POST", "/api/adopter/request_counts", {"kwargs": {"adopter_id": "{adopter_id}"}}, "adopter"),
+    ("POST", "/api/admin/dashboard_snapshot", {}, "admin"),
+    ("GET", "/health", None, None),
+)
+
+
+async def request(reader, writer, method, path, body=None, headers=None):
+    data = json.dumps(body).encode() if body is not None else b""
+    lines = [f"{method} {path} HTTP/1.1", "Host: bench", f"Content-Length: {len(data)}"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + data)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    response_headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        response_headers[name.strip().lower()] = value.strip()
+    length = int(response_headers.get("content-length", 0))
+    data = await reader.readexactly(length) if length and status != 304 else b""
+    return status, response_headers, data
+
+
+async def sign_in(reader, writer, role, credentials):
+    email, password = credentials.split(":", 1)
+    body = {"kwargs": {"email": email, "password": password, "role_key": role}}
+    status, headers, data = await request(reader, writer, "POST", "/api/auth/login", body)
+    if status != 200:
+        raise SystemExit(f"{role} sign-in failed: {data[:200]!r}")
+    user = json.loads(data)["result"]
+    return headers["x-session"], user.get("id") if role == "admin" else user.get("users_id")
+
+
+async def client(host, port, photo, deadline, logins, latencies, failures):
+    reader, writer = await asyncio.open_connection(host, port)
+    sessions, ids = {}, {}
+    for role, credentials in logins.items():
+        sessions[role], ids[role] = await sign_in(reader, writer, role, credentials)
+    mix = [
+        (method, path, json.loads(json.dumps(body).replace('"{adopter_id}"', str(ids["adopter"]))), role)
+        for method, path, body, role in MIX
+    ]
+    if photo:
+        mix.append(("GET", f"/photos/{photo}", None, None))
+    etag = None
+    try:
+        for method, path, body, role in itertools.cycle(mix):
+            if time.perf_counter() >= deadline:
+                break
+            headers = {"X-Session": sessions[role]} if role else {}
+            if etag and path.startswith("/photos/"):
+                headers["If-None-Match"] = etag
+            start = time.perf_counter()
+            status, response_headers, _ = await request(reader, writer, method, path, body, headers)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                failures.append((path, status))
+            elif path.startswith("/photos/"):
+                etag = response_headers.get("etag", etag)
+    finally:
+        writer.close()
+
+
+async def run(url, clients, seconds, photo, logins):
+    parts = urlsplit(url)
+    latencies, failures = [], []
+    started = time.perf_counter()
+    deadline = started + seconds
+    await asyncio.gather(*(
+        client(parts.hostname, parts.port, photo, deadline, logins, latencies, failures) for _ in range(clients)
+    ))
+    return latencies, failures, time.perf_counter() - started
+
+
+def add_bench_accounts(db):
+    admin_email, admin_password = BENCH_ADMIN.split(":", 1)
+    adopter_email, adopter_password = BENCH_ADOPTER.split(":", 1)
+    with sqlite3.connect(db) as conn:
+        conn.execute("INSERT INTO admin (name, email, password) VALUES ('Bench Admin', ?, ?)", (admin_email, admin_password))
+        conn.execute(
+            "INSERT INTO users (name, email, password, role) VALUES ('Bench Adopter', ?, ?, 'adopter')",
+            (adopter_email, adopter_password),
+        )
+    conn.close()
+
+
+def start_server(tmp, workers):
+    db = Path(tmp) / "bench.db"
+    shutil.copy2(ROOT / "fureverhome.db", db)
+    add_bench_accounts(db)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "app.api.server", "--db", str(db), "--port", "0",
+         "--workers", str(workers), "--no-maintenance"],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True,
+    )
+    line = proc.stdout.readline()
+    if "listening on" not in line:
+        proc.kill()
+        raise SystemExit(f"server did not start: {line!r}")
+    return proc, line.rsplit(" ", 1)[1].strip()
+
+
+def first_photo():
+    images = sorted(p.name for p in (ROOT / "images").glob("*") if p.is_file()) if (ROOT / "images").is_dir() else []
+    return images[0] if images else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API server load generator")
+    parser.add_argument("--url", help="benchmark a running server instead of starting one")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--workers", type=int, default=8, help="server worker threads (started server only)")
+    parser.add_argument("--target-rps", type=float, help="exit 1 if throughput is below this")
+    parser.add_argument("--admin", default=BENCH_ADMIN, help="EMAIL:PASSWORD to sign in as admin (with --url)")
+    parser.add_argument("--adopter", default=BENCH_ADOPTER, help="EMAIL:PASSWORD to sign in as adopter (with --url)")
+    args = parser.parse_args()
+    logins = {"admin": args.admin, "adopter": args.adopter}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        proc = None
+        url = args.url
+        if url is None:
+            proc, url = start_server(tmp, args.workers)
+        try:
+            latencies, failures, elapsed = asyncio.run(run(url, args.clients, args.seconds, first_photo(), logins))
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait(10)
+
+    rps = len(latencies) / elapsed
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"{args.clients} clients, {len(latencies)} requests in {elapsed:.1f}s, {len(failures)} failed")
+    print(f"throughput {rps:8.0f} req/s")
+    print(f"latency    p50 {cuts[49] * 1000:.1f}ms  p95 {cuts[94] * 1000:.1f}ms  p99 {cuts[98] * 1000:.1f}ms")
+    if failures:
+        print(f"first failure: {failures[0]}")
+    if args.target_rps and rps < args.target_rps:
+        print(f"below target of {args.target_rps:.0f} req/s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
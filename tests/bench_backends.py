@@ -0,0 +1,64 @@
+"""
+Isolated database instances per second for each storage backend.
+
+Each instance is what a test gets in setUp: a fresh database switched in with
+database.use_backend(), one query through the helpers, then closed. "file copy" is the
+old setup_temp_db (copy fureverhome.db into a temp dir).
+
+Run from the repo root: python tests/bench_backends.py [instances]
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.models import database, storage
+
+SEED = ROOT / "fureverhome.db"
+
+
+def file_copy():
+    tmpdir = tempfile.TemporaryDirectory()
+    path = Path(tmpdir.name) / "test.db"
+    shutil.copy2(SEED, path)
+    backend = storage.FileBackend(path)
+    backend.close = tmpdir.cleanup
+    return backend
+
+
+FACTORIES = (
+    ("memory (seeded)", lambda: storage.MemoryBackend(seed=SEED)),
+    ("memory (schema)", lambda: storage.MemoryBackend()),
+    ("ramdisk copy", lambda: storage.RamDiskBackend(SEED)),
+    ("file copy", file_copy),
+)
+
+
+def per_second(factory, instances):
+    start = time.perf_counter()
+    for _ in range(instances):
+        backend = factory()
+        database.use_backend(backend)
+        database.get_available_pets()
+        database.close_connections()
+        backend.close()
+    return instances / (time.perf_counter() - start)
+
+
+def main():
+    instances = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print(f"{instances} instances each\n")
+    for label, factory in FACTORIES:
+        # Warm-up builds the cached seed snapshot outside the timed loop
+        per_second(factory, 1)
+        print(f"{label:<16} {per_second(factory, instances):8.0f} instances/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Per-call cost of hot lookups with and without the statement cache sized to the catalog.
+
+Each round runs the lookup, then `working_set` other distinct statements, the way the
+app interleaves screens. With sqlite3's default of 128 cached statements a working set
+that large evicts the lookup, so it is re-prepared on every call.
+
+Run from the repo root: python tests/bench_queries.py [calls] [working_set]
+"""
+
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.models import queries, storage
+
+LOOKUPS = (
+    ("has_pending_request", queries.HAS_PENDING_REQUEST, (1, 1)),
+    ("pet by id", queries.PET_BY_ID, (1,)),
+    ("count_unread", queries.COUNT_UNREAD, ("adopter", 1)),
+)
+
+
+def per_call(conn, sql, params, calls, working_set):
+    others = [f"SELECT {n} FROM pets LIMIT 0" for n in range(working_set)]
+    elapsed = 0.0
+    for _ in range(calls):
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        elapsed += time.perf_counter() - start
+        for other in others:
+            conn.execute(other).fetchall()
+    return elapsed / calls * 1e6
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    working_set = int(sys.argv[2]) if len(sys.argv) > 2 else 150
+    backend = storage.MemoryBackend(seed=ROOT / "fureverhome.db")
+    target, uri = backend.target()
+    try:
+        sizes = (("no cache", 0), ("default 128", 128), (f"catalog {queries.STATEMENT_CACHE_SIZE}", queries.STATEMENT_CACHE_SIZE))
+        print(f"{calls} calls, {working_set} other statements between calls\n")
+        for label, sql, params in LOOKUPS:
+            results = []
+            for name, size in sizes:
+                conn = sqlite3.connect(target, uri=uri, cached_statements=size)
+                results.append((name, per_call(conn, sql, params, calls, working_set)))
+                conn.close()
+            cells = "  ".join(f"{name}: {us:6.2f} us" for name, us in results)
+            print(f"{label:<20} {cells}")
+    finally:
+        backend.close()
+
+
+if __name__ == "__main__":
+    main()
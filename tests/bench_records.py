@@ -0,0 +1,80 @@
+"""
+Memory/time comparison of dict rows vs record rows for 100k query results.
+
+Run from the repo root: python tests/bench_records.py [rows]
+"""
+
+import sqlite3
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.models.records import PetRecord, RequestRecord
+
+
+def build_db(rows):
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE pets (pet_id INTEGER PRIMARY KEY, name TEXT, category TEXT, breed TEXT, age INTEGER, "
+        "sex TEXT, vaccinated TEXT, status TEXT, description TEXT, photo_path TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO pets (name, category, breed, age, sex, vaccinated, status, description, photo_path) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (f"Pet {n}", "dog", "aspin", n % 15, "male", "yes", "available", f"Friendly pet number {n}", f"pet{n}.jpg")
+            for n in range(rows)
+        ),
+    )
+    return conn
+
+
+PET_SQL = "SELECT pet_id, name, category, breed, age, sex, vaccinated, status, description, photo_path FROM pets"
+REQUEST_SQL = (
+    "SELECT pet_id, pet_id, pet_id, status, status, description, name, photo_path, name, sex, "
+    "name, photo_path, vaccinated, status, category, breed, age, sex FROM pets"
+)
+
+
+def as_dicts(conn, sql, record):
+    # The old helpers also resolved image paths per row and stored them in every dict.
+    return [record.row_factory(None, row).to_dict() for row in conn.execute(sql)]
+
+
+def as_records(conn, sql, record):
+    cur = conn.cursor()
+    cur.row_factory = record.row_factory
+    return cur.execute(sql).fetchall()
+
+
+def measure(label, build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = build()
+    elapsed = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {len(rows):>7} rows  {current / 1024 / 1024:8.1f} MiB  {elapsed * 1000:8.1f} ms")
+    del rows
+    return current
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    conn = build_db(rows)
+    for name, sql, record in (("pets", PET_SQL, PetRecord), ("requests", REQUEST_SQL, RequestRecord)):
+        dict_bytes = measure(f"{name} as dicts", lambda: as_dicts(conn, sql, record))
+        record_bytes = measure(f"{name} as records", lambda: as_records(conn, sql, record))
+        saved = dict_bytes - record_bytes
+        print(f"{name}: saved {saved / 1024 / 1024:.1f} MiB ({saved / rows:.0f} bytes/row, "
+              f"{saved / dict_bytes:.0%})\n")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,4 @@
-import shutil
-import sqlite3
 import sys
-import tempfile
 from pathlib import Path
 import unittest
 
@@ -10,25 +7,20 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from app.controllers import AdminController
-from app.models import database
+from app.models import database, storage
 
 
-def setup_temp_db():
-    tmpdir = tempfile.TemporaryDirectory()
-    db_path = Path(tmpdir.name) / "test.db"
-    shutil.copy2("fureverhome.db", db_path)
-    database.DB_PATH = str(db_path)
-    database._ADOPTION_INFO_COLUMN = None
-    database._ADOPTION_HISTORY_ENSURED = False
-    database._SOCIAL_COLUMNS_ENSURED = False
-    return tmpdir, db_path
+def setup_memory_db():
+    backend = storage.MemoryBackend(seed=ROOT / "fureverhome.db")
+    database.use_backend(backend)
+    return backend
 
 
 class AdminControllerTests(unittest.TestCase):
     def setUp(self):
-        self.tmpdir, db_path = setup_temp_db()
+        self.backend = setup_memory_db()
         # Seed at least one cat so category filter always has data
-        conn = sqlite3.connect(db_path)
+        conn = database.connect()
         cur = conn.cursor()
         cur.execute(
             """
@@ -69,7 +61,8 @@ class AdminControllerTests(unittest.TestCase):
         self.ctrl = AdminController()
 
     def tearDown(self):
-        self.tmpdir.cleanup()
+        database.close_connections()
+        self.backend.close()
 
     def test_list_pets_filters_category(self):
         cats = self.ctrl.list_pets("cat")
@@ -81,6 +74,60 @@ class AdminControllerTests(unittest.TestCase):
         self.assertTrue(len(dogs) > 0)
         self.assertTrue(all((row.get("category") or "").lower() == "dog" for row in dogs))
 
+    def test_list_requests_filters_status_in_sql(self):
+        pets = self.ctrl.list_pets()[:3]
+        for pet in pets:
+            database.submit_adoption_request(1, pet["id"], "note")
+        pending = self.ctrl.list_requests("Pending")
+        database.decline_request(pending[0]["id"], "no yard")
+        database.approve_request(pending[1]["id"])
+
+        rejected = self.ctrl.list_requests("Rejected")
+        self.assertEqual([r["id"] for r in rejected], [pending[0]["id"]])
+        self.assertTrue(all(r["status"] == "pending" for r in self.ctrl.list_requests("Pending")))
+
+        counts = self.ctrl.request_counts()
+        self.assertEqual(counts["rejected"], 1)
+        self.assertEqual(counts["all"], len(self.ctrl.list_requests("All")))
+
+    def test_history_counts_by_category(self):
+        counts = self.ctrl.history_counts()
+        self.assertEqual(counts["dog"], len(self.ctrl.adoption_history("dog")))
+        self.assertEqual(counts["all"], len(self.ctrl.adoption_history()))
+
+    def test_bulk_approve_and_decline(self):
+        pets = self.ctrl.list_pets()[:4]
+        for pet in pets:
+            database.submit_adoption_request(1, pet["id"], "bulk")
+        ids = [r["id"] for r in self.ctrl.list_requests("Pending")]
+        before = len(database.get_notifications_for_user(1, role="adopter"))
+
+        approved = self.ctrl.approve_requests(ids[:2])
+        declined = self.ctrl.decline_requests(ids[2:], "Filled")
+
+        self.assertEqual(len(approved), 2)
+        self.assertEqual(len(declined), len(ids) - 2)
+        self.assertEqual(self.ctrl.list_requests("Pending"), [])
+        notes = database.get_notifications_for_user(1, role="adopter")
+        self.assertEqual(len(notes) - before, len(ids))
+        adopted = {row["pet_id"] for row in approved}
+        self.assertTrue(all(database.get_pet_by_id(pid)["status"] == "adopted" for pid in adopted))
+
+    def test_bulk_add_and_delete_pets(self):
+        count = self.ctrl.add_pets(
+            [
+                {"name": f"Bulk {n}", "category": "Dog", "breed": "mix", "age": 2, "sex": "male"}
+                for n in range(3)
+            ]
+        )
+        self.assertEqual(count, 3)
+        bulk = [p for p in self.ctrl.list_pets("dog") if p["name"].startswith("Bulk ")]
+        self.assertEqual(len(bulk), 3)
+        self.ctrl.delete_pets([p["id"] for p in bulk])
+        self.assertFalse(any(p["name"].startswith("Bulk ") for p in self.ctrl.list_pets()))
+        with self.assertRaises(ValueError):
+            self.ctrl.add_pets([{"name": "No Age", "category": "cat", "breed": "mix", "sex": "female"}])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,4 @@
-import shutil
-import sqlite3
 import sys
-import tempfile
 from pathlib import Path
 import unittest
 
@@ -10,25 +7,20 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from app.controllers import AdopterController
-from app.models import database
+from app.models import database, storage
 
 
-def setup_temp_db():
-    tmpdir = tempfile.TemporaryDirectory()
-    db_path = Path(tmpdir.name) / "test.db"
-    shutil.copy2("fureverhome.db", db_path)
-    database.DB_PATH = str(db_path)
-    database._ADOPTION_INFO_COLUMN = None
-    database._ADOPTION_HISTORY_ENSURED = False
-    database._SOCIAL_COLUMNS_ENSURED = False
-    return tmpdir, db_path
+def setup_memory_db():
+    backend = storage.MemoryBackend(seed=ROOT / "fureverhome.db")
+    database.use_backend(backend)
+    return backend
 
 
 class AdopterControllerTests(unittest.TestCase):
     def setUp(self):
-        self.tmpdir, self.db_path = setup_temp_db()
+        self.backend = setup_memory_db()
         # make sure at least one dog is available for list_pets("dog") tests
-        conn = sqlite3.connect(self.db_path)
+        conn = database.connect()
         cur = conn.cursor()
         cur.execute("UPDATE pets SET status='available' WHERE pet_id=1")
         # seed a cat adoption history entry for a known adopter
@@ -60,7 +52,8 @@ class AdopterControllerTests(unittest.TestCase):
         self.history_user_id = adopter_id
 
     def tearDown(self):
-        self.tmpdir.cleanup()
+        database.close_connections()
+        self.backend.close()
 
     def test_list_pets_filters_category(self):
         dogs = self.ctrl.list_pets("dog")
@@ -74,7 +67,7 @@ class AdopterControllerTests(unittest.TestCase):
 
     def test_update_profile_persists(self):
         # add a test user
-        conn = sqlite3.connect(self.db_path)
+        conn = database.connect()
         cur = conn.cursor()
         cur.execute(
             """
@@ -98,7 +91,7 @@ class AdopterControllerTests(unittest.TestCase):
         )
         self.assertEqual(updated["name"], "Temp User Updated")
         # verify DB
-        conn = sqlite3.connect(self.db_path)
+        conn = database.connect()
         cur = conn.cursor()
         cur.execute("SELECT name, phone_number, age FROM users WHERE users_id=?", (user_id,))
         row = cur.fetchone()
@@ -107,9 +100,27 @@ class AdopterControllerTests(unittest.TestCase):
         self.assertEqual(row[1], "999")
         self.assertEqual(row[2], 21)
 
+    def _notification_count(self):
+        conn = database.connect()
+        count = conn.execute("SELECT COUNT(*) FROM notifications").fetchone()[0]
+        conn.close()
+        return count
+
+    def test_submit_rating_updates_summary(self):
+        notes_before = self._notification_count()
+        for stars in (5, 4, 4):
+            self.ctrl.submit_rating(self.history_user_id, stars)
+        with self.assertRaises(ValueError):
+            self.ctrl.submit_rating(self.history_user_id, 6)
+        summary = database.get_rating_summary()
+        self.assertEqual(summary["total"], 3)
+        self.assertAlmostEqual(summary["average"], 13 / 3)
+        self.assertEqual(summary["counts"], {1: 0, 2: 0, 3: 0, 4: 2, 5: 1})
+        self.assertEqual(self._notification_count(), notes_before)
+
     def test_delete_account_removes_user_and_requests(self):
         # create user + pending request
-        conn = sqlite3.connect(self.db_path)
+        conn = database.connect()
         cur = conn.cursor()
         cur.execute(
             """
@@ -128,7 +139,7 @@ class AdopterControllerTests(unittest.TestCase):
 
         self.ctrl.delete_account(user_id, "")
 
-        conn = sqlite3.connect(self.db_path)
+        conn = database.connect()
         cur = conn.cursor()
         cur.execute("SELECT 1 FROM users WHERE users_id=?", (user_id,))
         user_row = cur.fetchone()
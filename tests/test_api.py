@@ -0,0 +1,226 @@
+import shutil
+import socket
+import sys
+import tempfile
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.api import protocol
+from app.api.client import ApiClient, RemoteController
+from app.api.server import ApiServer
+from app.controllers import AdminController, AdopterController
+from app.models import database
+
+
+class ApiServerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        tmp = Path(self.tmpdir.name)
+        shutil.copy2(ROOT / "fureverhome.db", tmp / "test.db")
+        database.DB_PATH = str(tmp / "test.db")
+        database.migrate()
+        with database.connection() as conn:
+            self.admin_id = conn.execute(
+                "INSERT INTO admin (name, email, password) VALUES ('Api Admin', 'api-admin@test.com', 'secret12')"
+            ).lastrowid
+            self.adopter_id = conn.execute(
+                "INSERT INTO users (name, email, password, role) VALUES ('Api Adopter', 'api-user@test.com', 'secret12', 'adopter')"
+            ).lastrowid
+        self.server_images = tmp / "server-images"
+        self.server_images.mkdir()
+        (self.server_images / "rex.png").write_bytes(b"\x89PNG fake image")
+        self.server = ApiServer(host="127.0.0.1", port=0, token="", workers=2, images_dir=self.server_images)
+        self.server.start_in_thread()
+        self.client = ApiClient(f"http://127.0.0.1:{self.server.port}", token="", photo_dir=tmp / "client-images")
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+        database.close_connections()
+        self.tmpdir.cleanup()
+
+    def _sign_in(self, role):
+        email = "api-admin@test.com" if role == "admin" else "api-user@test.com"
+        RemoteController("auth", self.client).login(email, "secret12", role)
+        return RemoteController(role, self.client)
+
+    def _post(self, path, kwargs):
+        status, _, body = self.client.request("POST", path, protocol.dumps({"kwargs": kwargs}))
+        return status, protocol.loads(body)
+
+    def test_remote_calls_match_local_results(self):
+        remote = self._sign_in("adopter")
+        local = AdopterController()
+        names = [pet["name"] for pet in remote.list_pets()]
+        self.assertEqual(names, [pet["name"] for pet in local.list_pets()])
+        self.assertEqual(remote.request_counts(adopter_id=self.adopter_id), local.request_counts(self.adopter_id))
+
+    def test_int_keys_survive_the_round_trip(self):
+        summary = self._sign_in("admin").dashboard_snapshot()["stats"]["ratings"]
+        self.assertEqual(sorted(summary["counts"]), [1, 2, 3, 4, 5])
+
+    def test_controller_errors_are_raised_locally(self):
+        auth = RemoteController("auth", self.client)
+        with self.assertRaisesRegex(ValueError, "Invalid credentials"):
+            auth.login("nobody@example.com", "wrongpw1", "adopter")
+        # Bad arguments fail before any request is sent
+        with self.assertRaises(TypeError):
+            auth.login("only-email")
+        with self.assertRaises(AttributeError):
+            auth._require_eight_chars
+
+    def test_unknown_and_private_methods_are_not_routed(self):
+        for path in ("/api/adopter/no_such_method", "/api/auth/_otp_cache", "/api/nobody/list_pets"):
+            status, _, body = self.client.request("POST", path, b"{}")
+            self.assertEqual(status, 404, path)
+            self.assertIn("error", protocol.loads(body))
+
+    def test_photos_are_served_with_cache_headers(self):
+        status, headers, body = self.client.request("GET", "/photos/rex.png")
+        self.assertEqual((status, body), (200, b"\x89PNG fake image"))
+        self.assertEqual(headers["content-type"], "image/png")
+        self.assertIn("max-age", headers["cache-control"])
+        status, _, body = self.client.request("GET", "/photos/rex.png", headers={"If-None-Match": headers["etag"]})
+        self.assertEqual((status, body), (304, b""))
+        status, _, _ = self.client.request("GET", "/photos/..%2Ftest.db")
+        self.assertEqual(status, 404)
+
+    def test_photos_in_results_are_mirrored(self):
+        local = self.client.photo("rex.png")
+        self.assertEqual(local.read_bytes(), b"\x89PNG fake image")
+        result = self.client._localize({"name": "Rex", "image": str(self.server_images / "rex.png"), "photo_path": "rex.png"})
+        self.assertEqual(result, {"name": "Rex", "image": str(local), "photo_path": "rex.png"})
+
+    def test_local_photo_arguments_are_uploaded(self):
+        picked = Path(self.tmpdir.name) / "picked.jpg"
+        picked.write_bytes(b"jpeg bytes")
+        admin = self._sign_in("admin")
+        admin.add_pet(name="Upload", category="dog", breed="mixed", age=2, sex="male", image_path=str(picked))
+        added = [pet for pet in admin.list_pets() if pet["name"] == "Upload"]
+        stored = added[0]["photo_path"]
+        self.assertRegex(stored, r"^picked-[0-9a-f]{8}\.jpg$")
+        self.assertEqual((self.server_images / stored).read_bytes(), b"jpeg bytes")
+
+    def test_uploads_never_overwrite_existing_photos(self):
+        first = self.client.upload(self._file("rex.png", b"first"))
+        second = self.client.upload(self._file("rex.png", b"second"))
+        self.assertNotEqual(first, second)
+        self.assertEqual((self.server_images / "rex.png").read_bytes(), b"\x89PNG fake image")
+        self.assertEqual((self.server_images / second).read_bytes(), b"second")
+        self.assertEqual([p.name for p in self.server_images.iterdir() if p.name.startswith(".")], [])
+
+    def _file(self, name, data):
+        folder = Path(self.tmpdir.name) / f"upload-{data.decode()}"
+        folder.mkdir()
+        (folder / name).write_bytes(data)
+        return folder / name
+
+    def test_controller_calls_need_a_session_with_the_right_role(self):
+        with self.assertRaisesRegex(PermissionError, "Sign in"):
+            RemoteController("admin", self.client).list_pets()
+        adopter = self._sign_in("adopter")
+        self.assertTrue(adopter.list_pets())
+        with self.assertRaises(PermissionError):
+            RemoteController("admin", self.client).delete_admin_account(admin_id=self.admin_id)
+        # Another adopter's notifications are off limits
+        with self.assertRaises(PermissionError):
+            adopter.list_notifications(user_id=self.adopter_id + 1)
+        self.client.logout()
+        with self.assertRaises(PermissionError):
+            adopter.list_pets()
+
+    def _other_adopter_rows(self):
+        with database.connection() as conn:
+            other = conn.execute(
+                "INSERT INTO users (name, email, password, role) VALUES ('Other', 'other@test.com', 'secret12', 'adopter')"
+            ).lastrowid
+            pet_id = conn.execute("SELECT pet_id FROM pets LIMIT 1").fetchone()[0]
+            request_id = conn.execute(
+                "INSERT INTO adoption_requests (adopter_id, pet_id, information, status, created_at)"
+                " VALUES (?, ?, 'private note', 'pending', datetime('now'))",
+                (other, pet_id),
+            ).lastrowid
+            note_id = conn.execute(
+                "INSERT INTO notifications (user_id, role, message, created_at, is_read)"
+                " VALUES (?, 'adopter', 'for other', datetime('now'), 0)",
+                (other,),
+            ).lastrowid
+        return other, request_id, note_id
+
+    def _row(self, sql, row_id):
+        with database.connection() as conn:
+            return conn.execute(sql, (row_id,)).fetchone()
+
+    def test_adopters_cannot_reach_other_adopters_requests(self):
+        other, request_id, _ = self._other_adopter_rows()
+        adopter = self._sign_in("adopter")
+        self.assertIsNone(adopter.get_request(request_id))
+        self.assertFalse(adopter.cancel_request(request_id))
+        self.assertFalse(adopter.delete_request(request_id))
+        with self.assertRaises(PermissionError):
+            adopter.delete_request(request_id, adopter_id=other)
+        self.assertEqual(self._row("SELECT status FROM adoption_requests WHERE id=?", request_id), ("pending",))
+
+    def test_adopters_cannot_touch_other_users_notifications(self):
+        _, _, note_id = self._other_adopter_rows()
+        adopter = self._sign_in("adopter")
+        adopter.mark_notification_read(note_id)
+        adopter.delete_notification(note_id)
+        self.assertEqual(self._row("SELECT is_read FROM notifications WHERE id=?", note_id), (0,))
+
+    def test_photo_arguments_outside_the_images_folder_are_refused(self):
+        outside = Path(self.tmpdir.name) / "precious.txt"
+        outside.write_text("keep me")
+        self._sign_in("admin")
+        for kwargs in (
+            {"pet_id": 999999, "photo_path": str(outside)},
+            {"pet_id": 999999, "photo_path": "../precious.txt"},
+        ):
+            status, body = self._post("/api/admin/delete_pet", kwargs)
+            self.assertEqual((status, body["error"]["type"]), (400, "ValueError"))
+        status, _ = self._post(
+            "/api/admin/add_pet",
+            {"name": "Leak", "category": "dog", "breed": "x", "age": 1, "sex": "male", "image_path": str(ROOT / "fureverhome.db")},
+        )
+        self.assertEqual(status, 400)
+        self.assertTrue(outside.exists())
+        self.assertFalse((self.server_images / "fureverhome.db").exists())
+
+    def test_controllers_only_remove_photos_in_their_images_folder(self):
+        outside = Path(self.tmpdir.name) / "precious.txt"
+        outside.write_text("keep me")
+        inside = self.server_images / "old.png"
+        inside.write_bytes(b"old")
+        admin = AdminController(images_dir=self.server_images)
+        admin.delete_pet(999999, photo_path=str(outside))
+        admin.delete_pet(999999, photo_path="../precious.txt")
+        self.assertTrue(outside.exists())
+        admin.delete_pet(999999, photo_path="old.png")
+        self.assertFalse(inside.exists())
+
+    def test_malformed_content_length_gets_a_400(self):
+        for length in ("abc", "-5"):
+            with socket.create_connection(("127.0.0.1", self.server.port), timeout=5) as sock:
+                sock.sendall(f"POST /api/auth/login HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+                reply = sock.recv(4096).decode("latin-1")
+            self.assertTrue(reply.startswith("HTTP/1.1 400"), reply)
+
+    def test_token_is_required_off_loopback(self):
+        with self.assertRaises(ValueError):
+            ApiServer(host="0.0.0.0", port=0, token="", images_dir=self.server_images)
+        ApiServer(host="0.0.0.0", port=0, token="secret", images_dir=self.server_images).executor.shutdown()
+
+    def test_token_is_required_when_set(self):
+        self.server.token = "secret"
+        status, _, _ = self.client.request("GET", "/health")
+        self.assertEqual(status, 401)
+        self.client.token = "secret"
+        self.assertGreater(self.client.health()["requests"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import shutil
+import sys
+import tempfile
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.controllers import AdminController, AsyncController
+from app.models import database
+from app.widgets.notification_badge import UnreadBadge
+from app.widgets.tasks import TaskRunner, ui_task
+
+
+class FakeWidget:
+    """
+    Stands in for a Tk widget: after() callbacks are queued and run by pump().
+    """
+
+    def __init__(self):
+        self.queue = []
+
+    def after(self, _ms, callback):
+        self.queue.append(callback)
+
+    def pump(self, limit=1000):
+        while self.queue and limit:
+            limit -= 1
+            self.queue.pop(0)()
+
+
+def resolved(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+class TaskRunnerTests(unittest.TestCase):
+    def setUp(self):
+        self.widget = FakeWidget()
+        self.busy = []
+        self.runner = TaskRunner(self.widget, on_busy=self.busy.append)
+
+    def test_task_resumes_with_future_results_via_after(self):
+        seen = []
+
+        def flow():
+            seen.append((yield resolved(1)))
+            seen.append((yield resolved(2)))
+
+        self.runner.spawn(flow())
+        self.assertEqual(seen, [])  # nothing resumes until the event loop runs
+        self.widget.pump()
+        self.assertEqual(seen, [1, 2])
+        self.assertEqual(self.busy, [True, False, True, False])
+
+    def test_worker_exception_is_raised_at_the_yield(self):
+        caught = []
+        failed = Future()
+        failed.set_exception(ValueError("boom"))
+
+        def flow():
+            try:
+                yield failed
+            except ValueError as e:
+                caught.append(str(e))
+
+        self.runner.spawn(flow())
+        self.widget.pump()
+        self.assertEqual(caught, ["boom"])
+
+    def test_uncaught_errors_are_logged_and_reported(self):
+        errors = []
+        self.runner.on_error = errors.append
+        failed = Future()
+        failed.set_exception(ValueError("boom"))
+
+        def show_page():
+            yield failed
+
+        self.runner.spawn(show_page())
+        with self.assertLogs("app.widgets.tasks", level="ERROR") as logs:
+            self.widget.pump()
+        self.assertEqual([str(e) for e in errors], ["boom"])
+        self.assertIn("show_page", logs.output[0])
+        self.assertIn("Traceback", logs.output[0])
+        self.assertEqual(self.busy, [True, False])
+
+    def test_pending_future_is_polled_until_done(self):
+        pending = Future()
+        seen = []
+
+        def flow():
+            seen.append((yield pending))
+
+        self.runner.spawn(flow())
+        self.widget.pump(limit=5)
+        self.assertEqual(seen, [])
+        pending.set_result("late")
+        self.widget.pump()
+        self.assertEqual(seen, ["late"])
+
+    def test_new_view_drops_stale_continuations(self):
+        closed = []
+
+        def flow():
+            try:
+                yield resolved("rows")
+                self.fail("stale task resumed")
+            finally:
+                closed.append(True)
+
+        self.runner.spawn(flow())
+        self.runner.new_view()
+        self.widget.pump()
+        self.assertEqual(closed, [True])
+        self.assertEqual(self.busy, [True, False])
+
+    def test_ui_task_decorator_runs_page_methods(self):
+        runner = self.runner
+
+        class Page:
+            tasks = runner
+
+            @ui_task
+            def show(self):
+                self.value = yield resolved(42)
+
+        page = Page()
+        self.assertIsNone(page.show())
+        self.widget.pump()
+        self.assertEqual(page.value, 42)
+
+
+class FakeButton(FakeWidget):
+    def __init__(self):
+        super().__init__()
+        self.text = None
+
+    def winfo_exists(self):
+        return True
+
+    def configure(self, text):
+        self.text = text
+
+
+class UnreadBadgeTests(unittest.TestCase):
+    def test_on_poll_runs_every_tick_and_on_change_only_on_changes(self):
+        button = FakeButton()
+        counts = iter([2, 2, 3, 3])
+        changes, polls = [], []
+        badge = UnreadBadge(button, "Notifications", lambda: next(counts), on_change=changes.append, on_poll=polls.append)
+        badge.poll_now()
+        button.pump(limit=3)
+        self.assertEqual(polls, [2, 2, 3, 3])
+        self.assertEqual(changes, [3])
+        self.assertEqual(button.text, "Notifications (3)")
+
+
+class AsyncControllerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        db_path = Path(self.tmpdir.name) / "test.db"
+        shutil.copy2(ROOT / "fureverhome.db", db_path)
+        database.DB_PATH = str(db_path)
+
+    def tearDown(self):
+        database.close_connections()
+        self.tmpdir.cleanup()
+
+    def test_calls_run_on_worker_threads_and_return_futures(self):
+        ctrl = AdminController()
+        api = AsyncController(ctrl)
+        future = api.request_counts()
+        self.assertIsInstance(future, Future)
+        self.assertEqual(future.result(timeout=10), ctrl.request_counts())
+
+        thread_name = api.submit(lambda: threading.current_thread().name).result(timeout=10)
+        self.assertNotEqual(thread_name, threading.current_thread().name)
+
+    def test_controller_errors_surface_through_the_future(self):
+        api = AsyncController(AdminController())
+        with self.assertRaises(ValueError):
+            api.submit(int, "not a number").result(timeout=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
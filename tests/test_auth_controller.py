@@ -1,7 +1,4 @@
-import shutil
-import sqlite3
 import sys
-import tempfile
 from pathlib import Path
 import unittest
 
@@ -10,26 +7,21 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from app.controllers.auth_controller import AuthController
-from app.models import database
+from app.models import database, storage
 
 
-def setup_temp_db():
-    tmpdir = tempfile.TemporaryDirectory()
-    db_path = Path(tmpdir.name) / "test.db"
-    shutil.copy2("fureverhome.db", db_path)
-    database.DB_PATH = str(db_path)
-    database._ADOPTION_INFO_COLUMN = None
-    database._ADOPTION_HISTORY_ENSURED = False
-    database._SOCIAL_COLUMNS_ENSURED = False
-    return tmpdir, db_path
+def setup_memory_db():
+    backend = storage.MemoryBackend(seed=ROOT / "fureverhome.db")
+    database.use_backend(backend)
+    return backend
 
 
 class AuthControllerTests(unittest.TestCase):
     def setUp(self):
-        self.tmpdir, self.db_path = setup_temp_db()
+        self.backend = setup_memory_db()
         self.auth = AuthController()
         # seed known admin and adopter
-        conn = sqlite3.connect(self.db_path)
+        conn = database.connect()
         cur = conn.cursor()
         cur.execute(
             """
@@ -49,7 +41,8 @@ class AuthControllerTests(unittest.TestCase):
         conn.close()
 
     def tearDown(self):
-        self.tmpdir.cleanup()
+        database.close_connections()
+        self.backend.close()
 
     def test_login_adopter_success(self):
         user = self.auth.login("user@test.com", "secret12", "adopter")
@@ -0,0 +1,1099 @@
+import ast
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+import unittest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.config import MAINTENANCE_SCHEDULE
+from app.controllers import AdminController, AdopterController
+from app.models import database, maintenance, migrations, profiler, queries, records, storage
+from app.models.cache import EntityCache
+from app.models.read_pool import ReadPool
+
+
+def setup_memory_db():
+    backend = storage.MemoryBackend(seed=ROOT / "fureverhome.db")
+    database.use_backend(backend)
+    return backend
+
+
+def setup_temp_db():
+    tmpdir = tempfile.TemporaryDirectory()
+    db_path = Path(tmpdir.name) / "test.db"
+    shutil.copy2("fureverhome.db", db_path)
+    database.DB_PATH = str(db_path)
+    return tmpdir, db_path
+
+
+class ConnectionPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir, self.db_path = setup_temp_db()
+
+    def tearDown(self):
+        database.close_connections()
+        self.tmpdir.cleanup()
+
+    def test_connection_is_reused_within_thread(self):
+        with database.connection() as first:
+            pass
+        with database.connection() as second:
+            pass
+        self.assertIs(first, second)
+
+    def test_threads_get_separate_connections(self):
+        with database.connection() as main_conn:
+            pass
+        seen = []
+        worker = threading.Thread(target=lambda: seen.append(database._pooled_connection()))
+        worker.start()
+        worker.join()
+        self.assertIsNot(seen[0], main_conn)
+
+    def test_pragma_profile_applied(self):
+        with database.connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0].lower(), "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # NORMAL
+            self.assertEqual(conn.execute("PRAGMA temp_store").fetchone()[0], 2)  # MEMORY
+            self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -16000)
+
+    def test_nested_blocks_share_one_transaction(self):
+        with self.assertRaises(RuntimeError):
+            with database.connection() as conn:
+                conn.execute("UPDATE pets SET name='Outer' WHERE pet_id=1")
+                with database.connection() as inner:
+                    inner.execute("UPDATE pets SET name='Inner' WHERE pet_id=2")
+                raise RuntimeError("abort")
+
+        check = sqlite3.connect(self.db_path)
+        names = [r[0] for r in check.execute("SELECT name FROM pets WHERE pet_id IN (1, 2)")]
+        check.close()
+        self.assertNotIn("Outer", names)
+        self.assertNotIn("Inner", names)
+
+    def test_immediate_blocks_take_the_write_lock_up_front(self):
+        other = sqlite3.connect(self.db_path, timeout=0)
+        try:
+            with database.connection(immediate=True) as conn:
+                self.assertTrue(conn.in_transaction)
+                with database.connection(immediate=True) as inner:
+                    inner.execute("UPDATE pets SET name='Locked' WHERE pet_id=1")
+                with self.assertRaises(sqlite3.OperationalError):
+                    other.execute("BEGIN IMMEDIATE")
+            other.execute("BEGIN IMMEDIATE")
+            self.assertEqual(other.execute("SELECT name FROM pets WHERE pet_id=1").fetchone()[0], "Locked")
+            other.rollback()
+        finally:
+            other.close()
+
+    def test_close_connections_leaves_other_threads_transactions_alone(self):
+        in_transaction, closed, done = threading.Event(), threading.Event(), []
+
+        def worker():
+            with database.connection() as conn:
+                conn.execute("UPDATE pets SET name='Kept' WHERE pet_id=1")
+                in_transaction.set()
+                closed.wait(5)
+                with database.connection() as inner:
+                    done.append(inner is conn)
+                conn.execute("UPDATE pets SET name='Kept too' WHERE pet_id=2")
+            with database.connection() as after:
+                done.append(after is not conn)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        in_transaction.wait(5)
+        database.close_connections()
+        closed.set()
+        thread.join(5)
+        self.assertEqual(done, [True, True])
+        check = sqlite3.connect(self.db_path)
+        names = [r[0] for r in check.execute("SELECT name FROM pets WHERE pet_id IN (1, 2) ORDER BY pet_id")]
+        check.close()
+        self.assertEqual(names, ["Kept", "Kept too"])
+
+    def test_db_path_change_reopens_connection(self):
+        with database.connection() as before:
+            pass
+        other_dir, _ = setup_temp_db()
+        try:
+            with database.connection() as after:
+                pass
+            self.assertIsNot(before, after)
+        finally:
+            database.close_connections()
+            other_dir.cleanup()
+
+
+class MigrationTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir, self.db_path = setup_temp_db()
+
+    def tearDown(self):
+        database.close_connections()
+        self.tmpdir.cleanup()
+
+    def _columns(self, table):
+        conn = sqlite3.connect(self.db_path)
+        cols = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        conn.close()
+        return cols
+
+    def test_legacy_db_is_upgraded_once(self):
+        self.assertEqual(database.migrate(), migrations.SCHEMA_VERSION)
+        cols = self._columns("notifications")
+        self.assertIn("created_at", cols)
+        self.assertNotIn("date", cols)
+        # A second run is a no-op
+        with database.connection() as conn:
+            self.assertEqual(migrations.migrate(conn), migrations.SCHEMA_VERSION)
+
+    def test_reason_column_renamed_to_information(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("ALTER TABLE adoption_requests RENAME COLUMN information TO reason")
+        conn.commit()
+        conn.close()
+        database.migrate()
+        cols = self._columns("adoption_requests")
+        self.assertIn("information", cols)
+        self.assertNotIn("reason", cols)
+
+    def test_offset_admin_notifications_get_a_role(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "INSERT INTO notifications (user_id, message, date, is_read) VALUES (?, 'legacy', '2024-01-01', 0)",
+            (migrations.ADMIN_ID_OFFSET + 7,),
+        )
+        conn.commit()
+        conn.close()
+        notes = database.get_notifications_for_user(7, role="admin")
+        self.assertEqual([(n["message"], n["user_id"], n["role"]) for n in notes], [("legacy", 7, "admin")])
+        self.assertNotIn("legacy", [n["message"] for n in database.get_notifications_for_user(7)])
+
+    def test_empty_db_gets_full_schema(self):
+        empty = Path(self.tmpdir.name) / "empty.db"
+        database.DB_PATH = str(empty)
+        database.create_notification(7, "hello", role="admin")
+        notes = database.get_notifications_for_user(7, role="admin")
+        self.assertEqual([n["message"] for n in notes], ["hello"])
+        self.assertEqual(database.get_available_pets(), [])
+
+
+class IndexTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = setup_memory_db()
+        database.migrate()
+
+    def tearDown(self):
+        database.close_connections()
+        self.backend.close()
+
+    def _plan(self, sql, params):
+        with database.connection() as conn:
+            return " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+    def test_managed_indexes_exist(self):
+        with database.connection() as conn:
+            names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        for name, _table, _cols in migrations.INDEXES:
+            self.assertIn(name, names)
+
+    def test_hot_lookups_use_indexes(self):
+        plan = self._plan(
+            "SELECT 1 FROM adoption_requests WHERE adopter_id=? AND pet_id=? AND status='pending' LIMIT 1", (1, 1)
+        )
+        self.assertIn("idx_adoption_requests_adopter_pet_status", plan)
+        plan = self._plan(
+            "SELECT pet_id FROM pets WHERE status='available' AND category=?", ("dog",)
+        )
+        self.assertIn("idx_pets_status_category", plan)
+
+    def test_notification_lookups_use_role_index(self):
+        for sql in (
+            "SELECT id FROM notifications WHERE role=? AND user_id=? ORDER BY created_at DESC",
+            "DELETE FROM notifications WHERE role=? AND user_id=?",
+            "SELECT COUNT(*) FROM notifications WHERE role=? AND user_id=? AND is_read=0",
+        ):
+            self.assertIn("idx_notifications_role_user_", self._plan(sql, ("admin", 1)))
+
+    def test_newest_first_pages_use_index_order(self):
+        for sql, params in (
+            (
+                "SELECT id FROM adoption_history ah WHERE (ah.adopted_at, ah.id) < (?, ?) "
+                "ORDER BY ah.adopted_at DESC, ah.id DESC LIMIT 5",
+                ("2024-01-01", 10),
+            ),
+            (
+                "SELECT id FROM notifications WHERE role=? AND user_id=? AND (created_at, id) < (?, ?) "
+                "ORDER BY created_at DESC, id DESC LIMIT 5",
+                ("admin", 1, "2024-01-01", 10),
+            ),
+        ):
+            plan = self._plan(sql, params)
+            self.assertIn("USING", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_mixed_case_category_still_matches(self):
+        database.add_pet("Case Cat", " Cat ", "mix", 1, "female", status="Available")
+        names = [p["name"] for p in database.get_pets_by_category("CAT")]
+        self.assertIn("Case Cat", names)
+
+
+class PaginationTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = setup_memory_db()
+
+    def tearDown(self):
+        database.close_connections()
+        self.backend.close()
+
+    def _walk(self, fetch):
+        rows, cursor = fetch(None)
+        pages = [rows]
+        while cursor is not None:
+            rows, cursor = fetch(cursor)
+            pages.append(rows)
+        return pages
+
+    def test_pet_pages_cover_available_pets(self):
+        pages = self._walk(lambda after: database.get_available_pets_page(limit=4, after=after))
+        self.assertTrue(all(len(page) <= 4 for page in pages))
+        ids = [p["id"] for page in pages for p in page]
+        self.assertEqual(ids, sorted(p["id"] for p in database.get_available_pets()))
+
+    def test_request_pages_are_newest_first_and_filtered(self):
+        pets = database.get_available_pets()[:5]
+        for pet in pets:
+            database.submit_adoption_request(1, pet["id"], "note")
+        pages = self._walk(lambda after: database.get_requests_page(limit=2, after=after, status="Pending"))
+        ids = [r["id"] for page in pages for r in page]
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(ids, sorted(ids, reverse=True))
+        first = pages[0][0]
+        self.assertEqual(first["pet_id"], pets[-1]["id"])
+        self.assertEqual(first["category"], pets[-1]["category"])
+
+    def test_pet_pages_treat_all_as_no_filter(self):
+        everything, _ = database.get_available_pets_page(limit=100)
+        self.assertTrue(everything)
+        for category in (None, "All", " all "):
+            rows, _ = database.get_available_pets_page(limit=100, category=category)
+            self.assertEqual(len(rows), len(everything), category)
+
+    def test_history_pages_walk_into_undated_rows(self):
+        with database.connection() as conn:
+            conn.execute("DELETE FROM adoption_history")
+            for n, adopted_at in enumerate(("2024-03-01", None, "2024-01-01", None, "2024-03-01", "2024-02-01")):
+                conn.execute(
+                    "INSERT INTO adoption_history (adopter_id, pet_name, adopted_at) VALUES (1, ?, ?)",
+                    (f"p{n}", adopted_at),
+                )
+        for fetch in (
+            lambda after: database.get_adoption_history_page(limit=2, after=after),
+            lambda after: database.get_adoption_history_for_adopter_page(1, limit=2, after=after),
+        ):
+            names = [r["pet_name"] for page in self._walk(fetch) for r in page]
+            self.assertEqual(names, ["p4", "p0", "p5", "p2", "p3", "p1"])
+
+    def test_notification_pages_with_equal_timestamps(self):
+        with database.connection() as conn:
+            for n in range(5):
+                conn.execute(
+                    "INSERT INTO notifications (user_id, message, created_at, is_read) VALUES (?, ?, ?, 0)",
+                    (42, f"m{n}", "2024-01-01 00:00:00"),
+                )
+        pages = self._walk(lambda after: database.get_notifications_page(42, limit=2, after=after))
+        self.assertEqual([len(p) for p in pages], [2, 2, 1])
+        self.assertEqual(sorted(n["message"] for page in pages for n in page), [f"m{n}" for n in range(5)])
+
+
+class PetSearchTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = setup_memory_db()
+
+    def tearDown(self):
+        database.close_connections()
+        self.backend.close()
+
+    def _names(self, query, category=None):
+        return [p["name"] for p in database.search_pets(query, category)]
+
+    def test_search_follows_inserts_updates_and_deletes(self):
+        database.add_pet("Zephyr", "dog", "Borzoi", 3, "male", description="Gentle sighthound")
+        self.assertIn("Zephyr", self._names("borz"))
+        pet_id = next(p["id"] for p in database.search_pets("zephyr"))
+        database.update_pet(pet_id, "Zephyr", "Whippet", 3, "male", description="Gentle sighthound")
+        self.assertNotIn("Zephyr", self._names("borzoi"))
+        self.assertIn("Zephyr", self._names("whippet"))
+        database.delete_pet(pet_id)
+        self.assertEqual(self._names("zephyr"), [])
+
+    def test_name_match_ranks_above_description_match(self):
+        database.add_pet("Biscuit", "dog", "mix", 2, "female", description="Calm")
+        database.add_pet("Pepper", "dog", "mix", 2, "female", description="Best friends with biscuit the cat")
+        self.assertEqual(self._names("biscuit")[:2], ["Biscuit", "Pepper"])
+        self.assertEqual(self._names("biscuit", "cat"), [])
+
+    def test_operator_characters_are_literal(self):
+        database.add_pet("Nova", "cat", "mix", 1, "female", description="loves AND hates OR")
+        self.assertIn("Nova", self._names('nova" OR ('))
+        self.assertEqual(database.search_pets("  "), [])
+
+
+class StatsCounterTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = setup_memory_db()
+
+    def tearDown(self):
+        database.close_connections()
+        self.backend.close()
+
+    def _recount(self):
+        with database.connection() as conn:
+            available = conn.execute("SELECT category, COUNT(*) FROM pets WHERE status='available' GROUP BY 1").fetchall()
+            requests = conn.execute("SELECT status, COUNT(*) FROM adoption_requests GROUP BY 1").fetchall()
+            adoptions = conn.execute("SELECT COUNT(*) FROM adoption_history").fetchone()[0]
+        return {
+            "available_pets": database._category_counts(available),
+            "requests": database._status_counts(requests),
+            "adoptions": adoptions,
+        }
+
+    def test_counters_follow_writes(self):
+        self.assertEqual(database.get_dashboard_counts(), self._recount())
+        database.add_pet("Counter Cat", "cat", "mix", 1, "female")
+        pet = database.get_available_pets()[0]
+        database.submit_adoption_request(1, pet["id"], "note")
+        req_id = database.get_requests_page(limit=1)[0][0]["id"]
+        database.approve_request(req_id)
+        database.update_pet(pet["id"], pet["name"], pet["breed"], pet["age"], pet["sex"], category="bird")
+        database.delete_pets([database.get_available_pets()[-1]["id"]])
+        self.assertEqual(database.get_dashboard_counts(), self._recount())
+
+    def test_rollups_follow_approvals(self):
+        pets = database.get_available_pets()[:3]
+        for pet in pets:
+            database.submit_adoption_request(1, pet["id"], "note")
+        database.approve_requests([r["id"] for r in database.get_requests("pending")])
+        with database.connection() as conn:
+            breeds = conn.execute(
+                "SELECT LOWER(TRIM(breed)), COUNT(*) FROM adoption_history WHERE TRIM(breed) != '' "
+                "GROUP BY 1 ORDER BY 2 DESC, 1 LIMIT 5"
+            ).fetchall()
+            months = conn.execute(
+                "SELECT strftime('%Y-%m', adopted_at), COUNT(*) FROM adoption_history "
+                "WHERE adopted_at IS NOT NULL GROUP BY 1 ORDER BY 1"
+            ).fetchall()
+        self.assertEqual(database.get_most_adopted_breeds(), breeds)
+        self.assertEqual(database.get_adoption_trend(), months)
+        with database.connection() as conn:
+            categories = conn.execute("SELECT category, COUNT(*) FROM adoption_history GROUP BY 1").fetchall()
+        self.assertEqual(database.get_adoption_history_counts(), database._category_counts(categories))
+
+    def test_history_counts_match_the_list_for_rows_without_a_category(self):
+        pet = database.get_available_pets()[0]
+        with database.connection() as conn:
+            conn.execute(
+                "INSERT INTO adoption_history (adopter_id, pet_id, adopted_at) VALUES (1, ?, '2024-01-01 00:00:00')",
+                (pet["id"],),
+            )
+        with database.connection() as conn:
+            conn.execute("PRAGMA user_version=13")
+            migrations.migrate(conn)
+            self.assertEqual(
+                conn.execute("SELECT COUNT(*) FROM adoption_history WHERE category IS NULL AND pet_id=?", (pet["id"],)).fetchone()[0],
+                0,
+            )
+        category = pet["category"].strip().lower()
+        listed = database.get_adoption_history(pet["category"])
+        self.assertEqual(database.get_adoption_history_counts()[category], len(listed))
+
+    def test_breed_rollup_ignores_case(self):
+        with database.connection() as conn:
+            conn.execute("DELETE FROM adoption_history")
+            for breed in ("Labrador", "labrador ", "LABRADOR", "Beagle"):
+                conn.execute(
+                    "INSERT INTO adoption_history (adopter_id, category, breed, adopted_at) VALUES (1, 'dog', ?, ?)",
+                    (breed, "2024-01-01 00:00:00"),
+                )
+        self.assertEqual(database.get_most_adopted_breeds(), [("labrador", 3), ("beagle", 1)])
+        with database.connection() as conn:
+            conn.execute("UPDATE adoption_history SET breed='Beagle' WHERE breed='LABRADOR'")
+        self.assertEqual(database.get_most_adopted_breeds(), [("beagle", 2), ("labrador", 2)])
+
+    def test_rollback_leaves_counters_unchanged(self):
+        before = database.get_dashboard_counts()
+        with self.assertRaises(RuntimeError):
+            with database.connection():
+                database.add_pet("Ghost", "dog", "mix", 1, "male")
+                raise RuntimeError("abort")
+        self.assertEqual(database.get_dashboard_counts(), before)
+
+
+class AdoptionHistoryTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir, self.db_path = setup_temp_db()
+
+    def tearDown(self):
+        database.close_connections()
+        self.tmpdir.cleanup()
+
+    def test_approval_adds_one_history_row(self):
+        pet = database.get_available_pets()[0]
+        database.submit_adoption_request(1, pet["id"], "note")
+        req_id = database.get_requests_page(limit=1)[0][0]["id"]
+        before = len(database.get_adoption_history_for_adopter(1))
+        database.approve_request(req_id)
+        database.approve_requests([req_id])
+        rows = database.get_adoption_history_for_adopter(1)
+        self.assertEqual(len(rows), before + 1)
+        self.assertIn(pet["name"], [r["pet_name"] for r in rows])
+
+    def test_history_row_links_to_its_request(self):
+        pet = database.get_available_pets()[0]
+        database.submit_adoption_request(1, pet["id"], "because")
+        database.submit_adoption_request(1, pet["id"], "second try")
+        second = max(r["id"] for r in database.get_adopter_requests(1, "pending"))
+        database.approve_request(second)
+        rows = [r for r in database.get_adoption_history_for_adopter(1) if r["pet_name"] == pet["name"]]
+        self.assertEqual([r["reason"] for r in rows], ["second try"])
+        pages = database.get_adoption_history_for_adopter_page(1, limit=1)
+        self.assertEqual(len(pages[0]), 1)
+
+    def test_history_reads_do_not_write(self):
+        with database.connection() as conn:
+            before = conn.total_changes
+            database.get_adoption_history()
+            database.get_adoption_history_for_adopter(1)
+            database.get_adoption_history_page()
+            self.assertEqual(conn.total_changes, before)
+
+    def test_migration_backfills_approved_requests(self):
+        database.migrate()
+        database.close_connections()
+        database._MIGRATED_PATHS.discard(database.DB_PATH)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DELETE FROM adoption_history")
+        approved = conn.execute("SELECT COUNT(*) FROM adoption_requests WHERE status='approved'").fetchone()[0]
+        conn.execute("PRAGMA user_version=7")
+        conn.commit()
+        conn.close()
+        self.assertEqual(len(database.get_adoption_history()), approved)
+
+
+class NotificationTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = setup_memory_db()
+
+    def tearDown(self):
+        database.close_connections()
+        self.backend.close()
+
+    def test_unread_count_and_since_polling(self):
+        database.create_notification(9, "first", role="admin")
+        database.create_notification(9, "adopter nine", role="adopter")
+        first = database.get_notifications_for_user(9, role="admin")[0]
+        self.assertEqual(database.count_unread(9, role="admin"), 1)
+        database.create_notification(9, "second", role="admin")
+        database.mark_notification_read(first["id"])
+        self.assertEqual(database.count_unread(9, role="admin"), 1)
+        fresh = database.get_notifications_since(9, role="admin", last_id=first["id"])
+        self.assertEqual([n["message"] for n in fresh], ["second"])
+        self.assertEqual(database.get_notifications_since(9, role="admin", last_id=fresh[-1]["id"]), [])
+
+
+class RetentionTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = setup_memory_db()
+
+    def tearDown(self):
+        database.close_connections()
+        self.backend.close()
+
+    def _seed(self, user_id, stamps):
+        with database.connection() as conn:
+            conn.executemany(
+                "INSERT INTO notifications (user_id, role, message, created_at, is_read) VALUES (?, 'adopter', ?, ?, 0)",
+                [(user_id, f"m{n}", stamp) for n, stamp in enumerate(stamps)],
+            )
+
+    def test_prune_archives_old_and_excess_rows(self):
+        self._seed(501, ["2000-01-01 00:00:00"] + ["2999-01-01 00:00:00"] * 4)
+        removed = database.prune_notifications(max_age_days=30, max_per_user=3, batch_size=1)
+        kept = database.get_notifications_for_user(501)
+        self.assertEqual(len(kept), 3)
+        with database.connection() as conn:
+            archived = conn.execute("SELECT message FROM notifications_archive WHERE user_id=501").fetchall()
+        self.assertEqual(len(archived), 2)
+        self.assertIn(("m0",), archived)
+        self.assertGreaterEqual(removed, 2)
+
+    def test_prune_finds_expired_rows_once(self):
+        self._seed(503, ["2999-01-01 00:00:00"] * 7)
+        calls = []
+        original = database._expired_notification_ids
+
+        def counting(*args):
+            calls.append(args)
+            return original(*args)
+
+        database._expired_notification_ids = counting
+        try:
+            removed = database.prune_notifications(max_age_days=30, max_per_user=2, batch_size=2)
+        finally:
+            database._expired_notification_ids = original
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(database.get_notifications_for_user(503)), 2)
+        self.assertGreaterEqual(removed, 5)
+
+    def test_retention_pass_does_not_vacuum(self):
+        with database.connection() as conn:
+            conn.execute("PRAGMA auto_vacuum=NONE")
+            conn.execute("VACUUM")
+        self._seed(504, ["2000-01-01 00:00:00"] * 10)
+        summary = maintenance.run_maintenance(max_age_days=30, max_per_user=100)
+        self.assertGreaterEqual(summary["notifications_pruned"], 10)
+        # incremental_vacuum is skipped until the file has been converted
+        self.assertEqual(summary["pages_freed"], 0)
+        self.assertEqual(database.get_notifications_for_user(504), [])
+        with database.connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA auto_vacuum").fetchone()[0], 0)
+
+    def test_maintenance_pass_reclaims_pages(self):
+        self._seed(502, ["2000-01-01 00:00:00"] * 2000)
+        maintenance.vacuum()
+        summary = maintenance.run_maintenance(max_age_days=30, max_per_user=100, archive=False)
+        with database.connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM notifications WHERE user_id=502").fetchone()[0], 0)
+            self.assertEqual(conn.execute("PRAGMA freelist_count").fetchone()[0], 0)
+        self.assertGreater(summary["pages_freed"], 0)
+
+
+class MaintenanceStepTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir, self.db_path = setup_temp_db()
+        database.migrate()
+        maintenance._LAST_RUN.clear()
+
+    def tearDown(self):
+        maintenance._LAST_RUN.clear()
+        maintenance._LAST_ACTIVITY = 0.0
+        database.close_connections()
+        self.tmpdir.cleanup()
+
+    def test_checkpoint_truncates_the_wal(self):
+        for n in range(20):
+            database.create_notification(701, f"wal {n}", role="adopter")
+        wal = Path(str(self.db_path) + "-wal")
+        self.assertGreater(wal.stat().st_size, 0)
+        result = database.wal_checkpoint("TRUNCATE")
+        self.assertEqual(result["busy"], 0)
+        self.assertEqual(wal.stat().st_size, 0)
+        with self.assertRaises(ValueError):
+            database.wal_checkpoint("SOMETIMES")
+
+    def test_optimize_and_integrity_check(self):
+        database.optimize(analyze=True)
+        with database.connection() as conn:
+            self.assertGreater(conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0], 0)
+        self.assertEqual(database.integrity_check(), [])
+        self.assertEqual(database.integrity_check(quick=True), [])
+
+    def test_backup_is_consistent_while_writes_continue(self):
+        stop = threading.Event()
+
+        def writer():
+            n = 0
+            while not stop.is_set():
+                database.create_notification(702, f"during backup {n}", role="adopter")
+                n += 1
+            database.close_thread_connection()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            dest = Path(self.tmpdir.name) / "copies" / "copy.db"
+            summary = database.backup(dest, pages=1, sleep=0)
+        finally:
+            stop.set()
+            thread.join()
+
+        self.assertEqual(summary["path"], str(dest))
+        self.assertFalse(dest.with_name("copy.db.partial").exists())
+        copy = sqlite3.connect(dest)
+        try:
+            self.assertEqual(copy.execute("PRAGMA integrity_check").fetchone()[0], "ok")
+            with database.connection() as conn:
+                pets = conn.execute("SELECT COUNT(*) FROM pets").fetchone()[0]
+            self.assertEqual(copy.execute("SELECT COUNT(*) FROM pets").fetchone()[0], pets)
+        finally:
+            copy.close()
+
+    def test_backups_are_rotated(self):
+        backup_dir = Path(self.tmpdir.name) / "backups"
+        backup_dir.mkdir()
+        for stamp in ("20240101-000000", "20240102-000000", "20240103-000000"):
+            (backup_dir / f"fureverhome-{stamp}.db").write_bytes(b"")
+        summary = maintenance.backup(keep=2, backup_dir=backup_dir)
+        remaining = sorted(path.name for path in backup_dir.iterdir())
+        self.assertEqual(len(remaining), 2)
+        self.assertIn(Path(summary["path"]).name, remaining)
+        self.assertEqual(len(summary["removed"]), 2)
+
+    def test_steps_wait_for_idle_and_their_interval(self):
+        schedule = {"checkpoint": 300, "optimize": 3600}
+        self.assertEqual(maintenance.due_steps(schedule), ["checkpoint", "optimize"])
+        maintenance.run_steps(["checkpoint"])
+        self.assertEqual(maintenance.due_steps(schedule), ["optimize"])
+        self.assertEqual(maintenance.due_steps(schedule, now=time.monotonic() + 301), ["checkpoint", "optimize"])
+
+        self.assertEqual(maintenance.idle_seconds(), float("inf"))
+        maintenance.note_activity()
+        self.assertLess(maintenance.idle_seconds(), 1)
+
+    def test_first_runs_are_one_interval_after_start(self):
+        schedule = {"checkpoint": 300, "integrity": 86400}
+        now = time.monotonic()
+        maintenance.schedule_first_runs(schedule, now=now)
+        self.assertEqual(maintenance.due_steps(schedule, now=now), [])
+        self.assertEqual(maintenance.due_steps(schedule, now=now + 301), ["checkpoint"])
+
+    def test_start_resets_the_idle_clock(self):
+        maintenance.start(tick=3600, idle_after=120)
+        try:
+            self.assertLess(maintenance.idle_seconds(), 1)
+            # backup is left out: its first run follows the newest backup on disk
+            schedule = {name: interval for name, interval in MAINTENANCE_SCHEDULE.items() if name != "backup"}
+            # The copied database predates incremental vacuum, so only its conversion is due
+            self.assertEqual(maintenance.due_steps(schedule), ["vacuum"])
+        finally:
+            maintenance.stop()
+
+    def test_vacuum_step_converts_once_then_waits_its_interval(self):
+        now = time.monotonic()
+        maintenance.schedule_first_runs({"vacuum": 86400}, now=now)
+        self.assertEqual(maintenance.due_steps({"vacuum": 86400}, now=now), ["vacuum"])
+        results = maintenance.run_steps(["vacuum"])
+        self.assertEqual(results["vacuum"], {"converted_to_incremental": True})
+        self.assertTrue(database.incremental_vacuum_enabled())
+        self.assertEqual(maintenance.due_steps({"vacuum": 86400}), [])
+        self.assertEqual(maintenance.vacuum(), {"converted_to_incremental": False})
+
+    def test_cli_runs_named_steps(self):
+        dest = Path(self.tmpdir.name) / "cli.db"
+        database.close_connections()
+        code = maintenance.main(["--db", str(self.db_path), "--backup-to", str(dest), "checkpoint", "integrity", "backup"])
+        self.assertEqual(code, 0)
+        self.assertTrue(dest.exists())
+
+
+class ReadPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir, self.db_path = setup_temp_db()
+        database.migrate()
+
+    def tearDown(self):
+        database.close_connections()
+        self.tmpdir.cleanup()
+
+    def test_read_connections_are_read_only(self):
+        with database.read_connection() as conn:
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM pets")
+            self.assertEqual(conn.execute("PRAGMA query_only").fetchone()[0], 1)
+
+    def test_reports_see_one_snapshot_and_do_not_block_writers(self):
+        def add():
+            database.add_pet("Snap", "dog", "mixed", 2, "male")
+            database.close_thread_connection()
+
+        with database.read_connection() as conn:
+            before = conn.execute("SELECT COUNT(*) FROM pets").fetchone()[0]
+            writer = threading.Thread(target=add)
+            writer.start()
+            writer.join(5)
+            self.assertFalse(writer.is_alive())
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM pets").fetchone()[0], before)
+        with database.read_connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM pets").fetchone()[0], before + 1)
+
+    def test_report_helpers_use_the_pool(self):
+        before = database.read_pool_stats()["checkouts"]
+        database.get_adoption_history()
+        database.get_requests_page(limit=5)
+        database.get_dashboard_counts()
+        stats = database.read_pool_stats()
+        self.assertEqual(stats["checkouts"], before + 3)
+        self.assertEqual(stats["in_use"], 0)
+
+    def test_reads_inside_a_transaction_see_its_writes(self):
+        total = database.get_rating_summary()["total"]
+        with database.connection():
+            database.add_rating(1, 5)
+            self.assertEqual(database.get_rating_summary()["total"], total + 1)
+
+    def test_pool_is_bounded(self):
+        opened = []
+
+        def opener():
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            opened.append(conn)
+            return conn
+
+        pool = ReadPool(opener, size=1, timeout=0.05)
+        conn = pool.acquire("a")
+        with self.assertRaises(TimeoutError):
+            pool.acquire("a")
+        pool.release(conn)
+        self.assertIs(pool.acquire("a"), conn)
+        pool.release(conn)
+        # An idle connection for another database is closed, not reused
+        self.assertIsNot(pool.acquire("b"), conn)
+        stats = pool.stats()
+        self.assertEqual((stats["opened"], stats["timeouts"], stats["open"]), (2, 1, 1))
+
+
+class StorageBackendTests(unittest.TestCase):
+    def setUp(self):
+        self.backends = []
+
+    def tearDown(self):
+        database.close_connections()
+        for backend in self.backends:
+            backend.close()
+
+    def _use(self, backend):
+        self.backends.append(backend)
+        database.use_backend(backend)
+        return backend
+
+    def test_memory_databases_are_isolated(self):
+        first = self._use(storage.MemoryBackend(seed=ROOT / "fureverhome.db"))
+        pets = len(database.get_available_pets())
+        database.add_pet("Only Here", "dog", "mixed", 1, "male")
+        self.assertEqual(len(database.get_available_pets()), pets + 1)
+
+        self._use(storage.MemoryBackend(seed=ROOT / "fureverhome.db"))
+        self.assertEqual(len(database.get_available_pets()), pets)
+        database.use_backend(first)
+        self.assertEqual(len(database.get_available_pets()), pets + 1)
+
+    def test_schema_snapshot_is_empty_and_current(self):
+        self._use(storage.MemoryBackend())
+        self.assertEqual(database.migrate(), migrations.SCHEMA_VERSION)
+        self.assertEqual(database.get_available_pets(), [])
+        database.create_notification(7, "hello", role="admin")
+        self.assertEqual([n["message"] for n in database.get_notifications_for_user(7, role="admin")], ["hello"])
+
+    def test_memory_reads_stay_on_the_thread_connection(self):
+        self._use(storage.MemoryBackend())
+        with database.read_connection() as reader, database.connection() as conn:
+            self.assertIs(reader, conn)
+
+    def test_ramdisk_copy_leaves_the_source_alone(self):
+        source_size = (ROOT / "fureverhome.db").stat().st_size
+        backend = self._use(storage.RamDiskBackend(ROOT / "fureverhome.db"))
+        database.add_pet("Scratch", "cat", "mixed", 1, "female")
+        with database.connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0].lower(), "wal")
+        self.assertEqual((ROOT / "fureverhome.db").stat().st_size, source_size)
+        database.close_connections()
+        backend.close()
+        self.assertFalse(backend.path.exists())
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            storage.open_backend("tape", ROOT / "fureverhome.db")
+
+
+class WriteQueueTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir, self.db_path = setup_temp_db()
+        self.writer = database.start_writer(window_ms=20)
+
+    def tearDown(self):
+        database.stop_writer()
+        database.close_connections()
+        self.tmpdir.cleanup()
+
+    def test_prune_batches_go_through_the_writer(self):
+        database.create_notifications([(602, f"old {n}", "adopter") for n in range(6)])
+        before = self.writer.stats()["commands"]
+        database.prune_notifications(max_age_days=30, max_per_user=1, batch_size=2)
+        self.assertEqual(len(database.get_notifications_for_user(602)), 1)
+        self.assertGreaterEqual(self.writer.stats()["commands"] - before, 3)
+
+    def test_concurrent_writes_are_group_committed(self):
+        errors = []
+
+        def write(n):
+            try:
+                database.create_notification(601, f"queued {n}", role="adopter")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(40)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(database.count_unread(601, role="adopter"), 40)
+        stats = database.writer_stats()
+        self.assertEqual(stats["commands"], 40)
+        self.assertLess(stats["batches"], 40)
+
+    def test_failed_command_does_not_undo_its_batch(self):
+        def broken():
+            with database.connection() as conn:
+                conn.execute("INSERT INTO notifications (user_id, role, message, is_read) VALUES (602, 'adopter', 'lost', 0)")
+                conn.execute("INSERT INTO no_such_table VALUES (1)")
+
+        futures = [
+            database.submit_write(database.create_notification, 602, "kept", "adopter"),
+            database.submit_write(broken),
+            database.submit_write(database.create_notification, 602, "kept too", "adopter"),
+        ]
+        futures[0].result(timeout=10)
+        with self.assertRaises(sqlite3.OperationalError):
+            futures[1].result(timeout=10)
+        futures[2].result(timeout=10)
+        messages = sorted(n["message"] for n in database.get_notifications_for_user(602, role="adopter"))
+        self.assertEqual(messages, ["kept", "kept too"])
+
+    def test_writes_inside_a_transaction_bypass_the_queue(self):
+        with database.connection() as conn:
+            database.create_notification(603, "inline", role="adopter")
+            self.assertTrue(conn.in_transaction)
+        self.assertEqual(self.writer.stats()["commands"], 0)
+        self.assertEqual(database.count_unread(603, role="adopter"), 1)
+
+    def test_stop_applies_queued_writes(self):
+        futures = [database.submit_write(database.create_notification, 604, f"m{n}", "adopter") for n in range(5)]
+        database.stop_writer()
+        self.assertTrue(all(f.done() for f in futures))
+        self.assertEqual(database.count_unread(604, role="adopter"), 5)
+        # With the writer stopped, helpers write on the calling thread again
+        database.create_notification(604, "direct", role="adopter")
+        self.assertEqual(database.count_unread(604, role="adopter"), 6)
+
+
+class QueryCatalogTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = setup_memory_db()
+
+    def tearDown(self):
+        database.close_connections()
+        self.backend.close()
+
+    def test_catalog_statements_compile_against_the_schema(self):
+        with database.connection() as conn:
+            for name, sql in queries.CATALOG.items():
+                with self.subTest(name=name):
+                    conn.execute("EXPLAIN " + sql, [None] * sql.count("?")).fetchall()
+
+    def test_variants_reuse_one_string(self):
+        first = queries.compose(queries.REQUEST_SELECT, " WHERE ", database._status_filter("ar.status", "Pending")[0])
+        again = queries.compose(queries.REQUEST_SELECT, " WHERE ", database._status_filter("ar.status", "Pending")[0])
+        self.assertIs(first, again)
+
+    def test_statement_cache_holds_the_catalog(self):
+        self.assertGreater(queries.STATEMENT_CACHE_SIZE, len(queries.CATALOG) + queries.COMPOSED_MAX)
+
+    def test_inline_statement_counts_match_database_py(self):
+        literals = templates = 0
+        for node in ast.walk(ast.parse(Path(database.__file__).read_text())):
+            if (
+                isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr in ("execute", "executemany", "executescript") and node.args
+            ):
+                literals += isinstance(node.args[0], ast.Constant)
+                templates += isinstance(node.args[0], ast.JoinedStr)
+        self.assertEqual((literals, templates), (queries.INLINE_LITERALS, queries.INLINE_TEMPLATES))
+
+    def test_statement_paths_fit_in_the_cache(self):
+        database.migrate()
+        database.enable_profiling()
+        database.reset_stats()
+        try:
+            admin, adopter = AdminController(), AdopterController()
+            for category in (None, "All", "dog", "cat"):
+                adopter.list_pets(category)
+                adopter.search_pets("a", category)
+                admin.adoption_history(category)
+                _, cursor = database.get_adoption_history_page(limit=2, category=category)
+                database.get_adoption_history_page(limit=2, after=cursor, category=category)
+            for status in (None, "Pending", "Approved", "All"):
+                admin.list_requests(status)
+                _, cursor = adopter.list_requests_page(1, status, limit=2)
+                adopter.list_requests_page(1, status, limit=2, after=cursor)
+            admin.dashboard_snapshot()
+            adopter.history_counts(1)
+            for pet in database.get_available_pets()[:4]:
+                adopter.submit_request(1, pet["id"], "note")
+            ids = [r["id"] for r in database.get_requests("pending")]
+            admin.approve_requests(ids[:2])
+            admin.decline_requests(ids[2:4], "Filled")
+            adopter.count_unread(1)
+            for note in adopter.get_notifications_since(1, 0)[:1]:
+                adopter.mark_notification_read(note["id"], 1)
+            maintenance.run_steps(["retention", "checkpoint", "optimize", "vacuum"])
+            statements = {q["sql"] for helper in database.stats()["helpers"].values() for q in helper["queries"]}
+        finally:
+            database.disable_profiling()
+            database.reset_stats()
+        self.assertGreater(len(statements), 40)
+        self.assertLess(len(statements), queries.STATEMENT_CACHE_SIZE)
+
+
+class ProfilingTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = setup_memory_db()
+        database.migrate()
+        database.enable_profiling(slow_ms=0)
+        database.reset_stats()
+
+    def tearDown(self):
+        database.disable_profiling()
+        database.reset_stats()
+        database.close_connections()
+        self.backend.close()
+
+    def test_statements_are_attributed_to_helpers(self):
+        database.has_pending_request(1, 1)
+        database.has_pending_request(1, 2)
+        rows, next_cursor = database.get_available_pets_page(limit=3)
+
+        helpers = database.stats()["helpers"]
+        self.assertEqual(helpers["has_pending_request"]["statements"], 2)
+        self.assertEqual(helpers["get_available_pets_page"]["rows"], len(rows) + (1 if next_cursor else 0))
+        query = helpers["has_pending_request"]["queries"][0]
+        self.assertEqual(query["count"], 2)
+        self.assertIn("test_database.py", query["call_site"])
+
+    def test_slow_log_keeps_query_plans(self):
+        database.has_pending_request(1, 1)
+        slow = [entry for entry in database.stats()["slow_queries"] if entry["helper"] == "has_pending_request"]
+        self.assertTrue(slow)
+        self.assertTrue(any("adoption_requests" in step for step in slow[0]["plan"]))
+        self.assertIn("has_pending_request", database.format_stats())
+
+    def test_disabled_connections_are_plain(self):
+        with database.connection() as conn:
+            self.assertIsInstance(conn.execute("SELECT 1"), profiler.ProfilingCursor)
+        database.disable_profiling()
+        database.reset_stats()
+        with database.connection() as conn:
+            self.assertIs(type(conn), sqlite3.Connection)
+        database.has_pending_request(1, 1)
+        self.assertEqual(database.stats()["helpers"], {})
+
+
+class RecordTests(unittest.TestCase):
+    def setUp(self):
+        self.backend = setup_memory_db()
+
+    def tearDown(self):
+        database.close_connections()
+        self.backend.close()
+
+    def test_records_read_like_dicts(self):
+        pet = database.get_available_pets()[0]
+        self.assertFalse(hasattr(pet, "__dict__"))
+        self.assertEqual(pet["name"], pet.get("name"))
+        self.assertIn("image", pet)
+        self.assertIsNone(pet.get("photo"))
+        self.assertEqual(pet.get("photo", "fallback"), "fallback")
+        with self.assertRaises(KeyError):
+            pet["photo"]
+        self.assertEqual(set(dict(pet)), set(pet.keys()))
+
+    def test_pet_image_is_resolved_once_per_row(self):
+        calls = []
+        original = records.resolve_pet_image
+
+        def counting(*args):
+            calls.append(args)
+            return original(*args)
+
+        records.resolve_pet_image = counting
+        try:
+            pets = database.get_available_pets()
+            for pet in pets:
+                pet["image"], pet.get("image"), dict(pet)["image"]
+        finally:
+            records.resolve_pet_image = original
+        self.assertEqual(len(calls), len(pets))
+
+    def test_notification_record_shape(self):
+        database.create_notification(3, "hi", role="adopter")
+        note = database.get_notifications_for_user(3)[0]
+        self.assertIs(note["is_read"], False)
+        self.assertEqual(note.get("role"), "adopter")
+
+
+class EntityCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir, self.db_path = setup_temp_db()
+        database.clear_cache()
+        database._CACHE.reset_stats()
+
+    def tearDown(self):
+        database.close_connections()
+        self.tmpdir.cleanup()
+
+    def test_repeat_lookups_hit_the_cache(self):
+        pet_id = database.get_available_pets()[0]["id"]
+        first = database.get_pet_by_id(pet_id)
+        self.assertIs(database.get_pet_by_id(pet_id), first)
+        stats = database.cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_writes_invalidate_entries(self):
+        pet = database.get_available_pets()[0]
+        database.get_pet_by_id(pet["id"])
+        database.update_pet(pet["id"], "Renamed", pet["breed"], pet["age"], pet["sex"], description=pet["description"])
+        self.assertEqual(database.get_pet_by_id(pet["id"])["name"], "Renamed")
+
+        admins = len(database.get_admin_profiles())
+        database.create_admin_user("Cache Admin", "cache-admin@example.com", "pw")
+        self.assertEqual(len(database.get_admin_profiles()), admins + 1)
+
+    def test_rollback_does_not_leave_uncommitted_rows_cached(self):
+        pet_id = database.get_available_pets()[0]["id"]
+        name = database.get_pet_by_id(pet_id)["name"]
+        with self.assertRaises(RuntimeError):
+            with database.connection():
+                database.update_pet(pet_id, "Uncommitted", None, None, None)
+                database.get_pet_by_id(pet_id)
+                raise RuntimeError("boom")
+        self.assertEqual(database.get_pet_by_id(pet_id)["name"], name)
+
+    def test_other_process_write_is_detected(self):
+        pet_id = database.get_available_pets()[0]["id"]
+        database.get_pet_by_id(pet_id)
+        other = sqlite3.connect(self.db_path)
+        other.execute("UPDATE pets SET name='Elsewhere' WHERE pet_id=?", (pet_id,))
+        other.commit()
+        other.close()
+        self.assertEqual(database.get_pet_by_id(pet_id)["name"], "Elsewhere")
+
+    def test_lru_evicts_oldest_entry(self):
+        cache = EntityCache(maxsize=2)
+        for key in (1, 2, 3):
+            cache.get("pet", key, lambda: key)
+        self.assertEqual(cache.get("pet", 1, lambda: "reloaded"), "reloaded")
+        self.assertEqual(cache.stats()["evictions"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()